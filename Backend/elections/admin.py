@@ -24,7 +24,7 @@ class ElectionAdmin(admin.ModelAdmin):
             'fields': ('start_date', 'end_date')
         }),
         ('Paramètres', {
-            'fields': ('allow_multiple_votes', 'is_public')
+            'fields': ('allow_multiple_votes', 'is_public', 'key_algorithm')
         }),
         ('Statistiques', {
             'fields': ('total_candidates', 'total_voters', 'total_votes'),
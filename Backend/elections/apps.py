@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ElectionsConfig(AppConfig):
     name = 'elections'
+
+    def ready(self):
+        from . import signals  # noqa: F401
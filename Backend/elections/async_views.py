@@ -0,0 +1,55 @@
+"""
+Vues asynchrones des clés publiques et du bulletin d'une élection
+(VOTER_ASYNC_VIEWS), chargés par chaque électeur avant de voter. Voir
+votes/async_views.py.
+"""
+
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+
+from votes.async_views import AsyncAPIView, json_response
+
+from . import ballot_bundle, public_keys
+
+
+class AsyncElectionPublicKeysView(AsyncAPIView):
+    """
+    GET /api/elections/<id>/public_keys/ - Retourne les clés publiques CO et DE (version asynchrone)
+    """
+    admission_scope = 'public_keys'
+
+    async def get(self, request, pk):
+        # Corps et empreinte seulement : aucune clé privée chargée
+        loaded = await public_keys.aload(pk)
+        if loaded is None:
+            raise Http404
+
+        body, digest = loaded
+        headers = public_keys.response_headers(digest)
+        if ballot_bundle.not_modified(request, headers['ETag']):
+            return HttpResponseNotModified(headers=headers)
+
+        return HttpResponse(body, content_type='application/json', headers=headers)
+
+
+class AsyncBallotBundleView(AsyncAPIView):
+    """
+    GET /api/elections/<id>/ballot-bundle/ - Bulletin de l'électeur (version asynchrone)
+    """
+    admission_scope = 'ballot_bundle'
+
+    async def get(self, request, pk):
+        bundle = await ballot_bundle.aget_bundle(pk)
+        if bundle is None:
+            raise Http404
+
+        vote_status = await ballot_bundle.avote_status(pk, request.user)
+        # Électeurs : seulement les élections auxquelles ils sont assignés
+        if request.user.role == 'voter' and not vote_status['is_assigned']:
+            raise Http404
+
+        tag = ballot_bundle.etag(bundle, vote_status)
+        headers = ballot_bundle.response_headers(tag)
+        if ballot_bundle.not_modified(request, tag):
+            return HttpResponseNotModified(headers=headers)
+
+        return json_response(ballot_bundle.response_data(request, bundle, vote_status), headers=headers)
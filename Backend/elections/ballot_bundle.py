@@ -0,0 +1,240 @@
+"""
+Bulletin d'une élection pour l'interface de vote (GET /api/elections/<id>/ballot-bundle/)
+
+Avant d'afficher le bulletin, l'électeur chargeait l'élection, les
+candidats, les clés publiques et son statut de vote : quatre requêtes par
+électeur à l'ouverture. Le bulletin les regroupe :
+
+    - partie commune (élection, candidats, clés publiques) : construite une
+      fois par version de l'élection (voir election_state), gardée dans le
+      cache Django et en mémoire du processus
+    - statut de l'électeur : lu dans l'index électeurs (voter_index)
+
+L'ETag combine l'empreinte de la partie commune et le statut : un
+électeur qui recharge la page reçoit un 304 sans aucune requête SQL.
+Toute modification de l'élection ou de ses candidats change la version
+(signaux), donc l'ETag.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import election_state, public_keys, voter_index
+
+ELECTION_FIELDS = ('id', 'title', 'description', 'status', 'start_date', 'end_date', 'key_algorithm')
+CANDIDATE_FIELDS = ('id', 'name', 'party', 'program', 'photo', 'order')
+
+
+@dataclass(frozen=True)
+class Bundle:
+    data: dict
+    digest: str
+    version: str
+    loaded_at: float
+
+
+_bundles = {}
+_lock = threading.Lock()
+
+
+def _cache_key(election_id, version):
+    return f'evote:ballot-bundle:{election_id}:{version}'
+
+
+def build(election_id):
+    """
+    Partie commune du bulletin, lue en base
+
+    Returns:
+        tuple | None: (données JSON, empreinte), None si l'élection n'existe pas
+    """
+    from candidates.models import Candidate
+    from .models import Election
+
+    election = Election.objects.filter(pk=election_id).values(*ELECTION_FIELDS).first()
+    if election is None:
+        return None
+
+    # Réponse précalculée de GET /public_keys/ : aucune clé privée chargée
+    keys = public_keys.load(election_id)
+    if keys is None:
+        return None
+
+    candidates = Candidate.objects.filter(election_id=election_id).only(*CANDIDATE_FIELDS)
+
+    data = {
+        'election': election,
+        'candidates': [
+            {
+                'id': candidate.id,
+                'name': candidate.name,
+                'party': candidate.party,
+                'program': candidate.program,
+                # URL relative : rendue absolue par la vue
+                'photo': candidate.photo.url if candidate.photo else None,
+                'order': candidate.order,
+            }
+            for candidate in candidates
+        ],
+        'public_keys': json.loads(keys[0]),
+    }
+
+    # Dates en ISO 8601 comme dans les réponses DRF
+    encoded = json.dumps(data, cls=JSONEncoder, sort_keys=True, separators=(',', ':'))
+    return json.loads(encoded), hashlib.sha256(encoded.encode()).hexdigest()[:32]
+
+
+def get_bundle(election_id):
+    """
+    Partie commune du bulletin, depuis la mémoire ou le cache si la version est à jour
+
+    Returns:
+        Bundle | None: None si l'élection n'existe pas
+    """
+    state = election_state.get_state(election_id)
+    if state is None:
+        return None
+
+    bundle = _fresh_bundle(election_id, state.version)
+    if bundle is not None:
+        return bundle
+
+    key = _cache_key(election_id, state.version)
+    built = cache.get(key)
+    if built is None:
+        built = build(election_id)
+        if built is None:
+            return None
+        cache.set(key, built, settings.ELECTION_STATE_CACHE_TTL)
+
+    return _remember(election_id, built, state.version)
+
+
+async def aget_bundle(election_id):
+    """get_bundle() pour les vues asynchrones"""
+    state = await election_state.aget_state(election_id)
+    if state is None:
+        return None
+
+    bundle = _fresh_bundle(election_id, state.version)
+    if bundle is not None:
+        return bundle
+
+    key = _cache_key(election_id, state.version)
+    built = await cache.aget(key)
+    if built is None:
+        built = await sync_to_async(build)(election_id)
+        if built is None:
+            return None
+        await cache.aset(key, built, settings.ELECTION_STATE_CACHE_TTL)
+
+    return _remember(election_id, built, state.version)
+
+
+def _fresh_bundle(election_id, version):
+    # Durée de vie bornée : avec LocMemCache, les autres processus ne voient pas l'invalidation
+    bundle = _bundles.get(election_id)
+    if (
+        bundle is not None
+        and bundle.version == version
+        and time.monotonic() - bundle.loaded_at < settings.ELECTION_STATE_CACHE_TTL
+    ):
+        return bundle
+    return None
+
+
+def _remember(election_id, built, version):
+    data, digest = built
+    bundle = Bundle(data=data, digest=digest, version=version, loaded_at=time.monotonic())
+    with _lock:
+        _bundles[election_id] = bundle
+    return bundle
+
+
+def forget(election_id):
+    with _lock:
+        _bundles.pop(election_id, None)
+
+
+# ============= STATUT DE L'ÉLECTEUR =============
+
+def vote_status(election_id, user):
+    """
+    Statut de vote de l'utilisateur (index électeurs, sinon base)
+
+    Returns:
+        dict: {'has_voted': bool, 'is_assigned': bool}
+    """
+    if user.role != 'voter':
+        return {'has_voted': False, 'is_assigned': False}
+
+    indexed = voter_index.lookup(election_id, user.id)
+    if indexed is None:
+        indexed = _assignment_status(election_id, user.id)
+    return _status(indexed)
+
+
+async def avote_status(election_id, user):
+    """vote_status() pour les vues asynchrones"""
+    if user.role != 'voter':
+        return {'has_voted': False, 'is_assigned': False}
+
+    indexed = await voter_index.alookup(election_id, user.id)
+    if indexed is None:
+        indexed = await sync_to_async(_assignment_status)(election_id, user.id)
+    return _status(indexed)
+
+
+def _assignment_status(election_id, voter_id):
+    from .models import ElectionVoterAssignment
+
+    assignment = ElectionVoterAssignment.objects.filter(
+        election_id=election_id,
+        voter_id=voter_id
+    ).values('has_voted').first()
+    return assignment is not None, bool(assignment and assignment['has_voted'])
+
+
+def _status(indexed):
+    is_assigned, has_voted = indexed
+    return {'has_voted': has_voted and is_assigned, 'is_assigned': is_assigned}
+
+
+# ============= RÉPONSE =============
+
+def etag(bundle, status):
+    """ETag du bulletin d'un électeur : empreinte commune + statut"""
+    return f'"{bundle.digest}-{int(status["is_assigned"])}{int(status["has_voted"])}"'
+
+
+def not_modified(request, tag):
+    """If-None-Match correspond à l'ETag (comparaison faible, RFC 9110 §13.1.2)"""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    tags = parse_etags(header)
+    return '*' in tags or tag in (candidate.removeprefix('W/') for candidate in tags)
+
+
+def response_data(request, bundle, status):
+    """Corps de la réponse : partie commune, photos en URL absolues, statut"""
+    candidates = [
+        {**candidate, 'photo': request.build_absolute_uri(candidate['photo'])}
+        if candidate['photo'] else candidate
+        for candidate in bundle.data['candidates']
+    ]
+    return {**bundle.data, 'candidates': candidates, 'vote_status': status}
+
+
+def response_headers(tag):
+    # Contenu propre à l'électeur : revalidation systématique, jamais de cache partagé
+    return {'ETag': tag, 'Cache-Control': 'private, no-cache', 'Vary': 'Authorization'}
@@ -0,0 +1,164 @@
+"""
+État compact des élections pour le chemin de vote
+
+SubmitVoteView n'a besoin que du statut, des dates et des empreintes des
+clés publiques CO / DE : relire la ligne Election (quatre clés armurées)
+à chaque soumission est inutile. Cet état est gardé en mémoire du
+processus et invalidé par numéro de version :
+
+    - chaque élection a une version dans le cache Django (CACHES)
+    - toute modification (vues open / close, admin, attribution des clés)
+      remplace cette version après le commit
+    - un état local dont la version ne correspond plus est relu en base
+
+Avec un cache partagé (Redis, Memcached) l'invalidation atteint tous les
+workers ; avec LocMemCache elle reste locale au processus. Une durée de
+vie maximale (ELECTION_STATE_CACHE_TTL) borne l'obsolescence dans tous
+les cas.
+
+Le statut lu ici n'est qu'un refus rapide : la soumission revérifie
+status='open' dans l'UPDATE conditionnel qui réclame le droit de vote
+(votes.submission.claimable). Avec LocMemCache et plusieurs workers, un
+vote envoyé juste après la fermeture passe ce filtre mais est refusé par
+la base ; un cache partagé reste nécessaire pour que l'état (statut,
+clés) soit à jour partout sans attendre le TTL.
+"""
+
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+@dataclass(frozen=True)
+class ElectionState:
+    id: int
+    status: str
+    start_date: object
+    end_date: object
+    co_key_ids: frozenset
+    de_key_ids: frozenset
+    version: str
+    loaded_at: float
+
+    @property
+    def is_open(self):
+        return self.status == 'open'
+
+
+_states = {}
+_lock = threading.Lock()
+
+
+def _version_key(election_id):
+    return f'evote:election-state:{election_id}:version'
+
+
+def _current_version(election_id):
+    key = _version_key(election_id)
+    version = cache.get(key)
+    if version is None:
+        # Première lecture (ou cache vidé) : le premier worker fixe la version
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def _key_ids(public_key):
+    from votes.pgp_packets import key_identifiers, PGPPacketError
+
+    if not public_key:
+        return frozenset()
+    try:
+        return key_identifiers(public_key)
+    except PGPPacketError:
+        print("  ⚠️ Clé publique d'élection illisible, aucun destinataire accepté")
+        return frozenset()
+
+
+STATE_FIELDS = ('id', 'status', 'start_date', 'end_date', 'co_public_key', 'de_public_key')
+
+
+def _rows(election_id):
+    from .models import Election
+
+    return Election.objects.filter(pk=election_id).values(*STATE_FIELDS)
+
+
+def _build(row, version):
+    if row is None:
+        return None
+
+    return ElectionState(
+        id=row['id'],
+        status=row['status'],
+        start_date=row['start_date'],
+        end_date=row['end_date'],
+        co_key_ids=_key_ids(row['co_public_key']),
+        de_key_ids=_key_ids(row['de_public_key']),
+        version=version,
+        loaded_at=time.monotonic(),
+    )
+
+
+def get_state(election_id):
+    """
+    État d'une élection, depuis la mémoire si la version est à jour
+
+    Returns:
+        ElectionState | None: None si l'élection n'existe pas
+    """
+    # Version lue avant la base : une modification concurrente rend
+    # l'état chargé obsolète dès la lecture suivante
+    version = _current_version(election_id)
+
+    state = _fresh_state(election_id, version)
+    if state is not None:
+        return state
+
+    return _remember(election_id, _build(_rows(election_id).first(), version))
+
+
+async def aget_state(election_id):
+    """get_state() pour les vues asynchrones (cache et ORM asynchrones)"""
+    key = _version_key(election_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, uuid.uuid4().hex, None)
+        version = await cache.aget(key)
+
+    state = _fresh_state(election_id, version)
+    if state is not None:
+        return state
+
+    return _remember(election_id, _build(await _rows(election_id).afirst(), version))
+
+
+def _fresh_state(election_id, version):
+    state = _states.get(election_id)
+    if (
+        state is not None
+        and state.version == version
+        and time.monotonic() - state.loaded_at < settings.ELECTION_STATE_CACHE_TTL
+    ):
+        return state
+    return None
+
+
+def _remember(election_id, state):
+    with _lock:
+        if state is None:
+            _states.pop(election_id, None)
+        else:
+            _states[election_id] = state
+    return state
+
+
+def invalidate(election_id):
+    """Nouvelle version : tous les processus relisent l'élection en base"""
+    cache.set(_version_key(election_id), uuid.uuid4().hex, None)
+    with _lock:
+        _states.pop(election_id, None)
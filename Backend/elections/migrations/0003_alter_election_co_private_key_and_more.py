@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0002_election_co_private_key_election_co_public_key_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='election',
+            name='co_private_key',
+            field=models.TextField(blank=True, help_text='Clé privée CO (PGP)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='election',
+            name='co_public_key',
+            field=models.TextField(blank=True, help_text='Clé publique CO (PGP)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='election',
+            name='de_private_key',
+            field=models.TextField(blank=True, help_text='Clé privée DE (PGP)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='election',
+            name='de_public_key',
+            field=models.TextField(blank=True, help_text='Clé publique DE (PGP)', null=True),
+        ),
+    ]
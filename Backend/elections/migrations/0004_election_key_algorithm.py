@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0003_alter_election_co_private_key_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='election',
+            name='key_algorithm',
+            field=models.CharField(choices=[('rsa2048', 'RSA 2048 bits'), ('rsa3072', 'RSA 3072 bits'), ('curve25519', 'Curve25519 (Ed25519 + X25519)')], default='rsa2048', help_text='Curve25519 : génération quasi instantanée et déchiffrement plus rapide que RSA', max_length=20, verbose_name='Algorithme des clés'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:21
+
+from django.db import migrations, models
+
+
+def build_public_keys_bundles(apps, schema_editor):
+    from elections.public_keys import build
+
+    Election = apps.get_model('elections', 'Election')
+    for election in Election.objects.only('co_public_key', 'de_public_key', 'key_algorithm'):
+        bundle, etag = build(election.co_public_key, election.de_public_key, election.key_algorithm)
+        if bundle:
+            Election.objects.filter(pk=election.pk).update(public_keys_bundle=bundle, public_keys_etag=etag)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0004_election_key_algorithm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='election',
+            name='public_keys_bundle',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='election',
+            name='public_keys_etag',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(build_public_keys_bundles, migrations.RunPython.noop),
+    ]
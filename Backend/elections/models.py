@@ -1,6 +1,9 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from votes.crypto_backends.base import KEY_ALGORITHM_CHOICES, DEFAULT_KEY_ALGORITHM
 
 User = get_user_model()
 
@@ -56,11 +59,22 @@ class Election(models.Model):
     )
     
     # Clés de chiffrement PGP
+    key_algorithm = models.CharField(
+        max_length=20,
+        choices=KEY_ALGORITHM_CHOICES,
+        default=DEFAULT_KEY_ALGORITHM,
+        verbose_name="Algorithme des clés",
+        help_text="Curve25519 : génération quasi instantanée et déchiffrement plus rapide que RSA"
+    )
     co_public_key = models.TextField(blank=True, null=True, help_text="Clé publique CO (PGP)")
     co_private_key = models.TextField(blank=True, null=True, help_text="Clé privée CO (PGP)")
     de_public_key = models.TextField(blank=True, null=True, help_text="Clé publique DE (PGP)")
     de_private_key = models.TextField(blank=True, null=True, help_text="Clé privée DE (PGP)")
     
+    # Réponse de GET /public_keys/ précalculée à l'attribution des clés (voir public_keys.py)
+    public_keys_bundle = models.TextField(blank=True, null=True, editable=False)
+    public_keys_etag = models.CharField(max_length=64, blank=True, null=True, editable=False)
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Élection'
@@ -77,29 +91,107 @@ class Election(models.Model):
             })
     
     def generate_encryption_keys(self):
-        """Génère les paires de clés PGP pour CO et DE"""
-        from votes.crypto_utils import generate_keypair
+        """
+        Attribue (ou remplace) les paires de clés PGP pour CO et DE
+        
+        Les clés publiques sont servies avec Cache-Control immutable :
+        remplacer des clés déjà distribuées est réservé aux brouillons.
+        """
+        from .public_keys import build
+        
+        co_keys = self._claim_or_generate_keypair('co')
+        de_keys = self._claim_or_generate_keypair('de')
         
-        # Générer clés CO
-        print(f"🔑 Génération des clés PGP pour CO (Election {self.id})...")
-        co_keys = generate_keypair(
-            name=f"CO Election {self.id}",
-            email=f"co-election-{self.id}@evote.local"
-        )
         self.co_public_key = co_keys['public_key']
         self.co_private_key = co_keys['private_key']
-        
-        # Générer clés DE
-        print(f"🔑 Génération des clés PGP pour DE (Election {self.id})...")
-        de_keys = generate_keypair(
-            name=f"DE Election {self.id}",
-            email=f"de-election-{self.id}@evote.local"
-        )
         self.de_public_key = de_keys['public_key']
         self.de_private_key = de_keys['private_key']
+        self.public_keys_bundle, self.public_keys_etag = build(
+            self.co_public_key, self.de_public_key, self.key_algorithm
+        )
         
         self.save()
-        print(f"✅ Clés PGP générées avec succès!")
+        print("✅ Clés PGP attribuées avec succès!")
+    
+    def ensure_encryption_keys(self):
+        """
+        Attribue les clés CO et DE si l'élection n'en a pas encore
+        
+        Sûr en concurrence : l'écriture est un UPDATE conditionnel, le
+        perdant d'une course remet ses clés dans le pool et relit celles
+        du gagnant. Ne génère une clé RSA que si le pool est vide.
+        
+        Returns:
+            bool: True si des clés ont été attribuées par cet appel
+        """
+        from django.db.models import Q
+        from encryption.key_pool import release_keypair
+        from .public_keys import build
+        
+        if self.co_public_key and self.de_public_key:
+            return False
+        
+        co_keys = self._claim_or_generate_keypair('co')
+        de_keys = self._claim_or_generate_keypair('de')
+        bundle, etag = build(co_keys['public_key'], de_keys['public_key'], self.key_algorithm)
+        
+        without_keys = Q(co_public_key__isnull=True) | Q(co_public_key='')
+        updated = Election.objects.filter(without_keys, pk=self.pk).update(
+            co_public_key=co_keys['public_key'],
+            co_private_key=co_keys['private_key'],
+            de_public_key=de_keys['public_key'],
+            de_private_key=de_keys['private_key'],
+            public_keys_bundle=bundle,
+            public_keys_etag=etag,
+        )
+        
+        if updated:
+            # update() n'émet pas post_save : invalidation explicite de l'état en cache
+            from django.db import transaction
+            from .election_state import invalidate
+            transaction.on_commit(lambda: invalidate(self.pk))
+        else:
+            release_keypair(co_keys)
+            release_keypair(de_keys)
+        
+        # Clés privées relues seulement si l'instance les avait chargées (voir public_keys.load)
+        deferred = self.get_deferred_fields()
+        self.refresh_from_db(fields=[
+            field for field in (
+                'co_public_key', 'co_private_key', 'de_public_key', 'de_private_key',
+                'public_keys_bundle', 'public_keys_etag'
+            )
+            if field not in deferred or 'private' not in field
+        ])
+        return bool(updated)
+    
+    def _claim_or_generate_keypair(self, role):
+        """Réclame une paire de clés dans le pool, ou la génère si le pool est vide"""
+        from encryption.key_pool import claim_keypair
+        from votes.crypto_utils import generate_keypair
+        
+        keys = claim_keypair(self, role)
+        if keys:
+            print(f"🔑 Clé {role.upper()} ({self.key_algorithm}) réclamée dans le pool (Election {self.id})")
+            return keys
+        
+        print(f"🔑 Pool vide : génération des clés {self.key_algorithm} pour {role.upper()} (Election {self.id})...")
+        keys = generate_keypair(
+            name=f"{role.upper()} Election {self.id}",
+            email=f"{role}-election-{self.id}@evote.local",
+            algorithm=self.key_algorithm
+        )
+        
+        from encryption.models import PooledKeyPair
+        PooledKeyPair.objects.create(
+            fingerprint=keys['fingerprint'],
+            public_key=keys['public_key'],
+            algorithm=self.key_algorithm,
+            claimed_at=timezone.now(),
+            claimed_for=self,
+            claimed_role=role,
+        )
+        return keys
     
     @property
     def is_active(self):
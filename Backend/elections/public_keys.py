@@ -0,0 +1,86 @@
+"""
+Clés publiques CO / DE d'une élection, précalculées (GET /api/elections/<id>/public_keys/)
+
+Le corps JSON de la réponse et son empreinte SHA-256 sont calculés une
+fois, à l'attribution des clés (Election.ensure_encryption_keys), et
+stockés dans l'élection. La vue ne lit que ces deux colonnes, jamais les
+clés privées, et renvoie le corps tel quel.
+
+Les clés d'une élection ne changent plus une fois attribuées : la
+réponse est servie avec un ETag fort et `Cache-Control: immutable`, un
+reverse proxy peut donc absorber le pic de l'ouverture.
+"""
+
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+
+# Un an : valeur maximale usuelle pour une ressource immuable
+MAX_AGE = 365 * 24 * 3600
+
+
+def build(co_public_key, de_public_key, key_algorithm):
+    """
+    Corps de la réponse et son empreinte
+
+    Returns:
+        tuple: (corps JSON, empreinte SHA-256 hexadécimale), (None, None) sans clés
+    """
+    if not co_public_key or not de_public_key:
+        return None, None
+
+    body = json.dumps({
+        'co_public_key': co_public_key,
+        'de_public_key': de_public_key,
+        'key_algorithm': key_algorithm,
+    }, separators=(',', ':'))
+    return body, hashlib.sha256(body.encode()).hexdigest()
+
+
+def load(election_id):
+    """
+    Corps précalculé et empreinte, clés attribuées au besoin
+
+    Returns:
+        tuple | None: (corps JSON, empreinte), None si l'élection n'existe pas
+    """
+    from .models import Election
+
+    row = Election.objects.filter(pk=election_id).values_list(
+        'public_keys_bundle', 'public_keys_etag'
+    ).first()
+    if row is None or row[0]:
+        return row
+
+    # Élections antérieures au pool : attribution atomique (pas de doublon)
+    election = Election.objects.only(
+        'id', 'key_algorithm', 'co_public_key', 'de_public_key'
+    ).get(pk=election_id)
+    election.ensure_encryption_keys()
+    if election.public_keys_bundle:
+        return election.public_keys_bundle, election.public_keys_etag
+
+    # Clés présentes mais réponse jamais calculée (clés écrites hors du modèle)
+    bundle, etag = build(election.co_public_key, election.de_public_key, election.key_algorithm)
+    Election.objects.filter(pk=election_id).update(public_keys_bundle=bundle, public_keys_etag=etag)
+    return bundle, etag
+
+
+async def aload(election_id):
+    """load() pour les vues asynchrones"""
+    from .models import Election
+
+    row = await Election.objects.filter(pk=election_id).values_list(
+        'public_keys_bundle', 'public_keys_etag'
+    ).afirst()
+    if row is None or row[0]:
+        return row
+    return await sync_to_async(load)(election_id)
+
+
+def response_headers(digest):
+    return {
+        'ETag': f'"{digest}"',
+        'Cache-Control': f'public, max-age={MAX_AGE}, immutable',
+    }
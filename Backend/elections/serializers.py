@@ -1,6 +1,7 @@
 
 
 from rest_framework import serializers
+from . import voter_index
 from .models import Election, ElectionVoterAssignment
 from authentication.serializers import UserSerializer
 
@@ -25,9 +26,10 @@ class ElectionSerializer(serializers.ModelSerializer):
             'start_date', 'end_date', 'created_at', 'updated_at',
             'created_by', 'created_by_name', 'total_candidates', 'total_voters',
             'total_votes', 'participation_rate', 'is_active',
-            'has_voted'
+            'has_voted', 'key_algorithm'
         ]
-        read_only_fields = ['created_by', 'created_at', 'updated_at']
+        # L'algorithme est figé à la création : les clés en dépendent
+        read_only_fields = ['created_by', 'created_at', 'updated_at', 'key_algorithm']
     
     def get_has_voted(self, obj):
         """Vérifie si l'utilisateur actuel a voté pour cette élection"""
@@ -38,6 +40,11 @@ class ElectionSerializer(serializers.ModelSerializer):
         if request.user.role != 'voter':
             return False
         
+        # Index bitmap de l'élection ouverte : pas de requête SQL
+        indexed = voter_index.lookup(obj.id, request.user.id)
+        if indexed is not None:
+            return indexed[1]
+        
         # Vérifier via ElectionVoterAssignment
         assignment = ElectionVoterAssignment.objects.filter(
             election=obj,
@@ -55,7 +62,7 @@ class ElectionCreateSerializer(serializers.ModelSerializer):
         model = Election
         fields = [
             'title', 'description', 'start_date', 'end_date',
-            'allow_multiple_votes', 'is_public'
+            'allow_multiple_votes', 'is_public', 'key_algorithm'
         ]
 
 
@@ -0,0 +1,91 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from candidates.models import Candidate
+
+from . import ballot_bundle, election_state, voter_index
+from .models import Election, ElectionVoterAssignment
+
+# Statuts pendant lesquels le CO / DE déchiffrent encore des votes
+KEY_IN_USE_STATUSES = ('open', 'closed')
+
+
+def _forget_election_keys(election):
+    """Évince du cache crypto (et du daemon) les clés privées CO et DE de l'élection"""
+    from votes.crypto_utils import forget_election_keys
+
+    forget_election_keys(election)
+
+
+@receiver(post_save, sender=Election)
+def evict_keys_when_election_leaves_active_state(sender, instance, **kwargs):
+    """Les clés ne restent en mémoire que tant que l'élection est ouverte ou fermée"""
+    if instance.status not in KEY_IN_USE_STATUSES:
+        _forget_election_keys(instance)
+
+
+@receiver(post_delete, sender=Election)
+def evict_keys_of_deleted_election(sender, instance, **kwargs):
+    _forget_election_keys(instance)
+
+
+# ============= ÉTAT DES ÉLECTIONS =============
+
+@receiver(post_save, sender=Election)
+@receiver(post_delete, sender=Election)
+def invalidate_election_state(sender, instance, **kwargs):
+    """Toute modification (vues open / close, admin) change la version de l'état en cache"""
+    election_id = instance.pk
+    transaction.on_commit(lambda: election_state.invalidate(election_id))
+
+
+@receiver(post_save, sender=Candidate)
+@receiver(post_delete, sender=Candidate)
+def invalidate_ballot_bundle(sender, instance, **kwargs):
+    """Candidats modifiés : nouvelle version de l'élection, donc du bulletin (ballot-bundle)"""
+    election_id = instance.election_id
+    transaction.on_commit(lambda: election_state.invalidate(election_id))
+
+
+@receiver(post_delete, sender=Election)
+def forget_ballot_bundle(sender, instance, **kwargs):
+    ballot_bundle.forget(instance.pk)
+
+
+@receiver(post_save, sender=Election)
+@receiver(post_delete, sender=Election)
+def forget_admission_buckets(sender, instance, **kwargs):
+    """Seaux d'admission réinitialisés à chaque ouverture, supprimés ensuite"""
+    from votes.admission import forget_election
+
+    forget_election(instance.pk)
+
+
+# ============= INDEX ÉLECTEURS =============
+
+@receiver(post_save, sender=Election)
+def sync_voter_index_with_status(sender, instance, **kwargs):
+    """Index construit à l'ouverture de l'élection, supprimé ensuite"""
+    election_id = instance.pk
+    if instance.status == 'open':
+        transaction.on_commit(lambda: voter_index.build_index(election_id))
+    else:
+        voter_index.drop_index(election_id)
+
+
+@receiver(post_delete, sender=Election)
+def drop_voter_index_of_deleted_election(sender, instance, **kwargs):
+    voter_index.drop_index(instance.pk)
+
+
+@receiver(post_save, sender=ElectionVoterAssignment)
+def index_assignment(sender, instance, **kwargs):
+    election_id, voter_id, has_voted = instance.election_id, instance.voter_id, instance.has_voted
+    transaction.on_commit(lambda: voter_index.mark_assigned(election_id, voter_id, has_voted))
+
+
+@receiver(post_delete, sender=ElectionVoterAssignment)
+def unindex_assignment(sender, instance, **kwargs):
+    election_id, voter_id = instance.election_id, instance.voter_id
+    transaction.on_commit(lambda: voter_index.mark_unassigned(election_id, voter_id))
@@ -1,3 +1,118 @@
+import json
+import uuid
+from datetime import timedelta
+
 from django.test import TestCase
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.models import User
+from candidates.models import Candidate
+from votes import submission
+from votes.crypto_utils import encrypt_message
+
+from . import ballot_bundle, election_state, voter_index
+from .async_views import AsyncBallotBundleView
+from .models import Election, ElectionVoterAssignment
+from .views import BallotBundleView
+
+
+class BallotBundleTestsMixin:
+    """GET /api/elections/<id>/ballot-bundle/ : ETag, 304 et changements de version"""
+
+    def setUp(self):
+        self.election = Election.objects.create(
+            title='Élection de test',
+            description='Test',
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(days=1),
+            key_algorithm='curve25519',
+            status='open',
+        )
+        self.election.ensure_encryption_keys()
+        # on_commit ne s'exécute pas dans un TestCase et les ids sont réutilisés
+        election_state.invalidate(self.election.id)
+        voter_index.drop_index(self.election.id)
+        ballot_bundle.forget(self.election.id)
+
+        self.candidate = Candidate.objects.create(election=self.election, name='Alice', program='Programme')
+        self.voter = User.objects.create_user(
+            username=f'voter-{uuid.uuid4().hex[:8]}',
+            email=f'{uuid.uuid4().hex[:8]}@evote.test',
+            password='x',
+            role='voter',
+        )
+        ElectionVoterAssignment.objects.create(election=self.election, voter=self.voter)
+        self.url = f'/api/elections/{self.election.id}/ballot-bundle/'
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(self.voter).access_token}'}
+
+    def get(self, **headers):
+        raise NotImplementedError
+
+    def get_etag(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        return response['ETag']
+
+    def test_not_modified(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual([candidate['name'] for candidate in data['candidates']], ['Alice'])
+        self.assertEqual(data['vote_status'], {'has_voted': False, 'is_assigned': True})
+
+        tag = response['ETag']
+        response = self.get(HTTP_IF_NONE_MATCH=tag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], tag)
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH='"autre"').status_code, 200)
+
+    def test_etag_changes_with_candidates(self):
+        tag = self.get_etag()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.candidate.program = 'Nouveau programme'
+            self.candidate.save()
+
+        self.assertNotEqual(self.get_etag(), tag)
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=tag).status_code, 200)
+
+    def test_etag_changes_after_vote(self):
+        tag = self.get_etag()
+
+        linking_id = uuid.uuid4().hex
+        submission.submit(self.voter, {
+            'election_id': self.election.id,
+            'm1_identity': encrypt_message(json.dumps({'linking_id': linking_id}), self.election.co_public_key),
+            'm2_ballot': encrypt_message(
+                json.dumps({'linking_id': linking_id, 'candidate_id': self.candidate.id}),
+                self.election.de_public_key
+            ),
+            'unique_id': str(uuid.uuid4()),
+        })
+
+        response = self.get(HTTP_IF_NONE_MATCH=tag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], tag)
+        self.assertEqual(json.loads(response.content)['vote_status'], {'has_voted': True, 'is_assigned': True})
+
+
+class AsyncBallotBundleTests(BallotBundleTestsMixin, TestCase):
+    """Route par défaut (VOTER_ASYNC_VIEWS)"""
+
+    def get(self, **headers):
+        return self.client.get(self.url, **self.auth, **headers)
+
+    def test_async_view_routed_by_default(self):
+        self.assertIs(resolve(self.url).func.view_class, AsyncBallotBundleView)
+
+
+class SyncBallotBundleTests(BallotBundleTestsMixin, TestCase):
+    """Vue DRF synchrone (VOTER_ASYNC_VIEWS=False)"""
 
-# Create your tests here.
+    def get(self, **headers):
+        request = APIRequestFactory().get(self.url, **self.auth, **headers)
+        return BallotBundleView.as_view()(request, pk=self.election.id).render()
@@ -1,13 +1,19 @@
+from django.conf import settings
 from django.urls import path
+from .async_views import AsyncElectionPublicKeysView, AsyncBallotBundleView
 from .views import (
     ElectionListCreateView, ElectionDetailView, ElectionOpenView,
     ElectionCloseView, AssignVotersView, ElectionVotersView, ElectionStatsView,ElectionPublicKeysView, 
-    ElectionPrivateKeysView,
+    ElectionPrivateKeysView, BallotBundleView,
 
 )
 
 app_name = 'elections'
 
+# Clés publiques et bulletin : vues asynchrones (ASGI) ou DRF synchrones
+PublicKeysView = AsyncElectionPublicKeysView if settings.VOTER_ASYNC_VIEWS else ElectionPublicKeysView
+BundleView = AsyncBallotBundleView if settings.VOTER_ASYNC_VIEWS else BallotBundleView
+
 urlpatterns = [
     path('', ElectionListCreateView.as_view(), name='election-list-create'),
     path('<int:pk>/', ElectionDetailView.as_view(), name='election-detail'),
@@ -15,7 +21,8 @@ urlpatterns = [
     path('<int:pk>/close/', ElectionCloseView.as_view(), name='election-close'),
     path('assign-voters/', AssignVotersView.as_view(), name='assign-voters'),
     path('<int:pk>/voters/', ElectionVotersView.as_view(), name='election-voters'),
-    path('<int:pk>/public_keys/', ElectionPublicKeysView.as_view(), name='election-public-keys'),  
+    path('<int:pk>/public_keys/', PublicKeysView.as_view(), name='election-public-keys'),  
+    path('<int:pk>/ballot-bundle/', BundleView.as_view(), name='election-ballot-bundle'),
     path('<int:pk>/stats/', ElectionStatsView.as_view(), name='election-stats'),
     path('<int:pk>/private_keys/', ElectionPrivateKeysView.as_view(), name='election-private-keys'), 
     
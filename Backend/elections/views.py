@@ -4,10 +4,12 @@ from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
+from django.http import Http404, HttpResponse, HttpResponseNotModified
 from django.db.models import Count, Q
 from django.utils import timezone
 from rest_framework.decorators import action
 
+from . import ballot_bundle, public_keys
 from .models import Election, ElectionVoterAssignment
 from .serializers import (
     ElectionSerializer,
@@ -16,6 +18,7 @@ from .serializers import (
     BulkAssignVotersSerializer
 )
 from authentication.models import User
+from votes.admission import ElectionAdmissionThrottle
 
 
 class ElectionListCreateView(generics.ListCreateAPIView):
@@ -56,8 +59,9 @@ class ElectionListCreateView(generics.ListCreateAPIView):
         return queryset.distinct()
     
     def perform_create(self, serializer):
-        """Set created_by to current user"""
-        serializer.save(created_by=self.request.user)
+        """Set created_by to current user and claim CO/DE keys from the pool"""
+        election = serializer.save(created_by=self.request.user)
+        election.ensure_encryption_keys()
 
 
 class ElectionDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -115,6 +119,9 @@ class ElectionOpenView(APIView):
                 'error': 'Impossible d\'ouvrir une élection sans candidats.'
             }, status=status.HTTP_400_BAD_REQUEST)
         
+        # Clés CO/DE prêtes avant l'arrivée des électeurs
+        election.ensure_encryption_keys()
+        
         # Open election
         election.status = 'open'
         election.save()
@@ -257,22 +264,52 @@ class ElectionStatsView(APIView):
 class ElectionPublicKeysView(APIView):
     """
     GET /api/elections/<id>/public_keys/ - Retourne les clés publiques CO et DE
+    
+    Réponse précalculée (voir public_keys.py), immuable : ETag fort et 304
     """
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [ElectionAdmissionThrottle]
+    admission_scope = 'public_keys'
     
     def get(self, request, pk):
-        election = get_object_or_404(Election, pk=pk)
+        # Corps et empreinte seulement : aucune clé privée chargée
+        loaded = public_keys.load(pk)
+        if loaded is None:
+            raise Http404
         
-        # Générer les clés si elles n'existent pas
-        if not election.co_public_key or not election.de_public_key:
-            print(f"🔑 Génération des clés pour l'élection {election.id}...")
-            election.generate_encryption_keys()
-            print(f"✅ Clés générées!")
+        body, digest = loaded
+        headers = public_keys.response_headers(digest)
+        if ballot_bundle.not_modified(request, headers['ETag']):
+            return HttpResponseNotModified(headers=headers)
         
-        return Response({
-            'co_public_key': election.co_public_key,
-            'de_public_key': election.de_public_key,
-        })
+        return HttpResponse(body, content_type='application/json', headers=headers)
+
+
+class BallotBundleView(APIView):
+    """
+    GET /api/elections/<id>/ballot-bundle/ - Élection, candidats, clés publiques
+    et statut de vote en une seule requête (ETag, 304 si inchangé)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [ElectionAdmissionThrottle]
+    admission_scope = 'ballot_bundle'
+    
+    def get(self, request, pk):
+        bundle = ballot_bundle.get_bundle(pk)
+        if bundle is None:
+            raise Http404
+        
+        vote_status = ballot_bundle.vote_status(pk, request.user)
+        # Électeurs : seulement les élections auxquelles ils sont assignés
+        if request.user.role == 'voter' and not vote_status['is_assigned']:
+            raise Http404
+        
+        tag = ballot_bundle.etag(bundle, vote_status)
+        headers = ballot_bundle.response_headers(tag)
+        if ballot_bundle.not_modified(request, tag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        return Response(ballot_bundle.response_data(request, bundle, vote_status), headers=headers)
 
 
 class ElectionPrivateKeysView(APIView):
@@ -0,0 +1,289 @@
+"""
+Index bitmap des électeurs, par élection ouverte
+
+Deux bitsets par élection, indexés par l'id de l'électeur :
+    eligible : électeur assigné à l'élection
+    voted    : électeur ayant déjà voté
+
+L'index est construit à l'ouverture de l'élection (ou au premier accès),
+tenu à jour par les signaux d'ElectionVoterAssignment et par
+SubmitVoteView, puis supprimé à la fermeture. Les vérifications
+d'éligibilité et de statut de vote deviennent O(1), sans SQL.
+
+La base reste l'autorité : SubmitVoteView réclame toujours le vote par
+un UPDATE conditionnel. L'index ne sert qu'à répondre vite. Les écritures
+qui contournent les signaux (bulk_create, update) sur une élection
+ouverte doivent être suivies de build_index().
+
+Stockage (paramètre VOTER_INDEX_BACKEND) :
+    'local' : mémoire du processus (un index par worker, construit une
+              fois) ; les assignations et votes faits dans un autre worker
+              n'y figurent pas : seule la réponse « assigné et a voté » est
+              retenue, les autres sont confirmées en base
+    'redis' : partagé entre tous les workers (VOTER_INDEX_REDIS_URL)
+    ''      : désactivé, toutes les vérifications passent par la base
+              (défaut, sauf si VOTER_INDEX_REDIS_URL est configuré)
+"""
+
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+# Délai avant de retenter la construction de l'index d'une élection non ouverte
+MISSING_RETRY_DELAY = 10
+
+
+def to_bitmap(ids):
+    """Bitset (bit de poids fort en premier, comme SETBIT de Redis) des ids donnés"""
+    ids = list(ids)
+    bitmap = bytearray((max(ids) >> 3) + 1 if ids else 0)
+    for offset in ids:
+        bitmap[offset >> 3] |= 0x80 >> (offset & 7)
+    return bitmap
+
+
+def _get_bit(bitmap, offset):
+    index = offset >> 3
+    return index < len(bitmap) and bool(bitmap[index] & (0x80 >> (offset & 7)))
+
+
+def _set_bit(bitmap, offset, value):
+    index = offset >> 3
+    if index >= len(bitmap):
+        if not value:
+            return
+        bitmap.extend(bytes(index + 1 - len(bitmap)))
+    if value:
+        bitmap[index] |= 0x80 >> (offset & 7)
+    else:
+        bitmap[index] &= ~(0x80 >> (offset & 7)) & 0xFF
+
+
+class LocalBitmapStore:
+    """Bitsets en mémoire du processus"""
+
+    shared = False
+
+    def __init__(self):
+        self._elections = {}
+        self._lock = threading.Lock()
+
+    def load(self, election_id, eligible, voted):
+        with self._lock:
+            self._elections[election_id] = (bytearray(eligible), bytearray(voted))
+
+    def lookup(self, election_id, voter_id):
+        bitmaps = self._elections.get(election_id)
+        if bitmaps is None:
+            return None
+        return _get_bit(bitmaps[0], voter_id), _get_bit(bitmaps[1], voter_id)
+
+    def update(self, election_id, voter_id, eligible=None, voted=None):
+        with self._lock:
+            bitmaps = self._elections.get(election_id)
+            if bitmaps is None:
+                return
+            if eligible is not None:
+                _set_bit(bitmaps[0], voter_id, eligible)
+            if voted is not None:
+                _set_bit(bitmaps[1], voter_id, voted)
+
+    def drop(self, election_id):
+        with self._lock:
+            self._elections.pop(election_id, None)
+
+
+class RedisBitmapStore:
+    """Bitsets Redis (SETBIT / GETBIT), partagés par tous les workers"""
+
+    shared = True
+
+    # Ne modifie un bit que si l'index de l'élection existe (pas d'index partiel)
+    UPDATE_SCRIPT = """
+    if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+    if ARGV[2] ~= '' then redis.call('SETBIT', KEYS[1], ARGV[1], ARGV[2]) end
+    if ARGV[3] ~= '' then redis.call('SETBIT', KEYS[2], ARGV[1], ARGV[3]) end
+    return 1
+    """
+
+    def __init__(self, url):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._update = self._redis.register_script(self.UPDATE_SCRIPT)
+
+    @staticmethod
+    def _keys(election_id):
+        return f'evote:election:{election_id}:eligible', f'evote:election:{election_id}:voted'
+
+    def load(self, election_id, eligible, voted):
+        eligible_key, voted_key = self._keys(election_id)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.set(eligible_key, bytes(eligible))
+        pipe.set(voted_key, bytes(voted))
+        pipe.execute()
+
+    def lookup(self, election_id, voter_id):
+        eligible_key, voted_key = self._keys(election_id)
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.exists(eligible_key)
+        pipe.getbit(eligible_key, voter_id)
+        pipe.getbit(voted_key, voter_id)
+        exists, eligible, voted = pipe.execute()
+        if not exists:
+            return None
+        return bool(eligible), bool(voted)
+
+    def update(self, election_id, voter_id, eligible=None, voted=None):
+        def arg(value):
+            return '' if value is None else int(value)
+
+        self._update(keys=self._keys(election_id), args=[voter_id, arg(eligible), arg(voted)])
+
+    def drop(self, election_id):
+        self._redis.delete(*self._keys(election_id))
+
+
+_store = None
+_store_lock = threading.Lock()
+_missing = {}
+
+
+def get_store():
+    """Stockage configuré (unique par processus), ou None si l'index est désactivé"""
+    global _store
+
+    backend = getattr(settings, 'VOTER_INDEX_BACKEND', '')
+    if not backend:
+        return None
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if backend == 'redis':
+                    _store = RedisBitmapStore(settings.VOTER_INDEX_REDIS_URL)
+                else:
+                    _store = LocalBitmapStore()
+    return _store
+
+
+def build_index(election_id):
+    """Construit (ou reconstruit) l'index d'une élection depuis la base"""
+    from .models import ElectionVoterAssignment
+
+    store = get_store()
+    if store is None:
+        return
+
+    rows = ElectionVoterAssignment.objects.filter(
+        election_id=election_id
+    ).values_list('voter_id', 'has_voted')
+
+    eligible, voted = [], []
+    for voter_id, has_voted in rows.iterator(chunk_size=10000):
+        eligible.append(voter_id)
+        if has_voted:
+            voted.append(voter_id)
+
+    _guard(store.load, election_id, to_bitmap(eligible), to_bitmap(voted))
+    _missing.pop(election_id, None)
+    print(f"🗂️ Index électeurs construit pour l'élection {election_id} ({len(eligible)} électeur(s))")
+
+
+def drop_index(election_id):
+    store = get_store()
+    if store is not None:
+        _guard(store.drop, election_id)
+
+
+def lookup(election_id, voter_id):
+    """
+    Statut d'un électeur selon l'index
+
+    Returns:
+        tuple | None: (is_assigned, has_voted), ou None si l'élection n'est
+        pas indexée ou si l'index local ne permet pas de conclure
+        (l'appelant interroge alors la base)
+    """
+    store = get_store()
+    if store is None:
+        return None
+
+    result = _guard(store.lookup, election_id, voter_id)
+    if result is None and _ensure_index(election_id):
+        result = _guard(store.lookup, election_id, voter_id)
+    return _conclusive(store, result)
+
+
+async def alookup(election_id, voter_id):
+    """
+    lookup() pour les vues asynchrones : lecture directe d'un index local
+    déjà construit, sinon dans un thread (Redis, construction depuis la base)
+    """
+    store = get_store()
+    if store is None:
+        return None
+
+    if isinstance(store, LocalBitmapStore):
+        result = store.lookup(election_id, voter_id)
+        if result is not None:
+            return _conclusive(store, result)
+
+    return await sync_to_async(lookup)(election_id, voter_id)
+
+
+def _conclusive(store, result):
+    """
+    Index local : une assignation ou un vote fait dans un autre worker n'y
+    figure pas. Seul « assigné et a voté » est sûr (un vote n'est jamais
+    annulé) ; le reste est confirmé en base.
+    """
+    if result is None or store.shared or all(result):
+        return result
+    return None
+
+
+def mark_voted(election_id, voter_id):
+    store = get_store()
+    if store is not None:
+        _guard(store.update, election_id, voter_id, voted=True)
+
+
+def mark_assigned(election_id, voter_id, has_voted=False):
+    store = get_store()
+    if store is not None:
+        _guard(store.update, election_id, voter_id, eligible=True, voted=has_voted)
+
+
+def mark_unassigned(election_id, voter_id):
+    store = get_store()
+    if store is not None:
+        _guard(store.update, election_id, voter_id, eligible=False, voted=False)
+
+
+def _ensure_index(election_id):
+    """Construit l'index d'une élection ouverte pas encore indexée (autre worker, redémarrage)"""
+    from .election_state import get_state
+
+    checked_at = _missing.get(election_id)
+    if checked_at is not None and time.monotonic() - checked_at < MISSING_RETRY_DELAY:
+        return False
+
+    state = get_state(election_id)
+    if state is None or not state.is_open:
+        _missing[election_id] = time.monotonic()
+        return False
+
+    build_index(election_id)
+    return True
+
+
+def _guard(operation, *args, **kwargs):
+    """Une panne du stockage ne doit jamais bloquer le vote : repli sur la base"""
+    try:
+        return operation(*args, **kwargs)
+    except Exception as e:
+        print(f"  ⚠️ Index électeurs indisponible: {e}")
+        return None
@@ -1,3 +1,22 @@
 from django.contrib import admin
+from .models import PooledKeyPair
 
-# Register your models here.
+
+@admin.register(PooledKeyPair)
+class PooledKeyPairAdmin(admin.ModelAdmin):
+    """
+    Admin interface for PooledKeyPair model
+    La clé privée n'est jamais affichée
+    """
+    list_display = ['fingerprint', 'algorithm', 'created_at', 'claimed_at', 'claimed_for', 'claimed_role']
+    list_filter = ['algorithm', 'claimed_role', 'created_at', 'claimed_at']
+    search_fields = ['fingerprint']
+    fields = ['fingerprint', 'algorithm', 'public_key', 'created_at', 'claimed_at', 'claimed_for', 'claimed_role']
+    readonly_fields = fields
+    
+    def has_add_permission(self, request):
+        # Le pool est rempli par fill_key_pool
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,209 @@
+"""
+Client du daemon de déchiffrement (voir encryption.daemon)
+
+Une seule connexion par processus, partagée entre threads : les requêtes
+sont envoyées sans attendre les réponses précédentes (pipelining) et un
+thread lecteur remet chaque réponse à l'appelant qui l'attend.
+"""
+
+import base64
+import itertools
+import json
+import socket
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+
+
+class CryptoDaemonError(RuntimeError):
+    """Le daemon est injoignable ou n'a pas répondu à temps"""
+
+
+class CryptoDaemonClient:
+    """
+    Client thread-safe et pipeliné du daemon crypto
+
+    Args:
+        socket_path (str): Chemin de la socket Unix du daemon
+        timeout (float): Délai maximal d'attente d'une réponse, en secondes
+    """
+
+    def __init__(self, socket_path, timeout=30):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._sock = None
+        self._waiting = {}
+
+    # ---------- API ----------
+
+    def decrypt(self, election_id, role, encrypted_message):
+        """
+        Déchiffre un message avec la clé CO ou DE d'une élection
+
+        Raises:
+            ValueError: Si le déchiffrement échoue
+            CryptoDaemonError: Si le daemon est injoignable
+        """
+        result = self._wait(*self._send(decrypt_request(election_id, role, encrypted_message)))
+        if not result.get('ok'):
+            raise ValueError(result.get('error') or "Échec du déchiffrement OpenPGP")
+        return result['plaintext']
+
+    def decrypt_many(self, election_id, role, messages):
+        """
+        Envoie tous les messages d'un coup puis collecte les réponses
+
+        Returns:
+            list[dict]: Même format que votes.crypto_utils.decrypt_many
+        """
+        requests = [self._send(decrypt_request(election_id, role, message)) for message in messages]
+
+        results = []
+        try:
+            for request in requests:
+                result = self._wait(*request)
+                results.append({
+                    'ok': bool(result.get('ok')),
+                    'plaintext': result.get('plaintext'),
+                    'error': result.get('error'),
+                })
+        finally:
+            # Délai dépassé : les réponses restantes ne seront jamais lues
+            self._discard(request_id for request_id, _ in requests)
+        return results
+
+    def forget(self, election_id):
+        """Demande au daemon d'oublier les clés d'une élection"""
+        return self._wait(*self._send({'op': 'forget', 'election_id': election_id}))
+
+    def stats(self):
+        return self._wait(*self._send({'op': 'stats'})).get('stats', {})
+
+    # ---------- transport ----------
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise CryptoDaemonError(f"Daemon crypto injoignable ({self.socket_path}): {e}")
+
+        self._sock = sock
+        threading.Thread(
+            target=self._read_loop,
+            args=(sock,),
+            name='crypto-daemon-reader',
+            daemon=True,
+        ).start()
+
+    def _send(self, payload):
+        """Envoie une requête ; retourne (id de la requête, future de la réponse)"""
+        future = Future()
+
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+
+            request_id = next(self._ids)
+            payload['id'] = request_id
+            self._waiting[request_id] = future
+
+            try:
+                self._sock.sendall(json.dumps(payload).encode('utf-8') + b'\n')
+            except OSError as e:
+                self._waiting.pop(request_id, None)
+                self._reset(self._sock, e)
+                raise CryptoDaemonError(f"Envoi au daemon crypto impossible: {e}")
+
+        return request_id, future
+
+    def _wait(self, request_id, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise CryptoDaemonError("Le daemon crypto n'a pas répondu à temps")
+        finally:
+            # Réponse reçue, en échec ou abandonnée : plus rien à attendre
+            self._discard([request_id])
+
+    def _discard(self, request_ids):
+        with self._lock:
+            for request_id in request_ids:
+                self._waiting.pop(request_id, None)
+
+    def _read_loop(self, sock):
+        buffer = b''
+        error = None
+
+        try:
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                buffer += chunk
+
+                while b'\n' in buffer:
+                    line, buffer = buffer.split(b'\n', 1)
+                    response = json.loads(line)
+                    with self._lock:
+                        future = self._waiting.pop(response.get('id'), None)
+                    if future is not None:
+                        future.set_result(response)
+        except (OSError, ValueError) as e:
+            error = e
+
+        with self._lock:
+            self._reset(sock, error or "connexion fermée")
+
+    def _reset(self, sock, reason):
+        """Ferme la connexion et fait échouer toutes les requêtes en attente (verrou tenu)"""
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+        if self._sock is not sock:
+            # Ancienne connexion déjà remplacée : ses requêtes ont déjà échoué
+            return
+        self._sock = None
+
+        waiting, self._waiting = self._waiting, {}
+        for future in waiting.values():
+            if not future.done():
+                future.set_exception(CryptoDaemonError(f"Connexion au daemon crypto perdue: {reason}"))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def decrypt_request(election_id, role, encrypted_message):
+    """Requête de déchiffrement ; paquets binaires transmis en base64 (protocole JSON)"""
+    request = {'op': 'decrypt', 'election_id': election_id, 'role': role}
+    if isinstance(encrypted_message, str):
+        request['message'] = encrypted_message
+    else:
+        request['packets'] = base64.b64encode(encrypted_message).decode('ascii')
+    return request
+
+
+def get_client():
+    """Client partagé du processus, ou None si CRYPTO_DAEMON_SOCKET n'est pas configuré"""
+    global _client
+
+    socket_path = getattr(settings, 'CRYPTO_DAEMON_SOCKET', '')
+    if not socket_path:
+        return None
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = CryptoDaemonClient(
+                    socket_path,
+                    timeout=getattr(settings, 'CRYPTO_DAEMON_TIMEOUT', 30),
+                )
+    return _client
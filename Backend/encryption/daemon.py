@@ -0,0 +1,293 @@
+"""
+Service de déchiffrement local (daemon) partagé par tous les workers Django
+
+Le daemon charge les clés privées d'élection une seule fois (dans un
+PrivateKeyCache : taille bornée, TTL, effacement à l'éviction), écoute sur
+une socket Unix et reçoit des requêtes de déchiffrement pipelinées depuis
+tous les workers web. Les requêtes d'une même clé sont regroupées en lots
+et réparties sur un pool de processus (un par cœur).
+
+Protocole : une requête JSON par ligne, une réponse JSON par ligne.
+Les réponses portent l'`id` de la requête et peuvent arriver dans le
+désordre.
+
+    {"id": 1, "op": "decrypt", "election_id": 3, "role": "co", "message": "-----BEGIN PGP..."}
+    {"id": 1, "ok": true, "plaintext": "..."}
+
+    (message binaire : "packets": "<base64>" au lieu de "message")
+
+    {"id": 2, "op": "forget", "election_id": 3}
+    {"id": 3, "op": "stats"}
+"""
+
+import asyncio
+import base64
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+from votes.crypto_backends.keycache import PrivateKeyCache
+from votes.crypto_utils import decrypt_chunk, decrypt_pool_context, init_decrypt_worker
+
+# Taille maximale d'une ligne de requête (un message chiffré + enveloppe JSON)
+MAX_REQUEST_BYTES = 1024 * 1024
+
+KEY_FIELDS = {
+    'co': 'co_private_key',
+    'de': 'de_private_key',
+}
+
+
+def load_election_private_key(election_id, role):
+    """Lit la clé privée CO/DE d'une élection en base (appelé hors de la boucle asyncio)"""
+    from elections.models import Election
+
+    field = KEY_FIELDS[role]
+    row = Election.objects.filter(
+        pk=election_id,
+        status__in=['open', 'closed'],
+    ).values_list(field, flat=True).first()
+
+    if not row:
+        raise ValueError(f"Clé {role.upper()} indisponible pour l'élection {election_id}")
+    return row
+
+
+def wipe_private_key(handle):
+    """Efface la copie d'une clé évincée du cache (bytearray)"""
+    handle[:] = bytes(len(handle))
+
+
+def _cache_id(key_id):
+    """Identifiant de la clé (élection, rôle) dans le cache"""
+    return '{}:{}'.format(*key_id)
+
+
+class CryptoDaemon:
+    """
+    Serveur de déchiffrement sur socket Unix
+
+    Args:
+        socket_path (str): Chemin de la socket Unix
+        workers (int): Nombre de processus de déchiffrement
+        batch_size (int): Taille maximale d'un lot envoyé à un processus
+        batch_delay (float): Attente maximale (s) avant d'envoyer un lot incomplet
+    """
+
+    def __init__(self, socket_path, workers=None, batch_size=64, batch_delay=0.005):
+        self.socket_path = socket_path
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+
+        self._keys = PrivateKeyCache(
+            wipe=wipe_private_key,
+            maxsize=getattr(settings, 'CRYPTO_KEY_CACHE_SIZE', 16),
+            ttl=getattr(settings, 'CRYPTO_KEY_CACHE_TTL', 3600),
+        )
+        # Tâches en cours : référencées jusqu'à leur fin (sinon ramassables en vol)
+        self._tasks = set()
+        self._pending = defaultdict(list)
+        self._flush_handles = {}
+        self._pool = None
+        self._started_at = None
+        self.stats = {
+            'requests': 0,
+            'decrypted': 0,
+            'failed': 0,
+            'batches': 0,
+            'key_loads': 0,
+        }
+
+    # ---------- cycle de vie ----------
+
+    async def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=decrypt_pool_context(),
+            initializer=init_decrypt_worker,
+            initargs=(None,),
+        )
+        self._started_at = time.time()
+
+        # Socket accessible uniquement par l'utilisateur du service (et son groupe),
+        # dès sa création par bind()
+        umask = os.umask(0o117)
+        try:
+            server = await asyncio.start_unix_server(
+                self._handle_client,
+                path=self.socket_path,
+                limit=MAX_REQUEST_BYTES,
+            )
+        finally:
+            os.umask(umask)
+
+        print(f"🔐 Daemon crypto à l'écoute sur {self.socket_path} ({self.workers} processus)")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+            self._keys.clear()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    # ---------- connexions ----------
+
+    async def _handle_client(self, reader, writer):
+        write_lock = asyncio.Lock()
+
+        async def reply(payload):
+            data = json.dumps(payload).encode('utf-8') + b'\n'
+            async with write_lock:
+                writer.write(data)
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await reply({'id': None, 'ok': False, 'error': 'Requête trop volumineuse'})
+                    break
+
+                if not line:
+                    break
+
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    await reply({'id': None, 'ok': False, 'error': 'JSON invalide'})
+                    continue
+
+                # Chaque requête est traitée indépendamment : le client peut pipeliner
+                self._spawn(self._dispatch(request, reply))
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _spawn(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"  ❌ Tâche du daemon crypto en échec: {task.exception()!r}")
+
+    async def _dispatch(self, request, reply):
+        request_id = request.get('id')
+        op = request.get('op')
+
+        try:
+            if op == 'decrypt':
+                result = await self._decrypt(request)
+            elif op == 'forget':
+                result = self._forget(request)
+            elif op == 'stats':
+                result = {'ok': True, 'stats': self._stats()}
+            else:
+                result = {'ok': False, 'error': f'Opération inconnue: {op}'}
+        except Exception as e:
+            result = {'ok': False, 'error': str(e)}
+
+        result['id'] = request_id
+        try:
+            await reply(result)
+        except ConnectionError:
+            pass
+
+    # ---------- déchiffrement par lots ----------
+
+    async def _decrypt(self, request):
+        self.stats['requests'] += 1
+
+        role = request.get('role')
+        if role not in KEY_FIELDS:
+            raise ValueError("role doit être 'co' ou 'de'")
+
+        election_id = int(request['election_id'])
+        message = request.get('message')
+        if request.get('packets'):
+            message = base64.b64decode(request['packets'])
+        if not message:
+            raise ValueError("Message chiffré requis")
+
+        key_id = (election_id, role)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key_id].append((message, future))
+
+        if len(self._pending[key_id]) >= self.batch_size:
+            self._flush(key_id)
+        elif key_id not in self._flush_handles:
+            self._flush_handles[key_id] = asyncio.get_running_loop().call_later(
+                self.batch_delay, self._flush, key_id
+            )
+
+        return await future
+
+    def _flush(self, key_id):
+        handle = self._flush_handles.pop(key_id, None)
+        if handle is not None:
+            handle.cancel()
+
+        batch = self._pending.pop(key_id, [])
+        if not batch:
+            return
+
+        self.stats['batches'] += 1
+        self._spawn(self._run_batch(key_id, batch))
+
+    async def _run_batch(self, key_id, batch):
+        messages = [message for message, _ in batch]
+        loop = asyncio.get_running_loop()
+
+        try:
+            # Thread : chargement éventuel de la clé en base, puis attente du pool
+            results = await loop.run_in_executor(None, self._decrypt_batch, key_id, messages)
+        except Exception as e:
+            results = [{'ok': False, 'plaintext': None, 'error': str(e)} for _ in batch]
+
+        for (_, future), result in zip(batch, results):
+            self.stats['decrypted' if result['ok'] else 'failed'] += 1
+            if not future.done():
+                future.set_result(dict(result))
+
+    def _decrypt_batch(self, key_id, messages):
+        # Clé empruntée au cache le temps du lot : pas d'effacement en cours d'usage
+        with self._keys.borrow(_cache_id(key_id), lambda _: self._load_key(key_id)) as private_key:
+            private_key = private_key.decode('utf-8')
+            return self._pool.submit(decrypt_chunk, messages, private_key).result()
+
+    def _load_key(self, key_id):
+        private_key = load_election_private_key(*key_id)
+        self.stats['key_loads'] += 1
+        return _cache_id(key_id), bytearray(private_key.encode('utf-8'))
+
+    # ---------- administration ----------
+
+    def _forget(self, request):
+        election_id = int(request['election_id'])
+        forgotten = sum(self._keys.evict(_cache_id((election_id, role))) for role in KEY_FIELDS)
+        return {'ok': True, 'forgotten': forgotten}
+
+    def _stats(self):
+        return {
+            **self.stats,
+            'workers': self.workers,
+            'batch_size': self.batch_size,
+            'keys_loaded': self._keys.stats()['size'],
+            'pending': sum(len(batch) for batch in self._pending.values()),
+            'uptime': round(time.time() - self._started_at, 1) if self._started_at else 0,
+        }
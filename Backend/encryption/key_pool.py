@@ -0,0 +1,161 @@
+"""
+Pool de paires de clés OpenPGP pré-générées
+
+Les élections réclament leurs clés CO/DE dans le pool (opération atomique,
+sans génération RSA sur le chemin de la requête). Chaque algorithme a son
+propre stock : celui de l'algorithme réclamé est rechargé en tâche de fond
+dès qu'il passe sous KEY_POOL_LOW_WATERMARK, et le pool peut être rempli à
+l'avance avec `python manage.py fill_key_pool`.
+"""
+
+import secrets
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from votes.crypto_backends.base import DEFAULT_KEY_ALGORITHM
+
+from .models import PooledKeyPair
+
+# Nombre de tentatives de réclamation avant d'abandonner (forte contention)
+CLAIM_ATTEMPTS = 5
+
+_refill_lock = threading.Lock()
+_refill_threads = {}
+
+
+def available_count(algorithm=DEFAULT_KEY_ALGORITHM):
+    """Nombre de paires de clés `algorithm` disponibles dans le pool"""
+    return PooledKeyPair.objects.filter(claimed_at__isnull=True, algorithm=algorithm).count()
+
+
+def generate_pooled_keypair(algorithm=DEFAULT_KEY_ALGORITHM):
+    """Génère une paire de clés et l'ajoute au pool"""
+    from votes.crypto_utils import generate_keypair
+
+    label = secrets.token_hex(4)
+    keys = generate_keypair(
+        name=f"Evote Election Key {label}",
+        email=f"election-key-{label}@evote.local",
+        algorithm=algorithm
+    )
+    return PooledKeyPair.objects.create(
+        fingerprint=keys['fingerprint'],
+        algorithm=algorithm,
+        public_key=keys['public_key'],
+        private_key=keys['private_key'],
+    )
+
+
+def fill_pool(target, algorithm=DEFAULT_KEY_ALGORITHM, stop_event=None):
+    """
+    Génère des clés jusqu'à avoir `target` paires `algorithm` disponibles
+
+    Returns:
+        int: Nombre de paires générées
+    """
+    generated = 0
+    while available_count(algorithm) < target:
+        if stop_event is not None and stop_event.is_set():
+            break
+        generate_pooled_keypair(algorithm)
+        generated += 1
+    return generated
+
+
+def claim_keypair(election, role):
+    """
+    Réclame atomiquement une paire de clés disponible pour `election`,
+    dans l'algorithme de l'élection (`election.key_algorithm`)
+
+    La réclamation est un UPDATE conditionnel (claimed_at IS NULL) : deux
+    requêtes concurrentes ne peuvent jamais obtenir la même clé, quel que
+    soit le SGBD. La clé privée est effacée du pool dans le même UPDATE.
+
+    Returns:
+        dict | None: {'fingerprint', 'public_key', 'private_key'} ou None si le pool est vide
+    """
+    keys = None
+    algorithm = election.key_algorithm
+
+    for _ in range(CLAIM_ATTEMPTS):
+        candidate = PooledKeyPair.objects.filter(
+            claimed_at__isnull=True,
+            algorithm=algorithm,
+        ).order_by('created_at').values('pk', 'fingerprint', 'public_key', 'private_key').first()
+
+        if candidate is None:
+            break
+
+        claimed = PooledKeyPair.objects.filter(
+            pk=candidate['pk'],
+            claimed_at__isnull=True,
+        ).update(
+            claimed_at=timezone.now(),
+            claimed_for=election,
+            claimed_role=role,
+            private_key='',
+        )
+
+        if claimed:
+            keys = {
+                'fingerprint': candidate['fingerprint'],
+                'public_key': candidate['public_key'],
+                'private_key': candidate['private_key'],
+            }
+            break
+
+    refill_in_background(algorithm)
+    return keys
+
+
+def release_keypair(keys):
+    """Remet dans le pool une paire réclamée mais finalement inutilisée"""
+    PooledKeyPair.objects.filter(fingerprint=keys['fingerprint']).update(
+        claimed_at=None,
+        claimed_for=None,
+        claimed_role='',
+        private_key=keys['private_key'],
+    )
+
+
+def refill_in_background(algorithm=DEFAULT_KEY_ALGORITHM):
+    """
+    Relance (au plus un thread par processus et par algorithme) le
+    remplissage du pool s'il est passé sous le seuil bas
+    """
+    low_watermark = getattr(settings, 'KEY_POOL_LOW_WATERMARK', 4)
+    target = getattr(settings, 'KEY_POOL_TARGET_SIZE', 10)
+
+    if not getattr(settings, 'KEY_POOL_BACKGROUND_REFILL', True):
+        return
+
+    with _refill_lock:
+        thread = _refill_threads.get(algorithm)
+        if thread is not None and thread.is_alive():
+            return
+        if available_count(algorithm) >= low_watermark:
+            return
+
+        thread = threading.Thread(
+            target=_refill,
+            args=(target, algorithm),
+            name=f'key-pool-refill-{algorithm}',
+            daemon=True,
+        )
+        _refill_threads[algorithm] = thread
+        thread.start()
+
+
+def _refill(target, algorithm):
+    try:
+        generated = fill_pool(target, algorithm)
+        if generated:
+            print(f"🔑 Pool de clés {algorithm} rechargé (+{generated})")
+    except Exception as e:
+        print(f"  ⚠️ Échec du remplissage du pool de clés: {e}")
+    finally:
+        close_old_connections()
+        connection.close()
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from votes.crypto_backends import get_backend
+from votes.crypto_backends.base import KEY_ALGORITHMS
+from votes.crypto_utils import generate_keypair, encrypt_message, decrypt_message, forget_private_key
+
+
+class Command(BaseCommand):
+    help = "Compare génération, chiffrement et déchiffrement pour chaque algorithme de clé (RSA 2048/3072, Curve25519)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--algorithm', action='append', choices=KEY_ALGORITHMS, default=None,
+            help="Algorithme à mesurer, répétable (défaut: tous)"
+        )
+        parser.add_argument(
+            '--messages', type=int, default=200,
+            help="Nombre de messages chiffrés puis déchiffrés par algorithme"
+        )
+        parser.add_argument(
+            '--keys', type=int, default=3,
+            help="Nombre de paires de clés générées par algorithme"
+        )
+
+    def handle(self, *args, **options):
+        algorithms = options['algorithm'] or list(KEY_ALGORITHMS)
+        count = options['messages']
+        plaintext = '{"candidate_id": 42, "candidate_name": "Benchmark", "election_id": 1}'
+
+        self.stdout.write(f"🔐 Backend : {get_backend().name}, {count} message(s) par algorithme\n")
+
+        rows = []
+        for algorithm in algorithms:
+            start = time.perf_counter()
+            for _ in range(options['keys']):
+                keys = generate_keypair('Bench', 'bench@evote.local', algorithm=algorithm)
+            keygen = (time.perf_counter() - start) / options['keys']
+
+            start = time.perf_counter()
+            messages = [encrypt_message(plaintext, keys['public_key']) for _ in range(count)]
+            encrypt_rate = count / (time.perf_counter() - start)
+
+            # Premier déchiffrement hors mesure : chargement de la clé dans le cache
+            decrypt_message(messages[0], keys['private_key'])
+            start = time.perf_counter()
+            for message in messages:
+                if decrypt_message(message, keys['private_key']) != plaintext:
+                    raise ValueError(f"Aller-retour incorrect pour {algorithm}")
+            decrypt_rate = count / (time.perf_counter() - start)
+            forget_private_key(keys['private_key'])
+
+            rows.append((algorithm, keygen, encrypt_rate, decrypt_rate, len(messages[0])))
+
+        self.stdout.write(f"{'Algorithme':<12} {'Génération':>12} {'Chiffr./s':>11} {'Déchiffr./s':>12} {'Message':>9}")
+        for algorithm, keygen, encrypt_rate, decrypt_rate, size in rows:
+            self.stdout.write(
+                f"{algorithm:<12} {keygen * 1000:>9.1f} ms {encrypt_rate:>11.1f} {decrypt_rate:>12.1f} {size:>7} o"
+            )
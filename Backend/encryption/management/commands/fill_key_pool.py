@@ -0,0 +1,55 @@
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from encryption.key_pool import available_count, fill_pool
+from votes.crypto_backends.base import KEY_ALGORITHMS, DEFAULT_KEY_ALGORITHM
+
+
+class Command(BaseCommand):
+    help = "Remplit le pool de paires de clés OpenPGP pré-générées (à lancer avant les jours d'affluence)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target', type=int, default=None,
+            help="Nombre de paires disponibles visé (défaut: KEY_POOL_TARGET_SIZE)"
+        )
+        parser.add_argument(
+            '--algorithm', action='append', choices=KEY_ALGORITHMS, default=None,
+            help=f"Algorithme à stocker, répétable (défaut: {DEFAULT_KEY_ALGORITHM})"
+        )
+        parser.add_argument(
+            '--watch', action='store_true',
+            help="Reste actif et recharge le pool dès qu'il descend sous la cible"
+        )
+        parser.add_argument(
+            '--interval', type=float, default=10.0,
+            help="Intervalle de vérification en mode --watch (secondes)"
+        )
+
+    def handle(self, *args, **options):
+        target = options['target'] or settings.KEY_POOL_TARGET_SIZE
+        algorithms = options['algorithm'] or [DEFAULT_KEY_ALGORITHM]
+        
+        for algorithm in algorithms:
+            self.stdout.write(
+                f"🔑 Pool de clés {algorithm} : {available_count(algorithm)} disponible(s), cible {target}"
+            )
+        
+        stop_event = threading.Event()
+        try:
+            while True:
+                for algorithm in algorithms:
+                    generated = fill_pool(target, algorithm, stop_event=stop_event)
+                    if generated:
+                        self.stdout.write(self.style.SUCCESS(
+                            f"✅ {algorithm} : {generated} paire(s) générée(s), "
+                            f"{available_count(algorithm)} disponible(s)"
+                        ))
+                if not options['watch']:
+                    break
+                stop_event.wait(options['interval'])
+        except KeyboardInterrupt:
+            stop_event.set()
+            self.stdout.write(self.style.WARNING("Remplissage interrompu"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from votes.crypto_utils import gc_keyrings
+
+
+class Command(BaseCommand):
+    help = "Supprime les keyrings gpg éphémères laissés par des processus terminés"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Supprime tous les keyrings (à n'utiliser que service arrêté)"
+        )
+
+    def handle(self, *args, **options):
+        removed = gc_keyrings(everything=options['all'])
+        self.stdout.write(self.style.SUCCESS(f"🧹 {removed} keyring(s) supprimé(s)"))
@@ -0,0 +1,33 @@
+import asyncio
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from encryption.daemon import CryptoDaemon
+
+
+class Command(BaseCommand):
+    help = "Lance le daemon de déchiffrement partagé (socket Unix CRYPTO_DAEMON_SOCKET)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--socket', default=None, help="Chemin de la socket (défaut: CRYPTO_DAEMON_SOCKET)")
+        parser.add_argument('--workers', type=int, default=None, help="Processus de déchiffrement (défaut: nb de cœurs)")
+        parser.add_argument('--batch-size', type=int, default=64, help="Taille maximale d'un lot")
+        parser.add_argument('--batch-delay', type=float, default=5.0, help="Attente maximale d'un lot incomplet (ms)")
+
+    def handle(self, *args, **options):
+        socket_path = options['socket'] or settings.CRYPTO_DAEMON_SOCKET
+        if not socket_path:
+            raise CommandError("Aucune socket configurée (--socket ou CRYPTO_DAEMON_SOCKET)")
+
+        daemon = CryptoDaemon(
+            socket_path,
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            batch_delay=options['batch_delay'] / 1000,
+        )
+
+        try:
+            asyncio.run(daemon.serve_forever())
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("Daemon crypto arrêté"))
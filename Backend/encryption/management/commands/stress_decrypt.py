@@ -0,0 +1,80 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from votes.crypto_backends import get_backend
+from votes.crypto_backends.base import KEY_ALGORITHMS, DEFAULT_KEY_ALGORITHM
+
+
+class Command(BaseCommand):
+    help = (
+        "Test de charge : déchiffre des milliers de bulletins depuis plusieurs threads "
+        "du même processus et vérifie chaque résultat"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--messages', type=int, default=2000,
+            help="Nombre de bulletins chiffrés puis déchiffrés"
+        )
+        parser.add_argument(
+            '--threads', type=int, default=16,
+            help="Nombre de threads de déchiffrement concurrents"
+        )
+        parser.add_argument(
+            '--backend', default=None,
+            help="Chemin pointé d'un backend (défaut: CRYPTO_BACKEND)"
+        )
+        parser.add_argument(
+            '--algorithm', choices=KEY_ALGORITHMS, default=DEFAULT_KEY_ALGORITHM,
+            help="Algorithme de la clé de test"
+        )
+
+    def handle(self, *args, **options):
+        backend = import_string(options['backend'])() if options['backend'] else get_backend()
+        backend.warmup()
+        count = options['messages']
+
+        self.stdout.write(
+            f"🔐 Backend {backend.name} : {count} bulletin(s), {options['threads']} thread(s)"
+        )
+
+        keys = backend.generate_keypair('Stress', 'stress@evote.local', algorithm=options['algorithm'])
+
+        # Un texte clair distinct par bulletin : un mélange entre threads serait détecté
+        ballots = [
+            json.dumps({'candidate_id': i % 7, 'ballot': i, 'label': f"Bulletin n°{i} é"})
+            for i in range(count)
+        ]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+            messages = list(executor.map(lambda text: backend.encrypt_message(text, keys['public_key']), ballots))
+        self.stdout.write(f"  Chiffrement : {time.perf_counter() - start:.1f} s")
+
+        def check(index):
+            try:
+                plaintext = backend.decrypt_message(messages[index], keys['private_key'])
+            except Exception as e:
+                return index, f"erreur: {e}"
+            if plaintext != ballots[index]:
+                return index, "résultat incorrect"
+            return index, None
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+            failures = [(index, error) for index, error in executor.map(check, range(count)) if error]
+        elapsed = time.perf_counter() - start
+
+        backend.key_cache.evict_key(keys['private_key'])
+
+        self.stdout.write(f"  Déchiffrement : {elapsed:.1f} s ({count / elapsed:.1f} bulletins/s)")
+
+        if failures:
+            for index, error in failures[:10]:
+                self.stdout.write(self.style.ERROR(f"  ❌ Bulletin {index} : {error}"))
+            raise CommandError(f"{len(failures)} bulletin(s) sur {count} en échec")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ {count} bulletin(s) déchiffré(s) correctement"))
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('elections', '0003_alter_election_co_private_key_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PooledKeyPair',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=64, unique=True, verbose_name='Fingerprint')),
+                ('public_key', models.TextField(verbose_name='Clé publique (PGP)')),
+                ('private_key', models.TextField(blank=True, help_text='Effacée dès que la clé est attribuée à une élection', verbose_name='Clé privée (PGP)')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de génération')),
+                ('claimed_at', models.DateTimeField(blank=True, db_index=True, null=True, verbose_name="Date d'attribution")),
+                ('claimed_role', models.CharField(blank=True, choices=[('co', 'CO'), ('de', 'DE')], max_length=2, verbose_name='Rôle')),
+                ('claimed_for', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='elections.election', verbose_name='Élection')),
+            ],
+            options={
+                'verbose_name': 'Clé pré-générée',
+                'verbose_name_plural': 'Pool de clés',
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('encryption', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pooledkeypair',
+            name='algorithm',
+            field=models.CharField(choices=[('rsa2048', 'RSA 2048 bits'), ('rsa3072', 'RSA 3072 bits'), ('curve25519', 'Curve25519 (Ed25519 + X25519)')], db_index=True, default='rsa2048', max_length=20, verbose_name='Algorithme'),
+        ),
+    ]
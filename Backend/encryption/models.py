@@ -1,3 +1,59 @@
 from django.db import models
 
-# Create your models here.
+from votes.crypto_backends.base import KEY_ALGORITHM_CHOICES, DEFAULT_KEY_ALGORITHM
+
+
+class PooledKeyPair(models.Model):
+    """
+    Paire de clés OpenPGP pré-générée, en attente d'attribution à une élection
+
+    La génération RSA est lente (plusieurs centaines de ms par clé) : le pool
+    est rempli à l'avance (tâche de fond ou `manage.py fill_key_pool`) et les
+    élections y réclament leurs clés CO/DE de façon atomique, dans
+    l'algorithme choisi pour l'élection.
+    """
+    ROLE_CHOICES = (
+        ('co', 'CO'),
+        ('de', 'DE'),
+    )
+    
+    fingerprint = models.CharField(max_length=64, unique=True, verbose_name="Fingerprint")
+    algorithm = models.CharField(
+        max_length=20,
+        choices=KEY_ALGORITHM_CHOICES,
+        default=DEFAULT_KEY_ALGORITHM,
+        db_index=True,
+        verbose_name="Algorithme"
+    )
+    public_key = models.TextField(verbose_name="Clé publique (PGP)")
+    private_key = models.TextField(
+        blank=True,
+        verbose_name="Clé privée (PGP)",
+        help_text="Effacée dès que la clé est attribuée à une élection"
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de génération")
+    
+    # Attribution
+    claimed_at = models.DateTimeField(null=True, blank=True, db_index=True, verbose_name="Date d'attribution")
+    claimed_for = models.ForeignKey(
+        'elections.Election',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Élection"
+    )
+    claimed_role = models.CharField(max_length=2, choices=ROLE_CHOICES, blank=True, verbose_name="Rôle")
+    
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = 'Clé pré-générée'
+        verbose_name_plural = 'Pool de clés'
+    
+    def __str__(self):
+        state = f"→ {self.claimed_role.upper()} élection {self.claimed_for_id}" if self.claimed_at else "disponible"
+        return f"{self.fingerprint[:16]}... ({state})"
+    
+    @property
+    def is_available(self):
+        return self.claimed_at is None
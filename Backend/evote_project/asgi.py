@@ -29,6 +29,10 @@ from channels.security.websocket import AllowedHostsOriginValidator
 
 # Import après get_asgi_application() pour éviter AppRegistryNotReady
 from elections import routing as elections_routing
+from votes.crypto_utils import warmup
+
+# Préparer le chiffrement au démarrage du worker, pas à la première requête
+warmup()
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
@@ -1,5 +1,6 @@
 from pathlib import Path
 from decouple import config
+from corsheaders.defaults import default_headers
 from datetime import timedelta
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -30,6 +31,7 @@ INSTALLED_APPS = [
     'candidates',
     'votes',
     'results',
+    'encryption',
 ]
 
 
@@ -72,6 +74,14 @@ DATABASES = {
     }
 }
 
+# SQLite : verrou d'écriture pris dès le début des transactions, les workers
+# CO / DE concurrents attendent leur tour au lieu de 'database is locked'
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default']['OPTIONS'] = {'transaction_mode': 'IMMEDIATE'}
+    # Base de test sur fichier : la base en mémoire partagée refuse les
+    # écritures concurrentes ('table is locked') au lieu d'attendre le verrou
+    DATABASES['default']['TEST'] = {'NAME': BASE_DIR / 'test_db.sqlite3'}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -124,6 +134,7 @@ SIMPLE_JWT = {
 # CORS
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS').split(',')
 CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
 
 
 # ============= EMAIL CONFIGURATION =============
@@ -159,4 +170,120 @@ CHANNEL_LAYERS = {
             "hosts": [('127.0.0.1', 6379)],
         },
     },
-}
\ No newline at end of file
+}
+
+# ============= CACHE =============
+# LocMemCache : un cache par processus, à réserver aux déploiements à un seul
+# worker. Avec plusieurs workers, une fermeture d'élection n'y est vue qu'après
+# ELECTION_STATE_CACHE_TTL (la base refuse malgré tout les votes, voir
+# votes.submission.claimable). Utiliser un cache partagé, par exemple
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# CACHE_LOCATION=redis://127.0.0.1:6379/2
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='evote'),
+    }
+}
+
+# Durée de vie maximale de l'état d'une élection en mémoire (elections.election_state)
+ELECTION_STATE_CACHE_TTL = config('ELECTION_STATE_CACHE_TTL', default=300, cast=int)  # secondes
+
+# ============= CHIFFREMENT OPENPGP =============
+# Backend utilisé par votes.crypto_utils :
+#   - votes.crypto_backends.pgpy_backend.PGPyBackend   (en mémoire, sans sous-processus)
+#   - votes.crypto_backends.gnupg_backend.GnuPGBackend (binaire gpg / Gpg4win)
+CRYPTO_BACKEND = config(
+    'CRYPTO_BACKEND',
+    default='votes.crypto_backends.pgpy_backend.PGPyBackend'
+)
+
+# GnuPG : binaire (vide = recherche automatique) et racine des keyrings
+# éphémères, un par clé chargée (vide = /dev/shm/evote-keyrings si disponible)
+GPG_BINARY = config('GPG_BINARY', default='')
+GPG_KEYRING_DIR = config('GPG_KEYRING_DIR', default='')
+
+# Cache (par processus) des clés privées d'élection déjà chargées
+CRYPTO_KEY_CACHE_SIZE = config('CRYPTO_KEY_CACHE_SIZE', default=16, cast=int)
+CRYPTO_KEY_CACHE_TTL = config('CRYPTO_KEY_CACHE_TTL', default=3600, cast=int)  # secondes
+
+# Processus du pool de decrypt_many, créé une fois par worker (défaut : nombre de cœurs)
+CRYPTO_DECRYPT_WORKERS = config('CRYPTO_DECRYPT_WORKERS', default=0, cast=int) or None
+
+# Daemon de déchiffrement partagé (python manage.py run_crypto_daemon).
+# Vide : chaque worker déchiffre lui-même avec le backend ci-dessus.
+CRYPTO_DAEMON_SOCKET = config('CRYPTO_DAEMON_SOCKET', default='')
+CRYPTO_DAEMON_TIMEOUT = config('CRYPTO_DAEMON_TIMEOUT', default=30, cast=int)  # secondes
+
+# Approbation CO par lots (POST /api/votes/co/approve-batch/) : votes par appel,
+# et votes lus / déchiffrés / mis à jour ensemble (borne la mémoire)
+CO_APPROVE_BATCH_MAX_VOTES = config('CO_APPROVE_BATCH_MAX_VOTES', default=10000, cast=int)
+CO_APPROVE_CHUNK_SIZE = config('CO_APPROVE_CHUNK_SIZE', default=500, cast=int)
+
+# Jobs d'approbation CO (python manage.py run_approval_worker) : job repris par un
+# autre worker sans signe de vie depuis CO_APPROVAL_JOB_LEASE, attente entre deux
+# recherches de job quand la file est vide
+CO_APPROVAL_JOB_LEASE = config('CO_APPROVAL_JOB_LEASE', default=120, cast=int)  # secondes
+CO_APPROVAL_JOB_POLL_INTERVAL = config('CO_APPROVAL_JOB_POLL_INTERVAL', default=1.0, cast=float)  # secondes
+
+# Listes de votes du CO (GET /api/votes/co/election/<id>/) : votes par page,
+# par défaut et au plus (paramètre limit)
+CO_VOTES_PAGE_SIZE = config('CO_VOTES_PAGE_SIZE', default=100, cast=int)
+CO_VOTES_PAGE_MAX = config('CO_VOTES_PAGE_MAX', default=1000, cast=int)
+
+# Bail sur les votes en cours de traitement CO / DE (votes.leases, run_vote_worker) :
+# un vote réclamé par un worker qui ne le libère pas redevient disponible après ce délai
+VOTE_LEASE_SECONDS = config('VOTE_LEASE_SECONDS', default=300, cast=int)
+
+# PDF M1 / M2 rendus au premier téléchargement et gardés ici (votes.pdf_cache) ;
+# hors de MEDIA_ROOT : servis uniquement par les vues authentifiées
+VOTE_PDF_CACHE_DIR = config('VOTE_PDF_CACHE_DIR', default=str(BASE_DIR / 'pdf_cache'))
+
+# Taille maximale d'un message chiffré soumis (M1 / M2, armure ASCII comprise)
+BALLOT_MAX_CIPHERTEXT_SIZE = config('BALLOT_MAX_CIPHERTEXT_SIZE', default=16384, cast=int)
+
+# Rétention des réponses de soumission rejouables (en-tête Idempotency-Key)
+VOTE_IDEMPOTENCY_RETENTION = config('VOTE_IDEMPOTENCY_RETENTION', default=86400, cast=int)  # secondes
+
+# Contrôle d'admission (votes.admission) : (jetons / s, réserve) par élection
+# et par processus ; un débit nul désactive le contrôle pour cet endpoint
+VOTE_ADMISSION_RATES = {
+    'submit': (
+        config('VOTE_ADMISSION_SUBMIT_RATE', default=200, cast=float),
+        config('VOTE_ADMISSION_SUBMIT_BURST', default=400, cast=float),
+    ),
+    'public_keys': (
+        config('VOTE_ADMISSION_PUBLIC_KEYS_RATE', default=500, cast=float),
+        config('VOTE_ADMISSION_PUBLIC_KEYS_BURST', default=1000, cast=float),
+    ),
+    'ballot_bundle': (
+        config('VOTE_ADMISSION_BALLOT_BUNDLE_RATE', default=500, cast=float),
+        config('VOTE_ADMISSION_BALLOT_BUNDLE_BURST', default=1000, cast=float),
+    ),
+}
+# Requêtes pouvant attendre un jeton, et attente maximale avant un 429
+VOTE_ADMISSION_QUEUE_SIZE = config('VOTE_ADMISSION_QUEUE_SIZE', default=64, cast=int)
+VOTE_ADMISSION_MAX_WAIT = config('VOTE_ADMISSION_MAX_WAIT', default=0.5, cast=float)  # secondes
+
+# Vues électeurs (soumission, statut, reçu, clés publiques, bulletin) asynchrones :
+# servies dans la boucle d'événements de daphne sans occuper de thread
+VOTER_ASYNC_VIEWS = config('VOTER_ASYNC_VIEWS', default=True, cast=bool)
+
+# Ingestion différée des votes (votes.ingest) : journal local avec fsync groupés,
+# Vote / VoteReceipt insérés par lots. Un répertoire local par serveur.
+VOTE_INGEST_MODE = config('VOTE_INGEST_MODE', default=False, cast=bool)
+VOTE_INGEST_DIR = config('VOTE_INGEST_DIR', default=str(BASE_DIR / 'ingest_log'))
+VOTE_INGEST_BATCH_SIZE = config('VOTE_INGEST_BATCH_SIZE', default=500, cast=int)
+VOTE_INGEST_FLUSH_INTERVAL = config('VOTE_INGEST_FLUSH_INTERVAL', default=0.2, cast=float)  # secondes
+
+# Pool de clés d'élection pré-générées (python manage.py fill_key_pool)
+KEY_POOL_TARGET_SIZE = config('KEY_POOL_TARGET_SIZE', default=10, cast=int)
+KEY_POOL_LOW_WATERMARK = config('KEY_POOL_LOW_WATERMARK', default=4, cast=int)
+KEY_POOL_BACKGROUND_REFILL = config('KEY_POOL_BACKGROUND_REFILL', default=True, cast=bool)
+
+# ============= INDEX ÉLECTEURS =============
+# Bitsets éligibilité / a voté par élection ouverte (elections.voter_index) :
+#   'redis' : partagé (défaut si VOTER_INDEX_REDIS_URL est défini), '' : désactivé,
+#   'local' : mémoire du processus (seuls les « a déjà voté » évitent la base)
+VOTER_INDEX_REDIS_URL = config('VOTER_INDEX_REDIS_URL', default='')
+VOTER_INDEX_BACKEND = config('VOTER_INDEX_BACKEND', default='redis' if VOTER_INDEX_REDIS_URL else '')
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'evote_project.settings')
 
 application = get_wsgi_application()
+
+# Préparer le chiffrement au démarrage du worker, pas à la première requête
+from votes.crypto_utils import warmup  # noqa: E402
+
+warmup()
@@ -87,6 +87,11 @@ class CalculateResultsView(APIView):
             )
             rank += 1
         
+        # Dépouillement terminé : les clés n'ont plus à rester chargées
+        from votes.crypto_utils import forget_election_keys, gc_keyrings
+        forget_election_keys(election)
+        gc_keyrings()
+        
         return Response({
             'message': 'Résultats calculés avec succès.',
             'result': ElectionResultSerializer(election_result).data
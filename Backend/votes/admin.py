@@ -1,7 +1,7 @@
 
 
 from django.contrib import admin
-from .models import Vote, DecryptedBallot, VoteReceipt
+from .models import Vote, DecryptedBallot, VoteReceipt, COApprovalJob
 
 
 @admin.register(Vote)
@@ -24,14 +24,16 @@ class VoteAdmin(admin.ModelAdmin):
         'co_verified_at',
         'co_verified_by',
         'de_verified_at',
-        'de_verified_by'
+        'de_verified_by',
+        'm1_armored',
+        'm2_armored'
     ]
     fieldsets = (
         ('Information Générale', {
             'fields': ('election', 'voter', 'status', 'unique_id', 'linking_id')
         }),
         ('Messages Chiffrés', {
-            'fields': ('m1_identity', 'm2_ballot'),
+            'fields': ('m1_armored', 'm2_armored'),
             'classes': ('collapse',)
         }),
         ('Vérification CO', {
@@ -95,4 +97,29 @@ class VoteReceiptAdmin(admin.ModelAdmin):
         return False
     
     def has_delete_permission(self, request, obj=None):
-        return request.user.is_superuser
\ No newline at end of file
+        return request.user.is_superuser
+
+@admin.register(COApprovalJob)
+class COApprovalJobAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'election',
+        'status',
+        'total',
+        'approved_count',
+        'failed_count',
+        'skipped_count',
+        'created_by',
+        'created_at',
+        'finished_at'
+    ]
+    list_filter = ['status', 'created_at']
+    readonly_fields = [
+        'created_by', 'election', 'vote_ids', 'last_vote_id', 'cursor', 'total',
+        'approved_count', 'failed_count', 'skipped_count', 'errors', 'error',
+        'worker', 'heartbeat_at', 'created_at', 'started_at', 'finished_at'
+    ]
+    
+    def has_add_permission(self, request):
+        # Jobs créés par l'API CO uniquement
+        return False
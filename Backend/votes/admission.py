@@ -0,0 +1,235 @@
+"""
+Contrôle d'admission des endpoints de vote (seau à jetons par élection)
+
+À l'ouverture d'une élection, tous les électeurs chargent les clés
+publiques puis soumettent en même temps. Chaque couple (endpoint,
+élection) dispose d'un seau de VOTE_ADMISSION_RATES[scope] jetons par
+seconde, avec une réserve de `burst` jetons :
+
+    - jeton disponible      : requête admise immédiatement
+    - seau vide             : la requête attend son jeton, au plus
+                              VOTE_ADMISSION_MAX_WAIT secondes et dans la
+                              limite de VOTE_ADMISSION_QUEUE_SIZE requêtes
+                              en attente
+    - au-delà               : 429 avec Retry-After
+
+Les requêtes admises gardent ainsi une latence bornée au lieu de saturer
+les connexions à la base. Les seaux sont propres au processus : avec
+plusieurs workers, la capacité totale est le débit configuré multiplié
+par le nombre de workers.
+"""
+
+import asyncio
+import math
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+
+class TokenBucket:
+    """Seau à jetons avec file d'attente bornée"""
+
+    def __init__(self, rate, burst, queue_size, max_wait):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """
+        Réserve un jeton
+
+        Returns:
+            tuple: (admis, délai) ; admis avec délai > 0 : attendre puis appeler done_waiting(),
+            refusé : délai avant le prochain jeton
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.admitted += 1
+                return True, 0
+
+            # Jeton réservé d'avance : le solde négatif ordonne la file
+            delay = (1 - self._tokens) / self.rate
+            if self._waiting >= self.queue_size or delay > self.max_wait:
+                self.rejected += 1
+                return False, delay
+
+            self._tokens -= 1
+            self._waiting += 1
+            self.queued += 1
+            return True, delay
+
+    def done_waiting(self):
+        with self._lock:
+            self._waiting -= 1
+            self.admitted += 1
+
+    def acquire(self):
+        """
+        Réserve un jeton, en attendant si la file le permet
+
+        Returns:
+            float: 0 si la requête est admise, sinon délai (s) avant le prochain jeton
+        """
+        admitted, delay = self.reserve()
+        if not admitted:
+            return delay
+        if delay:
+            try:
+                time.sleep(delay)
+            finally:
+                self.done_waiting()
+        return 0
+
+    async def aacquire(self):
+        """acquire() sans bloquer la boucle d'événements"""
+        admitted, delay = self.reserve()
+        if not admitted:
+            return delay
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self.done_waiting()
+        return 0
+
+    def stats(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'tokens': round(self._tokens, 2),
+                'waiting': self._waiting,
+                'queue_size': self.queue_size,
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'rejected': self.rejected,
+            }
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(scope, election_id):
+    """Seau de (scope, élection), ou None si l'admission est désactivée pour ce scope"""
+    rate, burst = settings.VOTE_ADMISSION_RATES.get(scope, (0, 0))
+    if not rate:
+        return None
+
+    key = (scope, election_id)
+    bucket = _buckets.get(key)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(
+                    rate, burst or rate,
+                    queue_size=settings.VOTE_ADMISSION_QUEUE_SIZE,
+                    max_wait=settings.VOTE_ADMISSION_MAX_WAIT,
+                )
+                _buckets[key] = bucket
+    return bucket
+
+
+def forget_election(election_id):
+    """Supprime les seaux d'une élection (fermée ou supprimée)"""
+    with _buckets_lock:
+        for key in [key for key in _buckets if key[1] == election_id]:
+            del _buckets[key]
+
+
+def admission_stats():
+    """État de tous les seaux du processus, par scope puis par élection"""
+    with _buckets_lock:
+        buckets = list(_buckets.items())
+
+    stats = {}
+    for (scope, election_id), bucket in buckets:
+        stats.setdefault(scope, {})[str(election_id)] = bucket.stats()
+    return stats
+
+
+def retry_after(delay):
+    """Valeur de l'en-tête Retry-After : secondes entières, au moins 1"""
+    return max(1, math.ceil(delay))
+
+
+async def aadmit(scope, election_id):
+    """
+    Contrôle d'admission des vues asynchrones
+
+    Returns:
+        float: 0 si la requête est admise, sinon délai (s) avant le prochain jeton
+    """
+    from elections.election_state import aget_state
+
+    if election_id is None or await aget_state(election_id) is None:
+        return 0
+
+    bucket = get_bucket(scope, election_id)
+    if bucket is None:
+        return 0
+    return await bucket.aacquire()
+
+
+class ElectionAdmissionThrottle(BaseThrottle):
+    """
+    Throttle DRF : un seau par élection et par `admission_scope` de la vue
+
+    L'élection est lue dans l'URL (pk / election_id) ou, pour la
+    soumission, dans le corps de la requête.
+    """
+
+    def __init__(self):
+        self.retry_after = None
+
+    def allow_request(self, request, view):
+        from elections.election_state import get_state
+
+        scope = getattr(view, 'admission_scope', None)
+        election_id = self.get_election_id(request, view)
+        # Élection inconnue : la vue répond 404, aucun seau n'est créé
+        if scope is None or election_id is None or get_state(election_id) is None:
+            return True
+
+        bucket = get_bucket(scope, election_id)
+        if bucket is None:
+            return True
+
+        delay = bucket.acquire()
+        if delay:
+            self.retry_after = delay
+            return False
+        return True
+
+    def get_election_id(self, request, view):
+        election_id = view.kwargs.get('pk') or view.kwargs.get('election_id')
+        if election_id is None and request.method == 'POST':
+            election_id = request.data.get('election_id')
+        try:
+            return int(election_id)
+        except (TypeError, ValueError):
+            return None
+
+    def wait(self):
+        return retry_after(self.retry_after) if self.retry_after else None
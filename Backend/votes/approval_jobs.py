@@ -0,0 +1,189 @@
+"""
+Jobs d'approbation CO en arrière-plan, file d'attente en base (COApprovalJob)
+
+Pas de broker : la vue insère le job, un ou plusieurs workers
+(python manage.py run_approval_worker) le réclament par un UPDATE
+conditionnel, puis approuvent les votes morceau par morceau
+(co_approval.approve_chunk). Après chaque morceau, le curseur, les
+compteurs et le signe de vie sont enregistrés, à condition que le worker
+soit toujours propriétaire du job.
+
+Un job dont le worker s'est arrêté (signe de vie plus vieux que
+CO_APPROVAL_JOB_LEASE) est repris au curseur par un autre worker ; les
+votes déjà approuvés sont alors comptés comme déjà traités.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import co_approval
+from .models import COApprovalJob, Vote
+
+# Échecs détaillés conservés par job (les suivants ne sont que comptés)
+MAX_RECORDED_ERRORS = 100
+
+
+def create_job(user, vote_ids=None, election_id=None):
+    """
+    Met en file l'approbation d'une liste de votes ou des votes en attente d'une élection
+
+    Returns:
+        COApprovalJob
+    """
+    last_vote_id = None
+    if vote_ids is not None:
+        total = len(vote_ids)
+    else:
+        # Votes en attente à cet instant : ceux soumis ensuite relèvent d'un autre job
+        pending = Vote.objects.filter(election_id=election_id, status='pending_co')
+        total = pending.count()
+        last_vote_id = pending.order_by('-pk').values_list('pk', flat=True).first()
+
+    return COApprovalJob.objects.create(
+        created_by=user,
+        election_id=election_id,
+        vote_ids=vote_ids,
+        last_vote_id=last_vote_id,
+        total=total,
+    )
+
+
+def _claimable():
+    stale = timezone.now() - timedelta(seconds=settings.CO_APPROVAL_JOB_LEASE)
+    return Q(status='queued') | Q(status='running', heartbeat_at__lt=stale)
+
+
+def claim_job(worker):
+    """
+    Réclame le plus ancien job en file (ou abandonné par son worker)
+
+    Returns:
+        COApprovalJob | None
+    """
+    candidates = COApprovalJob.objects.filter(_claimable()).order_by('created_at').values_list('pk', flat=True)
+
+    for job_id in candidates[:10]:
+        now = timezone.now()
+        # UPDATE conditionnel : un seul worker l'emporte
+        claimed = COApprovalJob.objects.filter(_claimable(), pk=job_id).update(
+            status='running',
+            worker=worker,
+            heartbeat_at=now,
+            started_at=Coalesce('started_at', now),
+        )
+        if claimed:
+            return COApprovalJob.objects.select_related('created_by').get(pk=job_id)
+
+    return None
+
+
+def next_vote_ids(job, chunk_size):
+    """
+    Morceau suivant du job
+
+    Returns:
+        tuple: (identifiants des votes, nouveau curseur)
+    """
+    if job.vote_ids is not None:
+        vote_ids = job.vote_ids[job.cursor:job.cursor + chunk_size]
+        return vote_ids, job.cursor + len(vote_ids)
+
+    if job.last_vote_id is None:
+        return [], job.cursor
+
+    vote_ids = co_approval.pending_vote_ids(
+        job.election_id, chunk_size, after=job.cursor, until=job.last_vote_id
+    )
+    return vote_ids, vote_ids[-1] if vote_ids else job.cursor
+
+
+def run_job(job, worker):
+    """
+    Approuve les votes du job jusqu'au bout, ou jusqu'à la perte du job
+
+    Returns:
+        bool: True si le job a été mené à terme par ce worker
+    """
+    chunk_size = settings.CO_APPROVE_CHUNK_SIZE
+    elections = {}
+
+    try:
+        while True:
+            vote_ids, cursor = next_vote_ids(job, chunk_size)
+            if not vote_ids:
+                return _finish(job, worker, 'done')
+
+            results = co_approval.approve_chunk(job.created_by, vote_ids, elections, owner=worker)
+            summary = co_approval.summarize(results)
+
+            if len(job.errors) < MAX_RECORDED_ERRORS:
+                job.errors.extend(
+                    {'vote_id': result['vote_id'], 'error': result['error']}
+                    for result in results if result['outcome'] == co_approval.FAILED
+                )
+                del job.errors[MAX_RECORDED_ERRORS:]
+
+            owned = COApprovalJob.objects.filter(pk=job.pk, worker=worker, status='running').update(
+                cursor=cursor,
+                approved_count=F('approved_count') + summary[co_approval.APPROVED],
+                failed_count=F('failed_count') + summary[co_approval.FAILED],
+                skipped_count=(
+                    F('skipped_count')
+                    + summary[co_approval.ALREADY_PROCESSED]
+                    + summary[co_approval.LEASED]
+                    + summary[co_approval.NOT_FOUND]
+                ),
+                errors=job.errors,
+                heartbeat_at=timezone.now(),
+            )
+            if not owned:
+                print(f"  ⚠️ Job d'approbation {job.pk} repris par un autre worker")
+                return False
+            job.cursor = cursor
+
+    except Exception as e:
+        print(f"  ❌ Job d'approbation {job.pk} en échec: {e}")
+        _finish(job, worker, 'failed', error=str(e))
+        return False
+
+
+def release_job(job, worker):
+    """Remet en file un job interrompu (arrêt du worker), repris au curseur"""
+    COApprovalJob.objects.filter(pk=job.pk, worker=worker, status='running').update(
+        status='queued',
+        worker='',
+    )
+
+
+def _finish(job, worker, status, error=''):
+    finished = COApprovalJob.objects.filter(pk=job.pk, worker=worker, status='running').update(
+        status=status,
+        error=error,
+        finished_at=timezone.now(),
+    )
+    return bool(finished)
+
+
+def job_status(job):
+    """Progression d'un job (réponse de l'endpoint de statut)"""
+    return {
+        'id': job.id,
+        'status': job.status,
+        'election_id': job.election_id,
+        'total': job.total,
+        'approved': job.approved_count,
+        'failed': job.failed_count,
+        'skipped': job.skipped_count,
+        'done': job.processed,
+        'remaining': job.remaining,
+        'throughput': round(job.throughput, 1),
+        'errors': job.errors,
+        'error': job.error,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    }
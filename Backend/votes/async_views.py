@@ -0,0 +1,227 @@
+"""
+Vues électeurs asynchrones (ASGI) : soumission, statut de vote, reçu
+
+DRF n'exécute que des vues synchrones, chacune occupant un thread du
+worker. Ces vues Django natives reproduisent les réponses de leurs
+équivalents DRF (SubmitVoteView, MyVoteStatusView, VoteReceiptView) en
+restant dans la boucle d'événements : un worker daphne peut ainsi garder
+des milliers de connexions d'électeurs ouvertes. Activées par
+VOTER_ASYNC_VIEWS (voir votes/urls.py et elections/urls.py).
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.http import Http404, JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from elections import voter_index
+from elections.models import ElectionVoterAssignment
+
+from . import admission, parsers, submission
+from .models import VoteReceipt
+
+User = get_user_model()
+
+
+def json_response(data, status_code=status.HTTP_200_OK, headers=None):
+    """Réponse JSON encodée comme par DRF (dates, décimaux, UUID)"""
+    return JsonResponse(data, status=status_code, headers=headers, encoder=JSONEncoder, safe=False)
+
+
+def error_response(exc):
+    """Réponse d'une exception DRF, au format de son gestionnaire par défaut"""
+    detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    headers = None
+    if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+        headers = {'WWW-Authenticate': JWTAuthentication().authenticate_header(None)}
+    return json_response(detail, exc.status_code, headers)
+
+
+async def authenticate(request):
+    """
+    Authentification JWT (comme JWTAuthentication), utilisateur lu par l'ORM asynchrone
+
+    Raises:
+        NotAuthenticated / AuthenticationFailed
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header is not None else None
+    if raw_token is None:
+        raise exceptions.NotAuthenticated()
+
+    try:
+        token = authentication.get_validated_token(raw_token)
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+    except (InvalidToken, TokenError, KeyError):
+        raise exceptions.AuthenticationFailed("Le jeton est invalide ou expiré.")
+
+    user = await User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).afirst()
+    if user is None or not user.is_active:
+        raise exceptions.AuthenticationFailed("Utilisateur introuvable ou inactif.")
+    return user
+
+
+class AsyncAPIView(View):
+    """
+    Vue asynchrone authentifiée par JWT, au contrat des vues DRF du projet
+    (IsAuthenticated, erreurs {'detail': ...}, 429 + Retry-After)
+    """
+    admission_scope = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Authentification par jeton, sans cookie de session : pas de CSRF (comme APIView)
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            request.user = await authenticate(request)
+
+            election_id = kwargs.get('pk')
+            if self.admission_scope and election_id is not None:
+                await self.admit(election_id)
+
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return error_response(exc)
+        except submission.Refused as refusal:
+            return json_response(refusal.data, refusal.status_code, refusal.headers)
+        except Http404:
+            return error_response(exceptions.NotFound())
+
+    async def admit(self, election_id):
+        """Contrôle d'admission de l'élection (voir votes.admission)"""
+        delay = await admission.aadmit(self.admission_scope, election_id)
+        if delay:
+            raise submission.Refused(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                {'detail': str(exceptions.Throttled(wait=admission.retry_after(delay)).detail)},
+                {'Retry-After': str(admission.retry_after(delay))}
+            )
+
+    def parse_body(self, request):
+        """Corps JSON, multipart ou msgpack, comme les parsers de SubmitVoteView"""
+        if request.content_type == 'multipart/form-data':
+            data = request.POST.copy()
+            data.update(request.FILES)
+            return data
+
+        if request.content_type == parsers.MSGPACK_MEDIA_TYPE:
+            if not parsers.msgpack_available():
+                raise exceptions.UnsupportedMediaType(request.content_type)
+            return parsers.unpack(request.body)
+
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError as e:
+            raise exceptions.ParseError(f"JSON parse error - {e}")
+
+
+# ==================== VOTER ENDPOINTS ====================
+
+class AsyncSubmitVoteView(AsyncAPIView):
+    """
+    POST /api/votes/submit/ - Submit an encrypted vote (version asynchrone)
+    """
+    admission_scope = 'submit'
+
+    async def post(self, request):
+        if request.user.role != 'voter':
+            return json_response({
+                'error': 'Seuls les électeurs peuvent voter.'
+            }, status.HTTP_403_FORBIDDEN)
+
+        payload = self.parse_body(request)
+        try:
+            election_id = int(payload.get('election_id'))
+        except (TypeError, ValueError):
+            election_id = None
+        if election_id is not None:
+            await self.admit(election_id)
+
+        response_data = await submission.asubmit(
+            request.user,
+            payload,
+            idempotency_key=request.headers.get('Idempotency-Key') or None
+        )
+        return json_response(response_data, status.HTTP_201_CREATED)
+
+
+class AsyncMyVoteStatusView(AsyncAPIView):
+    """
+    GET /api/votes/my-vote/?election_id=<id> - Check if user has voted (version asynchrone)
+    """
+
+    async def get(self, request):
+        if request.user.role != 'voter':
+            return json_response({
+                'error': 'Seuls les électeurs peuvent vérifier leur statut de vote.'
+            }, status.HTTP_403_FORBIDDEN)
+
+        election_id = request.GET.get('election_id')
+        if not election_id or not election_id.isdigit():
+            return json_response({
+                'error': 'election_id est requis.'
+            }, status.HTTP_400_BAD_REQUEST)
+
+        indexed = await voter_index.alookup(int(election_id), request.user.id)
+        if indexed is not None:
+            is_assigned, has_voted = indexed
+            return json_response({
+                'has_voted': has_voted and is_assigned,
+                'is_assigned': is_assigned
+            })
+
+        assignment = await ElectionVoterAssignment.objects.filter(
+            election_id=election_id,
+            voter_id=request.user.id
+        ).values('has_voted').afirst()
+
+        return json_response({
+            'has_voted': bool(assignment and assignment['has_voted']),
+            'is_assigned': assignment is not None
+        })
+
+
+class AsyncVoteReceiptView(AsyncAPIView):
+    """
+    GET /api/votes/receipt/?code=<receipt_code> - Verify vote receipt (version asynchrone)
+    """
+
+    async def get(self, request):
+        receipt_code = request.GET.get('code')
+
+        if not receipt_code:
+            return json_response({
+                'error': 'Code de reçu requis.'
+            }, status.HTTP_400_BAD_REQUEST)
+
+        receipt = await VoteReceipt.objects.filter(receipt_code=receipt_code).values(
+            'vote__voter_id', 'vote__election__title', 'vote__submitted_at', 'vote__status'
+        ).afirst()
+
+        if not receipt:
+            return json_response({
+                'valid': False,
+                'message': 'Reçu invalide.'
+            })
+
+        if receipt['vote__voter_id'] != request.user.id and request.user.role != 'admin':
+            return json_response({
+                'error': 'Vous ne pouvez pas vérifier ce reçu.'
+            }, status.HTTP_403_FORBIDDEN)
+
+        return json_response({
+            'valid': True,
+            'election': receipt['vote__election__title'],
+            'submitted_at': receipt['vote__submitted_at'],
+            'status': receipt['vote__status']
+        })
@@ -0,0 +1,182 @@
+"""
+Approbation des votes par le CO, par lots (POST /api/votes/co/approve-batch/)
+
+Les votes sont traités par morceaux de CO_APPROVE_CHUNK_SIZE :
+    - réclamation des votes encore en attente (bail, voir votes.leases)
+    - lecture des seuls id / élection / M1 des votes réclamés
+    - déchiffrement des M1 en parallèle (decrypt_election_messages : pool
+      de processus ou daemon crypto), une clé CO par élection
+    - mise à jour groupée (bulk_update) de linking_id, du statut et de la
+      vérification CO, qui libère le bail
+
+La mémoire reste bornée par la taille d'un morceau, quel que soit le
+nombre de votes demandés. Un vote en erreur reste en attente et n'arrête
+pas le lot. Le PDF M2 n'est pas généré ici : il est rendu au premier
+téléchargement (votes.pdf_cache).
+"""
+
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from elections.models import Election
+
+from . import leases
+from .crypto_utils import decrypt_election_messages
+from .leases import ALREADY_PROCESSED, LEASED, NOT_FOUND
+from .models import Vote
+
+APPROVED = 'approved'
+FAILED = 'error'
+
+OUTCOMES = (APPROVED, ALREADY_PROCESSED, LEASED, NOT_FOUND, FAILED)
+
+APPROVAL_FIELDS = [
+    'linking_id', 'status', 'co_verified_at', 'co_verified_by', 'lease_owner', 'lease_expires_at'
+]
+
+
+def pending_vote_ids(election_id, limit, after=0, until=None):
+    """
+    Identifiants des votes en attente CO d'une élection, par ordre croissant
+
+    Args:
+        after (int): Dernier identifiant déjà traité (pagination par clé)
+        until (int): Dernier identifiant à inclure (None : sans borne)
+    """
+    votes = Vote.objects.filter(election_id=election_id, status='pending_co', pk__gt=after)
+    if until is not None:
+        votes = votes.filter(pk__lte=until)
+    return list(votes.order_by('pk').values_list('pk', flat=True)[:limit])
+
+
+def approve_votes(user, vote_ids):
+    """
+    Approuve une liste de votes, morceau par morceau
+
+    Args:
+        user (User): CO qui approuve
+        vote_ids (list[int]): Votes à approuver (sans doublon)
+
+    Returns:
+        list[dict]: Un résultat par vote, dans l'ordre de vote_ids :
+            {'vote_id': int, 'outcome': str, ...}
+    """
+    chunk_size = settings.CO_APPROVE_CHUNK_SIZE
+    elections = {}
+    results = []
+
+    for start in range(0, len(vote_ids), chunk_size):
+        results.extend(approve_chunk(user, vote_ids[start:start + chunk_size], elections))
+
+    return results
+
+
+def approve_chunk(user, vote_ids, elections=None, owner=None, hold_failed=False):
+    """
+    Approuve un morceau de votes : réclamation (bail), une lecture, un
+    déchiffrement parallèle par élection, une mise à jour groupée
+
+    Args:
+        elections (dict): Élections (clé CO) déjà chargées, partagées entre morceaux
+        owner (str): Propriétaire des baux (worker) ; défaut : propre à cet appel
+        hold_failed (bool): Votes en erreur gardés jusqu'à l'expiration du bail
+            (worker : nouvel essai différé plutôt que repris aussitôt en boucle)
+    """
+    elections = {} if elections is None else elections
+    owner = owner or leases.new_owner()
+
+    # Votes traités ou réclamés ailleurs : ni lus ni déchiffrés
+    claimed = leases.claim_ids('co', vote_ids, owner)
+    outcomes = leases.unclaimed_outcomes('co', [vote_id for vote_id in vote_ids if vote_id not in claimed])
+
+    try:
+        rows = Vote.objects.filter(pk__in=list(claimed)).values_list('pk', 'election_id', 'm1_identity')
+        pending = {}
+        for vote_id, election_id, m1_identity in rows:
+            pending.setdefault(election_id, []).append((vote_id, m1_identity))
+
+        linking_ids = {}
+        for election_id, votes in pending.items():
+            election = elections.get(election_id)
+            if election is None:
+                election = elections[election_id] = Election.objects.only('id', 'co_private_key').get(pk=election_id)
+
+            decrypted = decrypt_election_messages(election, 'co', [m1_identity for _, m1_identity in votes])
+            for (vote_id, _), result in zip(votes, decrypted):
+                linking_id, error = read_linking_id(result)
+                if error:
+                    outcomes[vote_id] = {'outcome': FAILED, 'error': error}
+                else:
+                    linking_ids[vote_id] = linking_id
+
+        if linking_ids:
+            now = timezone.now()
+            with transaction.atomic():
+                # Bail expiré et repris par un autre worker : résultat abandonné
+                owned = set(
+                    Vote.objects.select_for_update()
+                    .filter(pk__in=list(linking_ids), status='pending_co', lease_owner=owner)
+                    .values_list('pk', flat=True)
+                )
+                Vote.objects.bulk_update([
+                    Vote(
+                        pk=vote_id,
+                        linking_id=linking_ids[vote_id],
+                        status='pending_de',
+                        co_verified_at=now,
+                        co_verified_by=user,
+                        lease_owner='',
+                        lease_expires_at=None,
+                    )
+                    for vote_id in owned
+                ], APPROVAL_FIELDS)
+
+            for vote_id, linking_id in linking_ids.items():
+                if vote_id in owned:
+                    outcomes[vote_id] = {'outcome': APPROVED, 'linking_id': linking_id}
+                else:
+                    outcomes[vote_id] = {'outcome': LEASED}
+    finally:
+        # Votes en erreur : de nouveau disponibles, tout de suite ou à l'expiration du bail
+        if hold_failed:
+            claimed -= {vote_id for vote_id, outcome in outcomes.items() if outcome['outcome'] == FAILED}
+        leases.release(owner, claimed)
+
+    return [
+        {'vote_id': vote_id, **outcomes.get(vote_id, {'outcome': NOT_FOUND})}
+        for vote_id in vote_ids
+    ]
+
+
+def read_linking_id(result):
+    """
+    linking_id d'un M1 déchiffré (résultat de decrypt_many)
+
+    Returns:
+        tuple: (linking_id, None) ou (None, message d'erreur)
+    """
+    if not result['ok']:
+        return None, f"Erreur lors du déchiffrement: {result['error']}"
+
+    try:
+        identity_data = json.loads(result['plaintext'])
+        linking_id = identity_data.get('linking_id')
+    except (ValueError, AttributeError):
+        return None, 'M1 illisible (JSON attendu)'
+
+    if not linking_id:
+        return None, 'linking_id manquant dans M1'
+    if not isinstance(linking_id, str) or len(linking_id) > Vote._meta.get_field('linking_id').max_length:
+        return None, 'linking_id invalide dans M1'
+    return linking_id, None
+
+
+def summarize(results):
+    """Nombre de votes par résultat"""
+    summary = dict.fromkeys(OUTCOMES, 0)
+    for result in results:
+        summary[result['outcome']] += 1
+    return summary
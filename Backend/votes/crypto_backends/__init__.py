@@ -0,0 +1,35 @@
+"""
+Backends OpenPGP interchangeables pour le système de vote électronique
+
+Le backend actif est choisi par le paramètre CRYPTO_BACKEND (chemin
+pointé vers la classe), par exemple :
+    votes.crypto_backends.pgpy_backend.PGPyBackend   (en mémoire)
+    votes.crypto_backends.gnupg_backend.GnuPGBackend (binaire gpg)
+"""
+
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+DEFAULT_CRYPTO_BACKEND = 'votes.crypto_backends.pgpy_backend.PGPyBackend'
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Retourne l'instance (unique par processus) du backend configuré"""
+    global _backend
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = getattr(settings, 'CRYPTO_BACKEND', DEFAULT_CRYPTO_BACKEND)
+                _backend = import_string(path)()
+    return _backend
+
+
+def loaded_backend():
+    """Retourne le backend s'il a déjà été instancié dans ce processus, sinon None"""
+    return _backend
@@ -0,0 +1,86 @@
+"""
+Interface commune des backends OpenPGP utilisés par votes.crypto_utils
+"""
+
+from django.conf import settings
+
+from .keycache import PrivateKeyCache
+
+# Algorithmes de clés d'élection supportés par tous les backends
+KEY_ALGORITHM_CHOICES = (
+    ('rsa2048', 'RSA 2048 bits'),
+    ('rsa3072', 'RSA 3072 bits'),
+    ('curve25519', 'Curve25519 (Ed25519 + X25519)'),
+)
+KEY_ALGORITHMS = tuple(value for value, _ in KEY_ALGORITHM_CHOICES)
+DEFAULT_KEY_ALGORITHM = 'rsa2048'
+
+
+class BaseCryptoBackend:
+    """
+    Contrat minimal d'un backend de chiffrement OpenPGP (RFC 4880)
+
+    Toutes les clés et tous les messages échangés sont au format
+    ASCII-armored, afin que les backends soient interchangeables et
+    compatibles avec openpgp.js côté navigateur.
+
+    Les clés privées chargées sont conservées dans un PrivateKeyCache :
+    un backend fournit `load_private_key` et `wipe_private_key`, puis
+    utilise `self.private_key(...)` dans `decrypt_message`.
+    """
+
+    name = 'base'
+
+    def __init__(self):
+        self.key_cache = PrivateKeyCache(
+            wipe=self.wipe_private_key,
+            maxsize=getattr(settings, 'CRYPTO_KEY_CACHE_SIZE', 16),
+            ttl=getattr(settings, 'CRYPTO_KEY_CACHE_TTL', 3600),
+        )
+
+    def warmup(self):
+        """Initialisation coûteuse à faire au démarrage du worker (facultatif)"""
+
+    def collect_garbage(self, everything=False):
+        """
+        Supprime les ressources laissées par des processus terminés
+        (ou par tous les processus si `everything`) ; retourne leur nombre
+        """
+        return 0
+
+    def private_key(self, private_key):
+        """Context manager fournissant la clé privée chargée (depuis le cache si possible)"""
+        return self.key_cache.borrow(private_key, self.load_private_key)
+
+    def load_private_key(self, private_key):
+        """
+        Charge une clé privée ASCII-armored
+
+        Returns:
+            tuple: (fingerprint, handle) où handle est l'objet propre au backend
+        """
+        raise NotImplementedError
+
+    def wipe_private_key(self, handle):
+        """Efface le matériel secret d'une clé évincée du cache"""
+        raise NotImplementedError
+
+    def generate_keypair(self, name, email, algorithm=DEFAULT_KEY_ALGORITHM):
+        """
+        Génère une paire de clés OpenPGP (clé primaire + sous-clé de chiffrement)
+
+        Args:
+            algorithm (str): Une valeur de KEY_ALGORITHMS
+
+        Returns:
+            dict: {'fingerprint': str, 'public_key': str, 'private_key': str}
+        """
+        raise NotImplementedError
+
+    def encrypt_message(self, message, public_key):
+        """Chiffre `message` pour `public_key` et retourne le bloc ASCII-armored"""
+        raise NotImplementedError
+
+    def decrypt_message(self, encrypted_message, private_key):
+        """Déchiffre `encrypted_message` (armure ASCII ou paquets binaires) avec `private_key` et retourne le texte brut"""
+        raise NotImplementedError
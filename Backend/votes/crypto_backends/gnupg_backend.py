@@ -0,0 +1,444 @@
+"""
+Backend OpenPGP basé sur GnuPG via python-gnupg (RFC 4880 - OpenPGP Message Format)
+
+Aucun keyring partagé : chaque clé privée chargée vit dans son propre
+répertoire gpg éphémère (sur tmpfs quand c'est possible), créé à la
+demande depuis la clé stockée en base et supprimé à l'éviction du cache.
+Les chiffrements et générations utilisent un répertoire jetable.
+
+    <GPG_KEYRING_DIR>/<pid>/key-xxxxxxxx/
+"""
+
+import atexit
+import gnupg
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+from django.conf import settings
+
+from .base import BaseCryptoBackend, DEFAULT_KEY_ALGORITHM
+
+# algorithme -> paramètres de gpg --gen-key (Key-Type, Key-Length, Subkey-Curve...)
+KEY_PARAMS = {
+    'rsa2048': {'key_type': 'RSA', 'key_length': 2048},
+    'rsa3072': {'key_type': 'RSA', 'key_length': 3072},
+    'curve25519': {
+        'key_type': 'EDDSA',
+        'key_curve': 'ed25519',
+        'subkey_type': 'ECDH',
+        'subkey_curve': 'cv25519',
+    },
+}
+
+# Emplacements connus du binaire gpg, testés avant le PATH
+GPG_CANDIDATES = {
+    'nt': [
+        # FORCER l'utilisation de Gpg4win (pas Git Bash GPG)
+        'C:\\Program Files (x86)\\GnuPG\\bin\\gpg.exe',
+        'C:\\Program Files\\GnuPG\\bin\\gpg.exe',
+        'C:\\Program Files (x86)\\Gpg4win\\bin\\gpg.exe',
+        'C:\\Program Files\\Gpg4win\\bin\\gpg.exe',
+    ],
+    'posix': [
+        '/usr/bin/gpg',
+        '/usr/local/bin/gpg',
+        '/opt/homebrew/bin/gpg',
+        '/usr/bin/gpg2',
+    ],
+}
+
+GPG_CONF = (
+    '# Configuration automatique pour evote\n'
+    'use-agent\n'
+    'pinentry-mode loopback\n'
+)
+
+GPG_AGENT_CONF = (
+    '# Configuration automatique pour evote\n'
+    'allow-loopback-pinentry\n'
+    'max-cache-ttl 0\n'
+)
+
+
+def find_gpg_binary():
+    """
+    Localise le binaire gpg : paramètre GPG_BINARY, chemins connus de la
+    plateforme, puis PATH
+
+    Raises:
+        RuntimeError: Si aucun binaire gpg n'est trouvé
+    """
+    configured = getattr(settings, 'GPG_BINARY', '')
+    if configured:
+        return configured
+
+    for path in GPG_CANDIDATES.get(os.name, []):
+        if os.path.exists(path):
+            return path
+
+    found = shutil.which('gpg') or shutil.which('gpg2')
+    if found:
+        return found
+
+    if os.name == 'nt':
+        raise RuntimeError(
+            "Gpg4win n'est pas installé. Téléchargez-le depuis: https://gpg4win.org/download.html"
+        )
+    raise RuntimeError("GnuPG n'est pas installé (paquet gnupg) ou GPG_BINARY n'est pas configuré")
+
+
+def find_gpgconf(gpg_binary):
+    """Localise gpgconf (utilisé pour arrêter le gpg-agent d'un keyring)"""
+    name = 'gpgconf.exe' if os.name == 'nt' else 'gpgconf'
+    sibling = os.path.join(os.path.dirname(gpg_binary), name)
+    if os.path.exists(sibling):
+        return sibling
+    return shutil.which('gpgconf')
+
+
+def keyring_root():
+    """Répertoire racine des keyrings éphémères (tmpfs si disponible)"""
+    configured = getattr(settings, 'GPG_KEYRING_DIR', '')
+    if configured:
+        return configured
+
+    base = tempfile.gettempdir()
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        base = '/dev/shm'
+    return os.path.join(base, 'evote-keyrings')
+
+
+def destroy_keyring(home, gpgconf=None):
+    """Arrête le gpg-agent d'un keyring puis supprime le répertoire"""
+    if gpgconf:
+        try:
+            subprocess.run(
+                [gpgconf, '--homedir', home, '--kill', 'gpg-agent'],
+                capture_output=True,
+                timeout=10
+            )
+        except (OSError, subprocess.SubprocessError):
+            pass
+    shutil.rmtree(home, ignore_errors=True)
+
+
+def process_alive(pid):
+    """Le processus `pid` existe-t-il encore ? (toujours vrai hors POSIX)"""
+    if os.name != 'posix':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect_stale_keyrings(root, gpgconf=None, everything=False):
+    """
+    Supprime les keyrings laissés par des processus terminés
+
+    Args:
+        everything (bool): Supprime aussi ceux des processus vivants (service arrêté)
+
+    Returns:
+        int: Nombre de keyrings supprimés
+    """
+    removed = 0
+    if not os.path.isdir(root):
+        return removed
+
+    for name in os.listdir(root):
+        process_dir = os.path.join(root, name)
+        if not name.isdigit() or not os.path.isdir(process_dir):
+            continue
+
+        pid = int(name)
+        if not everything and (pid == os.getpid() or process_alive(pid)):
+            continue
+
+        for key_dir in os.listdir(process_dir):
+            destroy_keyring(os.path.join(process_dir, key_dir), gpgconf)
+            removed += 1
+        shutil.rmtree(process_dir, ignore_errors=True)
+
+    return removed
+
+
+def write_config(path, content):
+    """Écrit un fichier de configuration gpg seulement s'il diffère"""
+    try:
+        with open(path, 'r') as f:
+            if f.read() == content:
+                return
+    except FileNotFoundError:
+        pass
+
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+class Keyring:
+    """Keyring gpg éphémère contenant une seule clé privée"""
+
+    __slots__ = ('fingerprint', 'home', 'pid')
+
+    def __init__(self, fingerprint, home):
+        self.fingerprint = fingerprint
+        self.home = home
+        self.pid = os.getpid()
+
+
+class GnuPGBackend(BaseCryptoBackend):
+    """
+    Backend historique : délègue toutes les opérations au binaire gpg
+    """
+
+    name = 'gnupg'
+
+    def __init__(self):
+        super().__init__()
+        self._ready_pid = None
+        self._ready_lock = threading.Lock()
+        self.gpg_binary = None
+        self.gpgconf = None
+        self.root = keyring_root()
+
+    # ---------- initialisation (paresseuse, une fois par processus) ----------
+
+    @property
+    def process_dir(self):
+        """Répertoire des keyrings de ce processus (prêt à l'emploi)"""
+        if self._ready_pid != os.getpid():
+            with self._ready_lock:
+                if self._ready_pid != os.getpid():
+                    self._init_gpg()
+        return os.path.join(self.root, str(self._ready_pid))
+
+    def _init_gpg(self):
+        if self.gpg_binary is None:
+            self.gpg_binary = find_gpg_binary()
+            self.gpgconf = find_gpgconf(self.gpg_binary)
+
+            print(f"📂 GPG Keyrings: {self.root}")
+            print(f"🔧 GPG Binary: {self.gpg_binary}")
+
+        pid = os.getpid()
+        os.makedirs(self.root, mode=0o700, exist_ok=True)
+        os.makedirs(os.path.join(self.root, str(pid)), mode=0o700, exist_ok=True)
+
+        if self._ready_pid is None:
+            # Premier processus de la lignée : supprimer les keyrings orphelins
+            removed = collect_stale_keyrings(self.root, self.gpgconf)
+            if removed:
+                print(f"🧹 {removed} keyring(s) orphelin(s) supprimé(s)")
+            atexit.register(self._shutdown)
+
+        self._ready_pid = pid
+
+    def _shutdown(self):
+        """Fin du processus : effacer les clés et son répertoire de keyrings"""
+        self.key_cache.clear()
+        if self._ready_pid == os.getpid():
+            shutil.rmtree(os.path.join(self.root, str(self._ready_pid)), ignore_errors=True)
+
+    def warmup(self):
+        """Localise gpg et prépare le répertoire des keyrings au démarrage du worker"""
+        self.process_dir
+
+    def collect_garbage(self, everything=False):
+        """Supprime les keyrings des processus terminés (de tous si `everything`)"""
+        self.process_dir
+        return collect_stale_keyrings(self.root, self.gpgconf, everything=everything)
+
+    def _new_keyring_home(self):
+        home = tempfile.mkdtemp(prefix='key-', dir=self.process_dir)
+        # Configuration gpg (pinentry loopback) et gpg-agent (pas de cache)
+        write_config(os.path.join(home, 'gpg.conf'), GPG_CONF)
+        write_config(os.path.join(home, 'gpg-agent.conf'), GPG_AGENT_CONF)
+        return home
+
+    def _gpg(self, home):
+        """Handle python-gnupg sur le keyring `home`"""
+        gpg = gnupg.GPG(
+            gnupghome=home,
+            gpgbinary=self.gpg_binary,
+            options=[
+                '--pinentry-mode', 'loopback',
+                '--batch',
+                '--yes',
+                '--passphrase', ''
+            ]
+        )
+        gpg.encoding = 'utf-8'
+        return gpg
+
+    @contextmanager
+    def _scratch_gpg(self):
+        """Keyring jetable, supprimé à la sortie du bloc"""
+        home = self._new_keyring_home()
+        try:
+            yield self._gpg(home)
+        finally:
+            destroy_keyring(home, self.gpgconf)
+
+    # ---------- clés privées (cache) ----------
+
+    def load_private_key(self, private_key):
+        """Importe la clé privée dans un keyring dédié ; le handle est ce Keyring"""
+        home = self._new_keyring_home()
+        import_result = self._gpg(home).import_keys(private_key)
+
+        if not import_result.fingerprints:
+            destroy_keyring(home, self.gpgconf)
+            raise ValueError("Impossible d'importer la clé privée OpenPGP")
+
+        fingerprint = import_result.fingerprints[0]
+        print(f"  🔑 Clé privée importée: {fingerprint[:16]}...")
+
+        return fingerprint, Keyring(fingerprint, home)
+
+    def wipe_private_key(self, keyring):
+        """Arrête le gpg-agent du keyring et supprime le répertoire (clé secrète comprise)"""
+        # Keyring hérité d'un processus parent (fork) : il ne nous appartient pas
+        if keyring.pid != os.getpid():
+            return
+        destroy_keyring(keyring.home, self.gpgconf)
+
+    def generate_keypair(self, name, email, algorithm=DEFAULT_KEY_ALGORITHM):
+        """
+        Génère une paire de clés OpenPGP (RSA 2048/3072 bits ou Curve25519)
+        Conforme à la RFC 4880 (OpenPGP Message Format)
+        """
+        if algorithm not in KEY_PARAMS:
+            raise ValueError(f"Algorithme de clé non supporté: {algorithm}")
+
+        print(f"  📝 Génération de clé OpenPGP {algorithm} pour {name} <{email}>")
+
+        with self._scratch_gpg() as gpg:
+            return self._generate_keypair(gpg, name, email, algorithm)
+
+    def _generate_keypair(self, gpg, name, email, algorithm):
+        input_data = gpg.gen_key_input(
+            name_real=name,
+            name_email=email,
+            passphrase='',  # Pas de passphrase
+            expire_date=0,  # Pas d'expiration
+            **KEY_PARAMS[algorithm]
+        )
+
+        # Générer la clé
+        key = gpg.gen_key(input_data)
+        fingerprint = str(key)
+
+        # Déboguer si échec
+        if not fingerprint:
+            print(f"  ❌ ÉCHEC - Fingerprint vide")
+            print(f"  ❌ Status: {key.status}")
+            print(f"  ❌ Stderr: {key.stderr}")
+
+            raise RuntimeError(
+                f"Échec de la génération de clé OpenPGP.\n"
+                f"Status: {key.status}\n"
+                f"Stderr: {key.stderr}"
+            )
+
+        # Exporter la clé publique (format ASCII-armored)
+        public_key = gpg.export_keys(fingerprint)
+
+        if not public_key:
+            raise RuntimeError(f"Échec de l'export de la clé publique")
+
+        # Exporter la clé privée (format ASCII-armored)
+        private_key = gpg.export_keys(
+            fingerprint,
+            secret=True,
+            passphrase=''
+        )
+
+        if not private_key:
+            raise RuntimeError(f"Échec de l'export de la clé privée")
+
+        print(f"  ✅ Clé OpenPGP générée (fingerprint: {fingerprint[:16]}...)")
+
+        return {
+            'fingerprint': fingerprint,
+            'public_key': public_key,
+            'private_key': private_key
+        }
+
+    def encrypt_message(self, message, public_key):
+        """Chiffre un message avec une clé publique OpenPGP"""
+        with self._scratch_gpg() as gpg:
+            return self._encrypt_message(gpg, message, public_key)
+
+    def _encrypt_message(self, gpg, message, public_key):
+        # Importer la clé publique OpenPGP
+        import_result = gpg.import_keys(public_key)
+
+        if not import_result.fingerprints:
+            raise ValueError("Impossible d'importer la clé publique OpenPGP")
+
+        fingerprint = import_result.fingerprints[0]
+
+        # Chiffrer avec OpenPGP
+        encrypted = gpg.encrypt(
+            message,
+            fingerprint,
+            always_trust=True,
+            armor=True  # Format ASCII-armored (standard OpenPGP)
+        )
+
+        if not encrypted.ok:
+            raise ValueError(f"Échec du chiffrement OpenPGP: {encrypted.status}")
+
+        return str(encrypted)
+
+    def decrypt_message(self, encrypted_message, private_key):
+        """
+        Déchiffre un message avec une clé privée OpenPGP
+        Utilise subprocess car python-gnupg a des problèmes sur Windows
+        """
+        # Clé privée importée dans le keyring (une seule fois grâce au cache)
+        with self.private_key(private_key) as keyring:
+            return self._decrypt_with_keyring(keyring, encrypted_message)
+
+    def _decrypt_with_keyring(self, keyring, encrypted_message):
+        """
+        Déchiffre via le binaire gpg, la clé privée étant déjà dans `keyring`
+
+        Le message passe par stdin et le texte clair revient par stdout :
+        aucun fichier temporaire, donc aucun conflit entre threads d'un
+        même processus (ASGI, WSGI multi-thread).
+        """
+        result = subprocess.run(
+            [self.gpg_binary,
+             '--homedir', keyring.home,
+             '--pinentry-mode', 'loopback',
+             '--batch',
+             '--yes',
+             '--no-tty',
+             '--quiet',
+             '--passphrase', '',
+             '--decrypt'],
+            input=encrypted_message.encode('utf-8') if isinstance(encrypted_message, str) else encrypted_message,
+            capture_output=True,
+            timeout=10
+        )
+
+        if result.returncode != 0:
+            print(f"  ❌ GPG stderr: {result.stderr.decode('utf-8', errors='replace')}")
+            raise ValueError(f"Échec du déchiffrement OpenPGP (code {result.returncode})")
+
+        decrypted_text = result.stdout.decode('utf-8').strip()
+
+        if not decrypted_text:
+            raise ValueError("Déchiffrement réussi mais message vide")
+
+        print(f"  ✅ Déchiffrement réussi ({len(decrypted_text)} chars)")
+
+        return decrypted_text
@@ -0,0 +1,209 @@
+"""
+Cache borné (par processus) des clés privées OpenPGP déjà chargées
+
+Les clés d'élection sont stockées ASCII-armored en base ; les analyser
+(ou les importer dans gpg) à chaque déchiffrement coûte plus cher que le
+déchiffrement lui-même. Le cache conserve l'objet clé chargé, indexé par
+fingerprint, et l'efface explicitement (zéroïsation) à l'éviction.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+def key_digest(private_key):
+    """Empreinte SHA-256 du texte ASCII-armored d'une clé (alias vers le fingerprint)"""
+    if isinstance(private_key, str):
+        private_key = private_key.encode('utf-8')
+    return hashlib.sha256(private_key).hexdigest()
+
+
+class _CachedKey:
+    __slots__ = ('fingerprint', 'handle', 'digests', 'expires_at', 'refs', 'evicted')
+
+    def __init__(self, fingerprint, handle, expires_at):
+        self.fingerprint = fingerprint
+        self.handle = handle
+        self.digests = set()
+        self.expires_at = expires_at
+        self.refs = 0
+        self.evicted = False
+
+
+class PrivateKeyCache:
+    """
+    Cache LRU + TTL de clés privées chargées, indexé par fingerprint
+
+    Args:
+        wipe (callable): Efface le matériel secret d'une clé évincée
+        maxsize (int): Nombre maximal de clés conservées
+        ttl (int): Durée de vie d'une entrée, en secondes
+
+    Une clé évincée alors qu'elle est en cours d'utilisation n'est effacée
+    qu'au moment où le dernier utilisateur la rend (voir `borrow`).
+    """
+
+    def __init__(self, wipe, maxsize=16, ttl=3600):
+        self._wipe = wipe
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._aliases = {}
+        self._loading = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @contextmanager
+    def borrow(self, private_key, loader):
+        """
+        Fournit la clé chargée correspondant à `private_key`
+
+        Args:
+            private_key (str): Clé privée ASCII-armored
+            loader (callable): private_key -> (fingerprint, handle), appelé en cas d'absence
+        """
+        self.purge_expired()
+
+        digest = key_digest(private_key)
+        entry = self._acquire(digest)
+
+        if entry is None:
+            # Une seule importation par clé même si plusieurs threads la demandent
+            with self._loading_lock(digest):
+                entry = self._acquire(digest, record=False)
+                if entry is None:
+                    fingerprint, handle = loader(private_key)
+                    entry = self._insert(digest, fingerprint, handle)
+                with self._lock:
+                    self._loading.pop(digest, None)
+
+        try:
+            yield entry.handle
+        finally:
+            self._release(entry)
+
+    def evict(self, fingerprint):
+        """Évince (et efface) la clé `fingerprint` si elle est en cache"""
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            to_wipe = self._evict_locked(entry) if entry else []
+        self._wipe_all(to_wipe)
+        return entry is not None
+
+    def evict_key(self, private_key):
+        """Évince la clé correspondant au texte ASCII-armored `private_key`"""
+        with self._lock:
+            fingerprint = self._aliases.get(key_digest(private_key))
+        if fingerprint is None:
+            return False
+        return self.evict(fingerprint)
+
+    def purge_expired(self):
+        """Évince toutes les entrées dont le TTL est dépassé"""
+        now = time.monotonic()
+        with self._lock:
+            to_wipe = []
+            for entry in [e for e in self._entries.values() if e.expires_at <= now]:
+                to_wipe += self._evict_locked(entry)
+        self._wipe_all(to_wipe)
+
+    def clear(self):
+        """Évince toutes les clés du cache"""
+        with self._lock:
+            to_wipe = []
+            for entry in list(self._entries.values()):
+                to_wipe += self._evict_locked(entry)
+        self._wipe_all(to_wipe)
+
+    def stats(self):
+        """Compteurs du cache (un `misses` qui augmente = une clé ré-importée)"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'fingerprints': list(self._entries),
+            }
+
+    # ---------- interne ----------
+
+    def _loading_lock(self, digest):
+        with self._lock:
+            return self._loading.setdefault(digest, threading.Lock())
+
+    def _acquire(self, digest, record=True):
+        now = time.monotonic()
+        with self._lock:
+            fingerprint = self._aliases.get(digest)
+            entry = self._entries.get(fingerprint) if fingerprint else None
+
+            if entry is not None and entry.expires_at <= now:
+                to_wipe = self._evict_locked(entry)
+                entry = None
+            else:
+                to_wipe = []
+
+            if entry is None:
+                self.misses += record
+            else:
+                self.hits += record
+                entry.refs += 1
+                self._entries.move_to_end(fingerprint)
+
+        self._wipe_all(to_wipe)
+        return entry
+
+    def _insert(self, digest, fingerprint, handle):
+        with self._lock:
+            to_wipe = []
+            entry = self._entries.get(fingerprint)
+
+            if entry is None:
+                entry = _CachedKey(fingerprint, handle, time.monotonic() + self.ttl)
+                self._entries[fingerprint] = entry
+                while len(self._entries) > self.maxsize:
+                    oldest = next(iter(self._entries.values()))
+                    to_wipe += self._evict_locked(oldest)
+            elif handle is not entry.handle and handle != entry.handle:
+                # Chargement concurrent de la même clé : garder la première copie
+                to_wipe.append(handle)
+
+            entry.digests.add(digest)
+            self._aliases[digest] = fingerprint
+            entry.refs += 1
+
+        self._wipe_all(to_wipe)
+        return entry
+
+    def _release(self, entry):
+        with self._lock:
+            entry.refs -= 1
+            to_wipe = [entry.handle] if entry.evicted and entry.refs == 0 else []
+        self._wipe_all(to_wipe)
+
+    def _evict_locked(self, entry):
+        if entry.evicted:
+            return []
+
+        self._entries.pop(entry.fingerprint, None)
+        for digest in entry.digests:
+            self._aliases.pop(digest, None)
+        entry.evicted = True
+        self.evictions += 1
+
+        return [entry.handle] if entry.refs == 0 else []
+
+    def _wipe_all(self, handles):
+        for handle in handles:
+            try:
+                self._wipe(handle)
+            except Exception as e:
+                print(f"  ⚠️ Impossible d'effacer une clé évincée du cache: {e}")
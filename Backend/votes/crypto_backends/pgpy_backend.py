@@ -0,0 +1,170 @@
+"""
+Backend OpenPGP en mémoire basé sur PGPy (RFC 4880 - OpenPGP Message Format)
+
+Aucun sous-processus ni fichier temporaire : les clés sont analysées une
+seule fois et les opérations RSA sont exécutées par `cryptography`
+directement dans le processus Django.
+"""
+
+import functools
+import warnings
+
+import pgpy
+from pgpy.constants import (
+    CompressionAlgorithm,
+    EllipticCurveOID,
+    HashAlgorithm,
+    KeyFlags,
+    PubKeyAlgorithm,
+    SymmetricKeyAlgorithm,
+)
+from pgpy.errors import PGPError
+
+from .base import BaseCryptoBackend, DEFAULT_KEY_ALGORITHM
+
+# algorithme -> ((clé primaire de signature), (sous-clé de chiffrement))
+KEY_SPECS = {
+    'rsa2048': (
+        (PubKeyAlgorithm.RSAEncryptOrSign, 2048),
+        (PubKeyAlgorithm.RSAEncryptOrSign, 2048),
+    ),
+    'rsa3072': (
+        (PubKeyAlgorithm.RSAEncryptOrSign, 3072),
+        (PubKeyAlgorithm.RSAEncryptOrSign, 3072),
+    ),
+    'curve25519': (
+        (PubKeyAlgorithm.EdDSA, EllipticCurveOID.Ed25519),
+        (PubKeyAlgorithm.ECDH, EllipticCurveOID.Curve25519),
+    ),
+}
+
+# PGPy utilise encore des API dépréciées de `cryptography` (CAST5, backends...)
+warnings.filterwarnings('ignore', module='pgpy')
+
+
+def _memoize_private_material(key):
+    """
+    Précalcule l'objet clé privée `cryptography` de la clé et de ses sous-clés
+
+    PGPy reconstruit (et revalide) l'objet RSAPrivateKey à chaque
+    déchiffrement, ce qui coûte ~50 fois plus cher que l'opération RSA
+    elle-même. On le construit une fois ; la clé vit ensuite dans le
+    PrivateKeyCache du backend.
+    """
+    for k in [key] + list(key.subkeys.values()):
+        material = k._key.keymaterial
+        private = material.__privkey__()
+        material.__privkey__ = lambda private=private: private
+    return key
+
+
+@functools.lru_cache(maxsize=32)
+def _load_public_key(public_key):
+    """Analyse une clé publique ASCII-armored (mise en cache par processus)"""
+    try:
+        key, _ = pgpy.PGPKey.from_blob(public_key)
+    except (PGPError, ValueError) as e:
+        raise ValueError(f"Impossible d'importer la clé publique OpenPGP: {e}")
+    return key
+
+
+class PGPyBackend(BaseCryptoBackend):
+    """
+    Backend en mémoire : pas de fork/exec de gpg ni d'E/S disque par bulletin
+    """
+
+    name = 'pgpy'
+
+    def load_private_key(self, private_key):
+        """Analyse une clé privée ASCII-armored et précalcule son matériel secret"""
+        try:
+            key, _ = pgpy.PGPKey.from_blob(private_key)
+        except (PGPError, ValueError) as e:
+            raise ValueError(f"Impossible d'importer la clé privée OpenPGP: {e}")
+
+        if key.is_public:
+            raise ValueError("Impossible d'importer la clé privée OpenPGP")
+
+        fingerprint = str(key.fingerprint).replace(' ', '')
+        return fingerprint, _memoize_private_material(key)
+
+    def wipe_private_key(self, key):
+        """
+        Remet à zéro les composantes privées (d, p, q, u...) de la clé et de ses sous-clés
+
+        Les entiers Python étant immuables, il s'agit d'un effacement au mieux :
+        on retire toutes les références au matériel secret pour qu'il soit libéré.
+        """
+        for k in [key] + list(key.subkeys.values()):
+            material = k._key.keymaterial
+            material.__dict__.pop('__privkey__', None)
+            material.clear()
+
+    def generate_keypair(self, name, email, algorithm=DEFAULT_KEY_ALGORITHM):
+        """
+        Génère une paire de clés OpenPGP (RSA 2048/3072 bits ou Curve25519)
+        Clé primaire de signature + sous-clé de chiffrement, comme gpg
+        """
+        if algorithm not in KEY_SPECS:
+            raise ValueError(f"Algorithme de clé non supporté: {algorithm}")
+
+        primary_spec, subkey_spec = KEY_SPECS[algorithm]
+        print(f"  📝 Génération de clé OpenPGP {algorithm} pour {name} <{email}>")
+
+        key = pgpy.PGPKey.new(*primary_spec)
+        uid = pgpy.PGPUID.new(name, email=email)
+        key.add_uid(
+            uid,
+            usage={KeyFlags.Sign, KeyFlags.Certify},
+            hashes=[HashAlgorithm.SHA256, HashAlgorithm.SHA512],
+            ciphers=[SymmetricKeyAlgorithm.AES256, SymmetricKeyAlgorithm.AES128],
+            compression=[CompressionAlgorithm.ZLIB, CompressionAlgorithm.Uncompressed],
+        )
+
+        subkey = pgpy.PGPKey.new(*subkey_spec)
+        key.add_subkey(
+            subkey,
+            usage={KeyFlags.EncryptCommunications, KeyFlags.EncryptStorage},
+        )
+
+        fingerprint = str(key.fingerprint).replace(' ', '')
+
+        print(f"  ✅ Clé OpenPGP générée (fingerprint: {fingerprint[:16]}...)")
+
+        return {
+            'fingerprint': fingerprint,
+            'public_key': str(key.pubkey),
+            'private_key': str(key),
+        }
+
+    def encrypt_message(self, message, public_key):
+        """Chiffre un message avec une clé publique OpenPGP"""
+        key = _load_public_key(public_key)
+
+        try:
+            encrypted = key.encrypt(
+                pgpy.PGPMessage.new(message, compression=CompressionAlgorithm.Uncompressed)
+            )
+        except PGPError as e:
+            raise ValueError(f"Échec du chiffrement OpenPGP: {e}")
+
+        return str(encrypted)
+
+    def decrypt_message(self, encrypted_message, private_key):
+        """Déchiffre un message avec une clé privée OpenPGP"""
+        try:
+            message = pgpy.PGPMessage.from_blob(encrypted_message)
+            with self.private_key(private_key) as key:
+                decrypted = key.decrypt(message).message
+        except (PGPError, ValueError, NotImplementedError) as e:
+            raise ValueError(f"Échec du déchiffrement OpenPGP: {e}")
+
+        if isinstance(decrypted, (bytes, bytearray)):
+            decrypted = bytes(decrypted).decode('utf-8')
+
+        decrypted_text = decrypted.strip()
+
+        if not decrypted_text:
+            raise ValueError("Déchiffrement réussi mais message vide")
+
+        return decrypted_text
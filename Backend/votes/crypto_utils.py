@@ -1,82 +1,54 @@
-
 """
 Module de chiffrement OpenPGP pour le système de vote électronique
-Utilise GnuPG via python-gnupg (RFC 4880 - OpenPGP Message Format)
+(RFC 4880 - OpenPGP Message Format)
+
+Les opérations sont déléguées au backend configuré par CRYPTO_BACKEND
+(voir votes.crypto_backends) : PGPy en mémoire ou GnuPG via python-gnupg.
 """
 
-import gnupg
+import atexit
+import multiprocessing
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 from django.conf import settings
 
-# Créer le répertoire GPG s'il n'existe pas
-GPG_HOME = os.path.join(settings.BASE_DIR, '.gnupg')
-os.makedirs(GPG_HOME, exist_ok=True)
-
-# FORCER l'utilisation de Gpg4win (pas Git Bash GPG)
-GPG_BINARY = None
-if os.name == 'nt':  # Windows uniquement
-    possible_paths = [
-        'C:\\Program Files (x86)\\GnuPG\\bin\\gpg.exe',
-        'C:\\Program Files\\GnuPG\\bin\\gpg.exe',
-        'C:\\Program Files (x86)\\Gpg4win\\bin\\gpg.exe',
-        'C:\\Program Files\\Gpg4win\\bin\\gpg.exe',
-    ]
-    for path in possible_paths:
-        if os.path.exists(path):
-            GPG_BINARY = path
-            break
-
-if not GPG_BINARY:
-    raise RuntimeError(
-        "Gpg4win n'est pas installé. Téléchargez-le depuis: https://gpg4win.org/download.html"
-    )
-
-print(f"📂 GPG Home: {GPG_HOME}")
-print(f"🔧 GPG Binary: {GPG_BINARY}")
-
-# Créer un fichier de configuration GPG pour désactiver l'agent
-gpg_conf_path = os.path.join(GPG_HOME, 'gpg.conf')
-gpg_agent_conf_path = os.path.join(GPG_HOME, 'gpg-agent.conf')
-
-# Configuration GPG (désactiver l'agent)
-with open(gpg_conf_path, 'w') as f:
-    f.write('# Configuration automatique pour evote\n')
-    f.write('use-agent\n')
-    f.write('pinentry-mode loopback\n')
-
-# Configuration gpg-agent (permettre loopback pinentry)
-with open(gpg_agent_conf_path, 'w') as f:
-    f.write('# Configuration automatique pour evote\n')
-    f.write('allow-loopback-pinentry\n')
-    f.write('max-cache-ttl 0\n')
-
-print(f"✅ Configuration GPG créée")
-
-# Initialiser GPG avec options spéciales
-gpg = gnupg.GPG(
-    gnupghome=GPG_HOME,
-    gpgbinary=GPG_BINARY,
-    options=[
-        '--pinentry-mode', 'loopback',
-        '--batch',
-        '--yes',
-        '--passphrase', ''
-    ]
-)
-gpg.encoding = 'utf-8'
-
-print(f"✅ GPG Version: {gpg.version}")
-
-
-def generate_keypair(name, email):
-    """
-    Génère une paire de clés OpenPGP (RSA 2048 bits)
+from .crypto_backends import get_backend, loaded_backend
+from .crypto_backends.base import KEY_ALGORITHMS, DEFAULT_KEY_ALGORITHM
+
+# En dessous de ce nombre de messages, decrypt_many reste dans le processus courant
+DECRYPT_MANY_MIN_PARALLEL = 8
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def warmup():
+    """
+    Initialise le backend de chiffrement (binaire gpg, etc.) au démarrage
+    du worker, pour que la première requête n'en paie pas le coût.
+    L'import de ce module reste sans effet de bord.
+    """
+    try:
+        get_backend().warmup()
+    except Exception as e:
+        # Le backend sera réinitialisé (et l'erreur remontée) au premier usage
+        print(f"⚠️ Initialisation du backend crypto impossible: {e}")
+
+
+def generate_keypair(name, email, algorithm=DEFAULT_KEY_ALGORITHM):
+    """
+    Génère une paire de clés OpenPGP (RSA 2048 bits par défaut)
     Conforme à la RFC 4880 (OpenPGP Message Format)
-    
+
     Args:
         name (str): Nom du propriétaire de la clé (ex: "CO Election 10")
         email (str): Email associé à la clé
-    
+        algorithm (str): 'rsa2048', 'rsa3072' ou 'curve25519'
+
     Returns:
         dict: {
             'fingerprint': str,
@@ -84,169 +56,293 @@ def generate_keypair(name, email):
             'private_key': str (format ASCII-armored OpenPGP)
         }
     """
-    print(f"  📝 Génération de clé OpenPGP pour {name} <{email}>")
-    
-    # Générer la clé RSA 2048 bits
-    input_data = gpg.gen_key_input(
-        name_real=name,
-        name_email=email,
-        key_type='RSA',
-        key_length=2048,
-        passphrase='',  # Pas de passphrase
-        expire_date=0,  # Pas d'expiration
-    )
-    
-    # Générer la clé
-    key = gpg.gen_key(input_data)
-    fingerprint = str(key)
-    
-    # Déboguer si échec
-    if not fingerprint:
-        print(f"  ❌ ÉCHEC - Fingerprint vide")
-        print(f"  ❌ Status: {key.status}")
-        print(f"  ❌ Stderr: {key.stderr}")
-        
-        raise RuntimeError(
-            f"Échec de la génération de clé OpenPGP.\n"
-            f"Status: {key.status}\n"
-            f"Stderr: {key.stderr}"
-        )
-    
-    # Exporter la clé publique (format ASCII-armored)
-    public_key = gpg.export_keys(fingerprint)
-    
-    if not public_key:
-        raise RuntimeError(f"Échec de l'export de la clé publique")
-    
-    # Exporter la clé privée (format ASCII-armored)
-    private_key = gpg.export_keys(
-        fingerprint,
-        secret=True,
-        passphrase=''
-    )
-    
-    if not private_key:
-        raise RuntimeError(f"Échec de l'export de la clé privée")
-    
-    print(f"  ✅ Clé OpenPGP générée (fingerprint: {fingerprint[:16]}...)")
-    
-    return {
-        'fingerprint': fingerprint,
-        'public_key': public_key,
-        'private_key': private_key
-    }
+    if algorithm not in KEY_ALGORITHMS:
+        raise ValueError(f"Algorithme de clé non supporté: {algorithm}")
+
+    return get_backend().generate_keypair(name, email, algorithm=algorithm)
 
 
 def encrypt_message(message, public_key):
     """
     Chiffre un message avec une clé publique OpenPGP
-    
+
     Args:
         message (str): Message à chiffrer (format texte ou JSON stringifié)
         public_key (str): Clé publique OpenPGP au format ASCII-armored
-    
+
     Returns:
         str: Message chiffré au format ASCII-armored OpenPGP
-    
+
     Raises:
         ValueError: Si le chiffrement échoue
     """
     if not message or not public_key:
         raise ValueError("Message et clé publique requis")
-    
-    # Importer la clé publique OpenPGP
-    import_result = gpg.import_keys(public_key)
-    
-    if not import_result.fingerprints:
-        raise ValueError("Impossible d'importer la clé publique OpenPGP")
-    
-    fingerprint = import_result.fingerprints[0]
-    
-    # Chiffrer avec OpenPGP
-    encrypted = gpg.encrypt(
-        message,
-        fingerprint,
-        always_trust=True,
-        armor=True  # Format ASCII-armored (standard OpenPGP)
-    )
-    
-    if not encrypted.ok:
-        raise ValueError(f"Échec du chiffrement OpenPGP: {encrypted.status}")
-    
-    return str(encrypted)
+
+    return get_backend().encrypt_message(message, public_key)
+
 
 def decrypt_message(encrypted_message, private_key):
     """
     Déchiffre un message avec une clé privée OpenPGP
-    Utilise subprocess car python-gnupg a des problèmes sur Windows
-    
+
     Args:
-        encrypted_message (str): Message chiffré au format ASCII-armored OpenPGP
+        encrypted_message (str | bytes): Message chiffré OpenPGP, ASCII-armored ou binaire
         private_key (str): Clé privée OpenPGP au format ASCII-armored
-    
+
     Returns:
         str: Message déchiffré (texte brut)
-    
+
     Raises:
         ValueError: Si le déchiffrement échoue
     """
-    import subprocess
-    import tempfile
-    import os
-    
     if not encrypted_message or not private_key:
         raise ValueError("Message chiffré et clé privée requis")
-    
-    # Importer la clé privée OpenPGP dans le keyring
-    import_result = gpg.import_keys(private_key)
-    
-    if not import_result.fingerprints:
-        raise ValueError("Impossible d'importer la clé privée OpenPGP")
-    
-    fingerprint = import_result.fingerprints[0]
-    print(f"  🔑 Clé privée importée: {fingerprint[:16]}...")
-    
-    # Créer un fichier temporaire pour le message
-    temp_dir = tempfile.gettempdir()
-    temp_file = os.path.join(temp_dir, f'pgp_message_{os.getpid()}.asc')
-    
-    try:
-        # Écrire le message chiffré dans le fichier temporaire
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            f.write(encrypted_message)
-        
-        # Déchiffrer avec GPG via subprocess
-        result = subprocess.run(
-            [GPG_BINARY,
-             '--homedir', GPG_HOME,
-             '--pinentry-mode', 'loopback',
-             '--batch',
-             '--yes',
-             '--passphrase', '',
-             '--decrypt',
-             temp_file],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if result.returncode != 0:
-            print(f"  ❌ GPG stderr: {result.stderr}")
-            raise ValueError(f"Échec du déchiffrement OpenPGP (code {result.returncode})")
-        
-        decrypted_text = result.stdout.strip()
-        
-        if not decrypted_text:
-            raise ValueError("Déchiffrement réussi mais message vide")
-        
-        print(f"  ✅ Déchiffrement réussi ({len(decrypted_text)} chars)")
-        
-        return decrypted_text
-        
-    finally:
-        # Supprimer le fichier temporaire
+
+    if isinstance(encrypted_message, memoryview):
+        # BinaryField (PostgreSQL)
+        encrypted_message = bytes(encrypted_message)
+
+    return get_backend().decrypt_message(encrypted_message, private_key)
+
+
+def decrypt_many(messages, private_key, workers=None):
+    """
+    Déchiffre un lot de messages avec la même clé privée, en parallèle sur plusieurs cœurs
+
+    Les opérations RSA sont réparties sur le pool de processus du worker
+    (get_decrypt_pool, créé une fois) ; la clé accompagne chaque morceau
+    et chaque processus ne l'analyse qu'une fois (cache de clés). L'ordre
+    des résultats est celui des messages, et un message invalide
+    n'interrompt pas le lot.
+
+    Args:
+        messages (iterable[str | bytes]): Messages chiffrés OpenPGP, ASCII-armored ou binaires
+        private_key (str): Clé privée OpenPGP au format ASCII-armored
+        workers (int): Processus utilisés, dans la limite du pool
+            (défaut: CRYPTO_DECRYPT_WORKERS ou nb de cœurs)
+
+    Returns:
+        list[dict]: Un élément par message, dans l'ordre :
+            {'ok': True, 'plaintext': str, 'error': None}
+            {'ok': False, 'plaintext': None, 'error': str}
+    """
+    # memoryview (BinaryField PostgreSQL) : non transmissible au pool de processus
+    messages = [bytes(message) if isinstance(message, memoryview) else message for message in messages]
+    if not messages:
+        return []
+
+    if not private_key:
+        return [_failure("Message chiffré et clé privée requis") for _ in messages]
+
+    pool_size = decrypt_workers()
+    workers = min(workers or pool_size, pool_size, len(messages))
+
+    if workers <= 1 or len(messages) < DECRYPT_MANY_MIN_PARALLEL:
+        return decrypt_chunk(messages, private_key)
+
+    # Plusieurs morceaux par processus pour lisser les écarts de charge
+    chunksize = max(1, len(messages) // (workers * 4))
+    chunks = [messages[i:i + chunksize] for i in range(0, len(messages), chunksize)]
+
+    executor = get_decrypt_pool()
+    futures = [executor.submit(decrypt_chunk, chunk, private_key) for chunk in chunks]
+
+    results = []
+    for chunk, future in zip(chunks, futures):
         try:
-            if os.path.exists(temp_file):
-                os.unlink(temp_file)
+            results.extend(future.result())
         except Exception as e:
-            print(f"  ⚠️ Impossible de supprimer {temp_file}: {e}")
\ No newline at end of file
+            # Processus perdu : seul ce morceau est en échec, le pool sera recréé
+            if isinstance(e, BrokenProcessPool):
+                _discard_pool(executor)
+            results.extend(_failure(f"Échec du processus de déchiffrement: {e}") for _ in chunk)
+
+    return results
+
+
+def decrypt_workers():
+    return getattr(settings, 'CRYPTO_DECRYPT_WORKERS', None) or os.cpu_count() or 1
+
+
+def decrypt_pool_context():
+    """
+    Démarrage des processus de déchiffrement : 'forkserver' (ou 'spawn'),
+    jamais fork. Un fork du worker ASGI, multi-thread, peut hériter de
+    verrous tenus par d'autres threads (logging, cache de clés, base) et
+    se bloquer.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def get_decrypt_pool():
+    """Pool de processus de decrypt_many, créé une fois par processus"""
+    global _pool, _pool_pid
+
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ProcessPoolExecutor(
+                    max_workers=decrypt_workers(),
+                    mp_context=decrypt_pool_context(),
+                    initializer=init_decrypt_worker,
+                    initargs=(None,),
+                )
+                _pool_pid = os.getpid()
+    return _pool
+
+
+def _discard_pool(executor):
+    global _pool
+
+    with _pool_lock:
+        if _pool is executor:
+            _pool = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def _shutdown_pool():
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.shutdown(cancel_futures=True)
+
+
+def _failure(error):
+    return {'ok': False, 'plaintext': None, 'error': str(error)}
+
+
+# Clé privée du lot en cours, fixée une fois par processus du pool
+_worker_private_key = None
+
+
+def init_decrypt_worker(private_key=None):
+    """Initialisation d'un processus du pool : Django prêt et clé éventuelle mémorisée"""
+    global _worker_private_key
+
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+    warmup()
+    _worker_private_key = private_key
+
+
+def decrypt_chunk(messages, private_key=None):
+    """Déchiffre un morceau du lot et capture les erreurs message par message"""
+    private_key = private_key or _worker_private_key
+    results = []
+
+    for encrypted_message in messages:
+        try:
+            plaintext = decrypt_message(encrypted_message, private_key)
+            results.append({'ok': True, 'plaintext': plaintext, 'error': None})
+        except Exception as e:
+            results.append(_failure(e))
+
+    return results
+
+
+def _election_private_key(election, role):
+    if role not in ('co', 'de'):
+        raise ValueError("role doit être 'co' ou 'de'")
+    return getattr(election, f'{role}_private_key')
+
+
+def decrypt_election_message(election, role, encrypted_message):
+    """
+    Déchiffre un message avec la clé privée CO ou DE d'une élection
+
+    Passe par le daemon crypto partagé si CRYPTO_DAEMON_SOCKET est
+    configuré, sinon déchiffre dans le processus courant.
+
+    Args:
+        election (Election): Élection propriétaire des clés
+        role (str): 'co' (M1, identité) ou 'de' (M2, bulletin)
+        encrypted_message (str | bytes): Message chiffré OpenPGP, ASCII-armored ou binaire
+
+    Returns:
+        str: Message déchiffré (texte brut)
+
+    Raises:
+        ValueError: Si le déchiffrement échoue
+    """
+    from encryption.client import get_client
+
+    client = get_client()
+    if client is not None:
+        return client.decrypt(election.pk, role, encrypted_message)
+
+    return decrypt_message(encrypted_message, _election_private_key(election, role))
+
+
+def decrypt_election_messages(election, role, messages, workers=None):
+    """
+    Version par lots de decrypt_election_message (même format de retour que decrypt_many)
+    """
+    from encryption.client import get_client
+
+    client = get_client()
+    if client is not None:
+        return client.decrypt_many(election.pk, role, list(messages))
+
+    return decrypt_many(messages, _election_private_key(election, role), workers=workers)
+
+
+def forget_election_keys(election):
+    """Évince les clés CO et DE d'une élection du cache local et du daemon crypto"""
+    from encryption.client import get_client, CryptoDaemonError
+
+    forget_private_key(election.co_private_key)
+    forget_private_key(election.de_private_key)
+
+    client = get_client()
+    if client is not None:
+        try:
+            client.forget(election.pk)
+        except CryptoDaemonError as e:
+            print(f"  ⚠️ Daemon crypto injoignable, clés non oubliées: {e}")
+
+
+def forget_private_key(private_key):
+    """
+    Évince du cache (et efface) une clé privée chargée
+
+    Args:
+        private_key (str): Clé privée OpenPGP au format ASCII-armored
+
+    Returns:
+        bool: True si la clé était en cache
+    """
+    backend = loaded_backend()
+    if backend is None or not private_key:
+        return False
+
+    return backend.key_cache.evict_key(private_key)
+
+
+def gc_keyrings(everything=False):
+    """
+    Supprime les keyrings laissés par des processus terminés
+
+    Args:
+        everything (bool): Tous les keyrings, y compris ceux des processus vivants
+            (uniquement quand le service est arrêté)
+
+    Returns:
+        int: Nombre de keyrings supprimés
+    """
+    return get_backend().collect_garbage(everything=everything)
+
+
+def key_cache_stats():
+    """
+    Compteurs du cache de clés privées de ce processus
+
+    Returns:
+        dict: {'size', 'maxsize', 'ttl', 'hits', 'misses', 'evictions', 'fingerprints'}
+    """
+    return get_backend().key_cache.stats()
@@ -0,0 +1,175 @@
+"""
+Dépouillement des votes par le DE, par lots (run_vote_worker --stage de)
+
+Même déroulé que co_approval pour les votes 'pending_de' :
+    - réclamation des votes (bail, voir votes.leases)
+    - déchiffrement des M2 en parallèle, une clé DE par élection
+    - contrôle du linking_id (incohérence : 'rejected_de') et du candidat
+    - en une transaction : DecryptedBallot créés par bulk_create, votes
+      mis à jour par bulk_update (ce qui libère le bail)
+"""
+
+import json
+
+from django.db import transaction
+from django.utils import timezone
+
+from candidates.models import Candidate
+from elections.models import Election
+
+from . import leases
+from .crypto_utils import decrypt_election_messages
+from .leases import ALREADY_PROCESSED, LEASED, NOT_FOUND
+from .models import DecryptedBallot, Vote
+
+COUNTED = 'counted'
+REJECTED = 'rejected'
+FAILED = 'error'
+
+OUTCOMES = (COUNTED, REJECTED, ALREADY_PROCESSED, LEASED, NOT_FOUND, FAILED)
+
+COUNTING_FIELDS = ['status', 'de_verified_at', 'de_verified_by', 'lease_owner', 'lease_expires_at']
+
+
+def count_chunk(user, vote_ids, elections=None, owner=None, hold_failed=False):
+    """
+    Déchiffre et comptabilise un morceau de votes
+
+    Args:
+        user (User): DE qui dépouille
+        elections (dict): (élection, candidats) déjà chargés, partagés entre morceaux
+        owner (str): Propriétaire des baux (worker) ; défaut : propre à cet appel
+        hold_failed (bool): Votes en erreur gardés jusqu'à l'expiration du bail
+            (worker : nouvel essai différé plutôt que repris aussitôt en boucle)
+
+    Returns:
+        list[dict]: Un résultat par vote, dans l'ordre de vote_ids :
+            {'vote_id': int, 'outcome': str, ...}
+    """
+    elections = {} if elections is None else elections
+    owner = owner or leases.new_owner()
+
+    claimed = leases.claim_ids('de', vote_ids, owner)
+    outcomes = leases.unclaimed_outcomes('de', [vote_id for vote_id in vote_ids if vote_id not in claimed])
+
+    try:
+        rows = Vote.objects.filter(pk__in=list(claimed)).values_list(
+            'pk', 'election_id', 'unique_id', 'linking_id', 'm2_ballot'
+        )
+        pending = {}
+        for vote_id, election_id, unique_id, linking_id, m2_ballot in rows:
+            pending.setdefault(election_id, []).append((vote_id, unique_id, linking_id, m2_ballot))
+
+        decided = {}
+        for election_id, votes in pending.items():
+            if election_id not in elections:
+                elections[election_id] = (
+                    Election.objects.only('id', 'de_private_key').get(pk=election_id),
+                    set(Candidate.objects.filter(election_id=election_id).values_list('pk', flat=True)),
+                )
+            election, candidate_ids = elections[election_id]
+
+            decrypted = decrypt_election_messages(election, 'de', [vote[3] for vote in votes])
+            for (vote_id, unique_id, linking_id, _), result in zip(votes, decrypted):
+                outcome = read_ballot(result, linking_id, candidate_ids)
+                if outcome['outcome'] == FAILED:
+                    outcomes[vote_id] = outcome
+                else:
+                    decided[vote_id] = (election_id, unique_id, outcome)
+
+        if decided:
+            _write(user, owner, decided, outcomes)
+    finally:
+        # Votes en erreur : de nouveau disponibles, tout de suite ou à l'expiration du bail
+        if hold_failed:
+            claimed -= {vote_id for vote_id, outcome in outcomes.items() if outcome['outcome'] == FAILED}
+        leases.release(owner, claimed)
+
+    return [
+        {'vote_id': vote_id, **outcomes.get(vote_id, {'outcome': NOT_FOUND})}
+        for vote_id in vote_ids
+    ]
+
+
+def _write(user, owner, decided, outcomes):
+    now = timezone.now()
+    with transaction.atomic():
+        # Bail expiré et repris par un autre worker : résultat abandonné
+        owned = set(
+            Vote.objects.select_for_update()
+            .filter(pk__in=list(decided), status='pending_de', lease_owner=owner)
+            .values_list('pk', flat=True)
+        )
+
+        DecryptedBallot.objects.bulk_create([
+            DecryptedBallot(
+                election_id=election_id,
+                candidate_id=outcome['candidate_id'],
+                unique_id=unique_id,
+                decrypted_by=user,
+            )
+            for vote_id, (election_id, unique_id, outcome) in decided.items()
+            if vote_id in owned and outcome['outcome'] == COUNTED
+        ])
+        Vote.objects.bulk_update([
+            Vote(
+                pk=vote_id,
+                status='counted' if outcome['outcome'] == COUNTED else 'rejected_de',
+                de_verified_at=now,
+                de_verified_by=user,
+                lease_owner='',
+                lease_expires_at=None,
+            )
+            for vote_id, (_, _, outcome) in decided.items()
+            if vote_id in owned
+        ], COUNTING_FIELDS)
+
+    for vote_id, (_, _, outcome) in decided.items():
+        outcomes[vote_id] = outcome if vote_id in owned else {'outcome': LEASED}
+
+
+def read_ballot(result, linking_id, candidate_ids):
+    """
+    Bulletin d'un M2 déchiffré (résultat de decrypt_many), contrôlé comme
+    par DEDecryptBallotView
+
+    Returns:
+        dict: {'outcome': COUNTED, 'candidate_id': int}, {'outcome': REJECTED, 'error': str}
+            ou {'outcome': FAILED, 'error': str}
+    """
+    if not result['ok']:
+        return {'outcome': FAILED, 'error': f"Erreur lors du déchiffrement: {result['error']}"}
+
+    try:
+        ballot_data = json.loads(result['plaintext'])
+        linking_id_from_m2 = ballot_data.get('linking_id')
+        candidate_id = ballot_data.get('candidate_id')
+    except (ValueError, AttributeError):
+        return {'outcome': FAILED, 'error': 'M2 illisible (JSON attendu)'}
+
+    if not linking_id_from_m2:
+        return {'outcome': FAILED, 'error': 'linking_id manquant dans M2'}
+
+    if linking_id_from_m2 != linking_id:
+        return {'outcome': REJECTED, 'error': 'Incohérence détectée: linking_id ne correspond pas'}
+
+    if not candidate_id:
+        return {'outcome': FAILED, 'error': 'candidate_id manquant dans M2'}
+
+    try:
+        candidate_id = int(candidate_id)
+    except (TypeError, ValueError):
+        candidate_id = None
+
+    if candidate_id not in candidate_ids:
+        return {'outcome': FAILED, 'error': 'Candidat inconnu pour cette élection'}
+
+    return {'outcome': COUNTED, 'candidate_id': candidate_id}
+
+
+def summarize(results):
+    """Nombre de votes par résultat"""
+    summary = dict.fromkeys(OUTCOMES, 0)
+    for result in results:
+        summary[result['outcome']] += 1
+    return summary
@@ -0,0 +1,110 @@
+"""
+Rejeu des soumissions de vote (en-tête Idempotency-Key)
+
+Un client qui renvoie POST /api/votes/submit/ après une réponse perdue
+retrouve le vote_id / receipt_code d'origine, sans repasser par la
+validation OpenPGP ni par la réclamation du droit de vote.
+
+Les réponses sont gardées dans le cache Django (lecture rapide) et dans
+la table SubmitIdempotencyKey (survit à un redémarrage), pendant
+VOTE_IDEMPOTENCY_RETENTION secondes.
+"""
+
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+MAX_KEY_LENGTH = 255
+
+
+def _cache_key(voter_id, key):
+    # Clé client hachée : longueur et caractères quelconques
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f'evote:idempotency:{voter_id}:{digest}'
+
+
+def lookup(voter_id, key):
+    """
+    Réponse enregistrée pour (électeur, clé)
+
+    Returns:
+        dict | None: {'election_id': ..., 'response': {...}}
+    """
+    from .models import SubmitIdempotencyKey
+
+    stored = cache.get(_cache_key(voter_id, key))
+    if stored is not None:
+        return stored
+
+    row = SubmitIdempotencyKey.objects.filter(
+        voter_id=voter_id,
+        key=key,
+        created_at__gte=timezone.now() - timedelta(seconds=settings.VOTE_IDEMPOTENCY_RETENTION)
+    ).values('election_id', 'response').first()
+    if row is not None:
+        cache.set(_cache_key(voter_id, key), row, settings.VOTE_IDEMPOTENCY_RETENTION)
+    return row
+
+
+async def alookup(voter_id, key):
+    """lookup() pour les vues asynchrones"""
+    from .models import SubmitIdempotencyKey
+
+    stored = await cache.aget(_cache_key(voter_id, key))
+    if stored is not None:
+        return stored
+
+    row = await SubmitIdempotencyKey.objects.filter(
+        voter_id=voter_id,
+        key=key,
+        created_at__gte=timezone.now() - timedelta(seconds=settings.VOTE_IDEMPOTENCY_RETENTION)
+    ).values('election_id', 'response').afirst()
+    if row is not None:
+        await cache.aset(_cache_key(voter_id, key), row, settings.VOTE_IDEMPOTENCY_RETENTION)
+    return row
+
+
+def remember(voter_id, key, election_id, response):
+    """Enregistre la réponse d'une soumission réussie"""
+    from .models import SubmitIdempotencyKey
+
+    SubmitIdempotencyKey.objects.create(
+        voter_id=voter_id, key=key, election_id=election_id, response=response
+    )
+    # Après le commit : jamais de réponse rejouée pour un vote annulé
+    transaction.on_commit(lambda: cache.set(
+        _cache_key(voter_id, key),
+        {'election_id': election_id, 'response': response},
+        settings.VOTE_IDEMPOTENCY_RETENTION
+    ))
+
+
+def forget(voter_id, key):
+    """Vote abandonné après sa réponse (ingestion différée) : plus de rejeu"""
+    from .models import SubmitIdempotencyKey
+
+    SubmitIdempotencyKey.objects.filter(voter_id=voter_id, key=key).delete()
+    cache.delete(_cache_key(voter_id, key))
+
+
+def response_data(vote_id, receipt_code, unique_id):
+    """Corps de la réponse 201 de SubmitVoteView"""
+    return {
+        'message': 'Vote soumis avec succès.',
+        'vote_id': vote_id,
+        'receipt_code': receipt_code,
+        'unique_id': unique_id
+    }
+
+
+def purge():
+    """Supprime les clés plus anciennes que la rétention ; renvoie leur nombre"""
+    from .models import SubmitIdempotencyKey
+
+    limit = timezone.now() - timedelta(seconds=settings.VOTE_IDEMPOTENCY_RETENTION)
+    deleted, _ = SubmitIdempotencyKey.objects.filter(created_at__lt=limit).delete()
+    return deleted
@@ -0,0 +1,481 @@
+"""
+Ingestion différée des votes (VOTE_INGEST_MODE)
+
+En période de pointe, SubmitVoteView n'insère plus Vote et VoteReceipt
+elle-même :
+
+    1. le vote accepté est ajouté à un journal local (une ligne JSON) ;
+       les fsync sont groupés entre les requêtes simultanées
+    2. le droit de vote est réclamé par l'UPDATE conditionnel habituel
+       (pas de double vote possible, même entre workers) ; seule requête
+       SQL, avec la ligne SubmitIdempotencyKey si une Idempotency-Key est
+       fournie (rejeu possible depuis tous les workers avant le vidage)
+    3. le reçu est renvoyé immédiatement ; l'unique_id du vote est généré
+       par le serveur (aucun conflit possible au vidage)
+    4. un thread de vidage insère les votes par lots (bulk_create)
+
+Le journal est découpé en segments (un fichier par processus et par
+période de vidage) supprimés une fois tous leurs votes en base. Au
+démarrage, les segments laissés par un processus arrêté sont rejoués
+(voir aussi : python manage.py replay_ingest_log) ; chaque segment est
+d'abord renommé au pid du processus qui le rejoue, si bien que deux
+workers démarrés ensemble ne rejouent jamais le même segment.
+
+Un vote n'est visible par le CO qu'après le vidage suivant
+(VOTE_INGEST_FLUSH_INTERVAL).
+"""
+
+import atexit
+import base64
+import glob
+import json
+import os
+import secrets
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import Exists
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .pgp_packets import packets
+
+SEGMENT_PATTERN = 'ingest-{pid}-{token}-{sequence:06d}.log'
+
+
+class Segment:
+    """Fichier du journal et nombre de ses votes pas encore en base"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+        self.pending = 0
+        self.closed = False
+
+
+class IngestLog:
+    """Journal d'ingestion d'un processus et son thread de vidage"""
+
+    def __init__(self, directory, batch_size=500, flush_interval=0.2):
+        self.directory = str(directory)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pid = os.getpid()
+
+        # Ordre d'acquisition : _sync_lock puis _lock
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._segment = None
+        self._sequence = 0
+        self._written = 0
+        self._synced = 0
+
+        self._queue = []
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+
+        # Jeton propre à ce journal : jamais d'ajout à un segment d'un processus précédent
+        self._token = secrets.token_hex(4)
+        os.makedirs(self.directory, exist_ok=True)
+        self._orphans = orphan_segments(self.directory)
+
+        self._flusher = threading.Thread(target=self._run, name='vote-ingest-flusher', daemon=True)
+        self._flusher.start()
+
+    # ----- Écriture -----
+
+    def append(self, record):
+        """
+        Ajoute un vote au journal et attend qu'il soit sur disque
+
+        Returns:
+            Segment: à repasser à enqueue() ou abort()
+        """
+        with self._lock:
+            segment = self._current_segment()
+            segment.file.write(json.dumps(record, separators=(',', ':')) + '\n')
+            segment.pending += 1
+            self._written += 1
+            position = self._written
+
+        self._sync(position)
+        return segment
+
+    def abort(self, record, segment):
+        """Vote refusé après journalisation (droit de vote déjà réclamé)"""
+        with self._lock:
+            current = self._current_segment()
+            current.file.write(json.dumps({'op': 'abort', 'unique_id': record['unique_id']}) + '\n')
+            self._written += 1
+            position = self._written
+
+        self._sync(position)
+        self._release(segment)
+
+    def enqueue(self, record, segment):
+        """Vote accepté : à insérer au prochain vidage"""
+        with self._lock:
+            self._queue.append((record, segment))
+            if len(self._queue) >= self.batch_size:
+                self._wakeup.set()
+
+    def _current_segment(self):
+        if self._segment is None:
+            self._sequence += 1
+            name = SEGMENT_PATTERN.format(pid=self.pid, token=self._token, sequence=self._sequence)
+            self._segment = Segment(os.path.join(self.directory, name))
+        return self._segment
+
+    def _sync(self, position):
+        """fsync groupé : un seul appel couvre toutes les lignes écrites avant lui"""
+        if self._synced >= position:
+            return
+        with self._sync_lock:
+            if self._synced >= position:
+                return
+            with self._lock:
+                target = self._written
+                segment = self._segment
+                segment.file.flush()
+            # Hors de _lock : les autres requêtes continuent d'écrire pendant le fsync
+            os.fsync(segment.file.fileno())
+            self._synced = max(self._synced, target)
+
+    def _rotate(self):
+        """Ferme le segment courant : les votes suivants iront dans un nouveau fichier"""
+        with self._sync_lock, self._lock:
+            segment = self._segment
+            if segment is None:
+                return
+            segment.file.flush()
+            os.fsync(segment.file.fileno())
+            segment.file.close()
+            self._synced = self._written
+            self._segment = None
+            segment.closed = True
+        self._release(segment, count=0)
+
+    def _release(self, segment, count=1):
+        with self._lock:
+            segment.pending -= count
+            removable = segment.closed and segment.pending == 0
+        if removable:
+            try:
+                os.remove(segment.path)
+            except FileNotFoundError:
+                pass
+
+    # ----- Vidage -----
+
+    def _run(self):
+        try:
+            if self._orphans:
+                restored = replay(self._orphans)
+                print(f"♻️ Journal d'ingestion rejoué : {restored} vote(s) rétabli(s)")
+        except Exception as e:
+            print(f"  ⚠️ Rejeu du journal d'ingestion impossible: {e}")
+
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"  ⚠️ Erreur du vidage du journal d'ingestion: {e}")
+
+    def flush(self):
+        """Insère en base tous les votes en attente (attend un vidage déjà en cours)"""
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self):
+        with self._lock:
+            batch, self._queue = self._queue, []
+        if not batch:
+            return 0
+
+        self._rotate()
+
+        for start in range(0, len(batch), self.batch_size):
+            chunk = batch[start:start + self.batch_size]
+            try:
+                store_votes([record for record, _ in chunk], keep_submitted_at=True)
+            except DatabaseError as e:
+                # Base indisponible : les votes restent dans le journal et la file
+                print(f"  ⚠️ Vidage du journal d'ingestion reporté: {e}")
+                with self._lock:
+                    self._queue[:0] = batch[start:]
+                time.sleep(self.flush_interval)
+                return start
+
+            for _, segment in chunk:
+                self._release(segment)
+
+        return len(batch)
+
+    def close(self):
+        """Arrêt propre : dernier vidage, le segment courant est supprimé"""
+        self._stop.set()
+        self._wakeup.set()
+        self._flusher.join()
+        self.flush()
+        self._rotate()
+
+
+def _build_vote(record):
+    from .models import Vote
+
+    return Vote(
+        election_id=record['election_id'],
+        voter_id=record['voter_id'],
+        m1_identity=_record_packets(record['m1_identity']),
+        m2_ballot=_record_packets(record['m2_ballot']),
+        unique_id=record['unique_id'],
+        status='pending_co',
+    )
+
+
+def _record_packets(value):
+    """Paquets binaires d'un enregistrement : base64 (armure pour les segments anciens)"""
+    if value.startswith('-----BEGIN'):
+        return packets(value)
+    return base64.b64decode(value)
+
+
+def _build_idempotency_key(vote, record):
+    from .idempotency import response_data
+    from .models import SubmitIdempotencyKey
+
+    return SubmitIdempotencyKey(
+        voter_id=record['voter_id'],
+        key=record['idempotency_key'],
+        election_id=record['election_id'],
+        response=response_data(vote.id, record['receipt_code'], record['unique_id']),
+    )
+
+
+def store_votes(records, keep_submitted_at=False):
+    """
+    Insère des votes journalisés et leurs reçus (bulk_create)
+
+    Un lot en conflit (unique_id déjà utilisé : segment d'une version
+    antérieure, où l'unique_id venait du client) est repris vote par vote ;
+    le vote en conflit est abandonné et son électeur peut revoter.
+    """
+    from .models import Vote, VoteReceipt, SubmitIdempotencyKey
+
+    try:
+        with transaction.atomic():
+            votes = Vote.objects.bulk_create([_build_vote(record) for record in records])
+            VoteReceipt.objects.bulk_create([
+                VoteReceipt(vote=vote, receipt_code=record['receipt_code'])
+                for vote, record in zip(votes, records)
+            ])
+            SubmitIdempotencyKey.objects.bulk_create([
+                _build_idempotency_key(vote, record)
+                for vote, record in zip(votes, records) if record.get('idempotency_key')
+            ], ignore_conflicts=True)
+    except IntegrityError:
+        votes = []
+        for record in records:
+            try:
+                with transaction.atomic():
+                    vote = _build_vote(record)
+                    vote.save()
+                    VoteReceipt.objects.create(vote=vote, receipt_code=record['receipt_code'])
+                    if record.get('idempotency_key'):
+                        # Ligne déjà écrite à la réclamation (submission.claim_ingested)
+                        SubmitIdempotencyKey.objects.bulk_create(
+                            [_build_idempotency_key(vote, record)], ignore_conflicts=True
+                        )
+                votes.append(vote)
+            except IntegrityError:
+                owner = Vote.objects.filter(unique_id=record['unique_id']).values_list(
+                    'election_id', 'voter_id'
+                ).first()
+                if owner == (record['election_id'], record['voter_id']):
+                    # Ce vote est déjà en base (reçu ou clé en conflit) : droit de vote conservé
+                    print(f"  ⚠️ Vote {record['unique_id']} déjà en base, non réinséré")
+                    continue
+                _release_claim(record)
+
+    if keep_submitted_at and votes:
+        # auto_now_add écrase la date : on remet celle de la soumission
+        submitted = {record['unique_id']: parse_datetime(record['submitted_at']) for record in records}
+        for vote in votes:
+            vote.submitted_at = submitted[vote.unique_id]
+        Vote.objects.bulk_update(votes, ['submitted_at'])
+
+    return votes
+
+
+def _release_claim(record):
+    """Vote abandonné : l'électeur peut revoter, sauf s'il a déjà un vote en base"""
+    from elections import voter_index
+    from elections.models import ElectionVoterAssignment
+    from .idempotency import forget
+    from .models import Vote
+
+    # Même requête que la vérification : pas de fenêtre pour un vote inséré entre-temps
+    released = ElectionVoterAssignment.objects.filter(
+        ~Exists(Vote.objects.filter(election_id=record['election_id'], voter_id=record['voter_id'])),
+        election_id=record['election_id'],
+        voter_id=record['voter_id']
+    ).update(has_voted=False)
+    if not released:
+        print(f"  ❌ Vote {record['unique_id']} abandonné (unique_id en conflit), électeur déjà en base")
+        return
+
+    print(f"  ❌ Vote {record['unique_id']} abandonné (unique_id en conflit), l'électeur peut revoter")
+    if record.get('idempotency_key'):
+        forget(record['voter_id'], record['idempotency_key'])
+    voter_index.build_index(record['election_id'])
+
+
+def read_segment(path):
+    """Votes et annulations d'un segment (une dernière ligne tronquée est ignorée)"""
+    records, aborted = [], set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('op') == 'abort':
+                aborted.add(record['unique_id'])
+            else:
+                records.append(record)
+    return records, aborted
+
+
+def orphan_segments(directory, everything=False):
+    """
+    Segments dont le processus écrivain est terminé (tous si everything).
+    Ceux du pid courant viennent d'un processus précédent de même pid
+    (conteneurs) tant que ce processus n'a pas ouvert son journal.
+    """
+    from .crypto_backends.gnupg_backend import process_alive
+
+    orphans = []
+    for path in glob.glob(os.path.join(str(directory), 'ingest-*-*.log')):
+        try:
+            pid = int(os.path.basename(path).split('-')[1])
+        except ValueError:
+            continue
+        if everything or pid == os.getpid() or not process_alive(pid):
+            try:
+                # Segment pris entre-temps par un autre processus : ignoré
+                orphans.append((os.path.getmtime(path), path))
+            except FileNotFoundError:
+                continue
+    return [path for _, path in sorted(orphans)]
+
+
+def claim_segment(path):
+    """
+    Prend un segment orphelin pour le rejouer : renommage atomique au pid
+    du processus courant. Si ce processus s'arrête à son tour, le segment
+    redevient orphelin.
+
+    Returns:
+        str | None: Nouveau chemin, ou None si un autre processus l'a pris
+    """
+    name = os.path.basename(path).split('-claimed-')[-1]
+    claimed = os.path.join(os.path.dirname(path), f'ingest-{os.getpid()}-claimed-{name}')
+    try:
+        os.rename(path, claimed)
+    except FileNotFoundError:
+        return None
+    return claimed
+
+
+def replay(segments):
+    """
+    Rejoue des segments orphelins : insère les votes journalisés absents
+    de la base, puis supprime les segments
+
+    Returns:
+        int: Nombre de votes rétablis
+    """
+    from elections import voter_index
+    from elections.models import ElectionVoterAssignment
+    from .models import Vote
+
+    segments = [claimed for claimed in map(claim_segment, segments) if claimed]
+    if not segments:
+        return 0
+
+    records, aborted = {}, set()
+    for path in segments:
+        segment_records, segment_aborted = read_segment(path)
+        aborted |= segment_aborted
+        for record in segment_records:
+            records.setdefault(record['unique_id'], record)
+
+    for unique_id in aborted:
+        records.pop(unique_id, None)
+    existing = set(Vote.objects.filter(unique_id__in=list(records)).values_list('unique_id', flat=True))
+
+    restored = []
+    for unique_id, record in records.items():
+        if unique_id in existing:
+            continue
+        assignment = ElectionVoterAssignment.objects.filter(
+            election_id=record['election_id'],
+            voter_id=record['voter_id']
+        )
+        claimed = assignment.filter(has_voted=False).update(has_voted=True)
+        if not claimed:
+            # Déjà réclamé : par ce vote avant l'arrêt, sauf si un autre vote existe
+            if not assignment.exists() or Vote.objects.filter(
+                election_id=record['election_id'], voter_id=record['voter_id']
+            ).exists():
+                continue
+        restored.append(record)
+        voter_index.mark_voted(record['election_id'], record['voter_id'])
+
+    if restored:
+        store_votes(restored, keep_submitted_at=True)
+
+    for path in segments:
+        os.remove(path)
+
+    return len(restored)
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_log():
+    """Journal du processus courant (recréé après un fork)"""
+    global _log
+
+    if _log is None or _log.pid != os.getpid():
+        with _log_lock:
+            if _log is None or _log.pid != os.getpid():
+                _log = IngestLog(
+                    settings.VOTE_INGEST_DIR,
+                    batch_size=settings.VOTE_INGEST_BATCH_SIZE,
+                    flush_interval=settings.VOTE_INGEST_FLUSH_INTERVAL,
+                )
+                atexit.register(_log.close)
+    return _log
+
+
+def new_record(election_id, voter_id, data, receipt_code, idempotency_key=None):
+    return {
+        'op': 'vote',
+        'unique_id': data['unique_id'],
+        'election_id': election_id,
+        'voter_id': voter_id,
+        # Paquets binaires en base64 : le segment reste du JSON ligne à ligne
+        'm1_identity': base64.b64encode(data['m1_identity']).decode('ascii'),
+        'm2_ballot': base64.b64encode(data['m2_ballot']).decode('ascii'),
+        'receipt_code': receipt_code,
+        'submitted_at': timezone.now().isoformat(),
+        'idempotency_key': idempotency_key,
+    }
@@ -0,0 +1,126 @@
+"""
+Baux de traitement des votes (CO : 'pending_co', DE : 'pending_de')
+
+Avant de déchiffrer un vote, un worker ou un opérateur le réclame :
+lease_owner / lease_expires_at sont posés par un UPDATE conditionnel
+(vote libre, ou bail expiré). Un seul propriétaire à la fois ; le vote
+est libéré par l'écriture du résultat ou par release(). Le bail d'un
+worker arrêté expire après VOTE_LEASE_SECONDS et le vote redevient
+réclamable.
+
+claim_batch() choisit les votes avec SELECT ... FOR UPDATE SKIP LOCKED :
+plusieurs workers (sur plusieurs machines) réclament des lots disjoints
+sans s'attendre. Sur les bases sans SKIP LOCKED (SQLite), l'UPDATE
+conditionnel suffit à garantir l'exclusivité.
+"""
+
+import os
+import socket
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Vote
+
+STAGE_STATUS = {'co': 'pending_co', 'de': 'pending_de'}
+
+# Résultats d'un vote non réclamé
+ALREADY_PROCESSED = 'already_processed'
+LEASED = 'leased'
+NOT_FOUND = 'not_found'
+
+
+def new_owner():
+    """Identifiant unique d'un propriétaire de bail (hôte, processus, instance)"""
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+def _free(now):
+    return Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now)
+
+
+def claim_ids(stage, vote_ids, owner):
+    """
+    Réclame des votes précis, encore en attente de l'étape et libres (ou déjà à owner)
+
+    Args:
+        stage (str): 'co' ou 'de'
+
+    Returns:
+        set[int]: Votes réclamés
+    """
+    if not vote_ids:
+        return set()
+
+    now = timezone.now()
+    pending = Vote.objects.filter(pk__in=vote_ids, status=STAGE_STATUS[stage])
+    pending.filter(_free(now) | Q(lease_owner=owner)).update(
+        lease_owner=owner,
+        lease_expires_at=now + timedelta(seconds=settings.VOTE_LEASE_SECONDS),
+    )
+    return set(pending.filter(lease_owner=owner).values_list('pk', flat=True))
+
+
+def claim_batch(stage, owner, limit, election_id=None):
+    """
+    Réclame jusqu'à limit votes libres de l'étape, par ordre d'arrivée
+
+    Returns:
+        list[int]: Votes réclamés
+    """
+    with transaction.atomic():
+        candidates = Vote.objects.select_for_update(skip_locked=True).filter(
+            _free(timezone.now()),
+            status=STAGE_STATUS[stage],
+        )
+        if election_id is not None:
+            candidates = candidates.filter(election_id=election_id)
+
+        vote_ids = list(candidates.order_by('pk').values_list('pk', flat=True)[:limit])
+        return sorted(claim_ids(stage, vote_ids, owner))
+
+
+def release(owner, vote_ids):
+    """Libère les votes encore réclamés par owner (résultat non écrit)"""
+    if vote_ids:
+        Vote.objects.filter(pk__in=list(vote_ids), lease_owner=owner).update(
+            lease_owner='',
+            lease_expires_at=None,
+        )
+
+
+@contextmanager
+def hold(stage, vote_id):
+    """
+    Bail sur un seul vote le temps d'un traitement (vues CO / DE unitaires)
+
+    Yields:
+        bool: False si le vote est déjà réclamé ou n'est plus en attente
+    """
+    owner = new_owner()
+    claimed = claim_ids(stage, [vote_id], owner)
+    try:
+        yield bool(claimed)
+    finally:
+        release(owner, claimed)
+
+
+def unclaimed_outcomes(stage, vote_ids):
+    """
+    Résultat des votes qui n'ont pas pu être réclamés
+
+    Returns:
+        dict: vote_id -> {'outcome': ALREADY_PROCESSED | LEASED, ...} (absent : NOT_FOUND)
+    """
+    outcomes = {}
+    for vote_id, vote_status in Vote.objects.filter(pk__in=list(vote_ids)).values_list('pk', 'status'):
+        if vote_status != STAGE_STATUS[stage]:
+            outcomes[vote_id] = {'outcome': ALREADY_PROCESSED, 'status': vote_status}
+        else:
+            outcomes[vote_id] = {'outcome': LEASED}
+    return outcomes
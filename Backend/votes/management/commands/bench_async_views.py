@@ -0,0 +1,138 @@
+import asyncio
+import time
+import uuid
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from elections.async_views import AsyncElectionPublicKeysView
+from elections.views import ElectionPublicKeysView
+from votes.async_views import AsyncSubmitVoteView, AsyncMyVoteStatusView, AsyncVoteReceiptView
+from votes.crypto_utils import encrypt_message
+from votes.models import VoteReceipt
+from votes.views import SubmitVoteView, MyVoteStatusView, VoteReceiptView
+
+from .bench_submit import Command as BenchSubmitCommand
+
+User = get_user_model()
+
+
+class Command(BenchSubmitCommand):
+    help = (
+        "Compare les vues électeurs synchrones (DRF) et asynchrones sous N requêtes "
+        "simultanées, exécutées comme par le gestionnaire ASGI de Django"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--voters', type=int, default=1000, help="Électeurs (une soumission chacun)")
+        parser.add_argument('--concurrency', type=int, default=1000, help="Requêtes simultanées")
+
+    def handle(self, *args, **options):
+        label = uuid.uuid4().hex[:8]
+        election, voters = self._setup(label, options['voters'])
+        self.factory = RequestFactory()
+
+        try:
+            tokens = {voter.id: str(AccessToken.for_user(voter)) for voter in voters}
+            m1 = encrypt_message('{"voter": "bench"}', election.co_public_key)
+            m2 = encrypt_message('{"candidate_id": 1}', election.de_public_key)
+            half = len(voters) // 2
+
+            def submit_request(voter):
+                return self.factory.post(
+                    '/api/votes/submit/',
+                    {'election_id': election.id, 'm1_identity': m1, 'm2_ballot': m2, 'unique_id': str(uuid.uuid4())},
+                    content_type='application/json',
+                    headers=self._auth(tokens, voter)
+                )
+
+            def my_vote_request(voter):
+                return self.factory.get(
+                    '/api/votes/my-vote/', {'election_id': election.id}, headers=self._auth(tokens, voter)
+                )
+
+            def public_keys_request(voter):
+                return self.factory.get(
+                    f'/api/elections/{election.id}/public_keys/', headers=self._auth(tokens, voter)
+                )
+
+            self.stdout.write(
+                f"⚡ {options['concurrency']} requête(s) simultanée(s), {len(voters)} électeur(s)"
+            )
+
+            # Contrôle d'admission désactivé : on mesure les vues, pas le seau
+            with override_settings(VOTE_ADMISSION_RATES={}):
+                for title, sync_view, async_view, build, kwargs in (
+                    ('public_keys', ElectionPublicKeysView, AsyncElectionPublicKeysView,
+                     public_keys_request, {'pk': election.id}),
+                    ('my-vote', MyVoteStatusView, AsyncMyVoteStatusView, my_vote_request, {}),
+                ):
+                    for mode, view in (('sync', sync_view), ('async', async_view)):
+                        requests = [build(voter) for voter in voters]
+                        self._report(title, mode, asyncio.run(
+                            self._run(view, mode, requests, kwargs, options['concurrency'])
+                        ))
+
+                # Soumission : une moitié des électeurs par mode (un seul vote chacun)
+                for mode, view, group in (
+                    ('sync', SubmitVoteView, voters[:half]),
+                    ('async', AsyncSubmitVoteView, voters[half:]),
+                ):
+                    requests = [submit_request(voter) for voter in group]
+                    self._report('submit', mode, asyncio.run(
+                        self._run(view, mode, requests, {}, options['concurrency'])
+                    ))
+
+                codes = list(VoteReceipt.objects.filter(vote__election=election).select_related('vote'))
+                for mode, view in (('sync', VoteReceiptView), ('async', AsyncVoteReceiptView)):
+                    requests = [
+                        self.factory.get(
+                            '/api/votes/receipt/', {'code': receipt.receipt_code},
+                            headers={'Authorization': f'Bearer {tokens[receipt.vote.voter_id]}'}
+                        )
+                        for receipt in codes
+                    ]
+                    self._report('receipt', mode, asyncio.run(
+                        self._run(view, mode, requests, {}, options['concurrency'])
+                    ))
+        finally:
+            election.delete()
+            User.objects.filter(username__startswith=f'bench-{label}-').delete()
+
+    def _auth(self, tokens, voter):
+        return {'Authorization': f'Bearer {tokens[voter.id]}'}
+
+    async def _run(self, view_class, mode, requests, kwargs, concurrency):
+        """
+        Vue synchrone : sync_to_async(thread_sensitive=True), comme le
+        gestionnaire ASGI de Django ; vue asynchrone : attendue directement
+        """
+        view = view_class.as_view()
+        call = sync_to_async(view) if mode == 'sync' else view
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies, statuses = [], Counter()
+
+        async def one(request):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await call(request, **kwargs)
+                if hasattr(response, 'render'):
+                    response = await sync_to_async(response.render)()
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(request) for request in requests))
+        return time.perf_counter() - start, sorted(latencies), statuses
+
+    def _report(self, title, mode, result):
+        elapsed, latencies, statuses = result
+        p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+        self.stdout.write(
+            f"  {title:<12} {mode:<5} : {len(latencies) / elapsed:7.0f} req/s, "
+            f"p50 {latencies[len(latencies) // 2] * 1000:6.0f} ms, p99 {p99 * 1000:6.0f} ms  {dict(statuses)}"
+        )
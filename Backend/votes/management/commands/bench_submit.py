@@ -0,0 +1,147 @@
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from elections.models import Election, ElectionVoterAssignment
+from votes import ingest
+from votes.crypto_utils import encrypt_message
+from votes.models import Vote
+from votes.views import SubmitVoteView
+
+User = get_user_model()
+
+TRANSACTION_CONTROL = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE')
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure les requêtes SQL par soumission de vote puis soumet chaque vote "
+        "plusieurs fois en parallèle pour vérifier l'absence de double vote"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--voters', type=int, default=200, help="Nombre d'électeurs de test")
+        parser.add_argument('--threads', type=int, default=8, help="Threads de soumission concurrents")
+        parser.add_argument(
+            '--attempts', type=int, default=3,
+            help="Soumissions simultanées par électeur pendant le test de concurrence"
+        )
+        parser.add_argument(
+            '--ingest', action='store_true',
+            help="Mesure le mode d'ingestion différée (VOTE_INGEST_MODE)"
+        )
+
+    def handle(self, *args, **options):
+        with override_settings(VOTE_INGEST_MODE=options['ingest']):
+            self._run(options)
+
+    def _run(self, options):
+        label = uuid.uuid4().hex[:8]
+        election, voters = self._setup(label, options['voters'])
+
+        try:
+            m1 = encrypt_message('{"voter": "bench"}', election.co_public_key)
+            m2 = encrypt_message('{"candidate_id": 1}', election.de_public_key)
+            view = SubmitVoteView.as_view()
+            factory = APIRequestFactory()
+
+            def submit(voter):
+                request = factory.post('/api/votes/submit/', {
+                    'election_id': election.id,
+                    'm1_identity': m1,
+                    'm2_ballot': m2,
+                    'unique_id': str(uuid.uuid4()),
+                }, format='json')
+                force_authenticate(request, user=voter)
+                return view(request).status_code
+
+            # 1. Requêtes SQL par soumission (séquentiel)
+            sample = voters[:max(1, len(voters) // 4)]
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                statuses = [submit(voter) for voter in sample]
+            elapsed = time.perf_counter() - start
+
+            if set(statuses) != {201}:
+                raise CommandError(f"Soumissions refusées pendant la mesure : {Counter(statuses)}")
+
+            # BEGIN / COMMIT / SAVEPOINT comptés à part
+            control = sum(1 for query in queries if query['sql'].split(' ', 1)[0] in TRANSACTION_CONTROL)
+            self.stdout.write(
+                f"📊 {(len(queries) - control) / len(sample):.1f} requête(s) SQL par soumission "
+                f"(+ {control / len(sample):.1f} de contrôle de transaction), "
+                f"{len(sample) / elapsed:.1f} soumissions/s"
+            )
+
+            # 2. Concurrence : chaque électeur restant soumet `attempts` fois en parallèle
+            def hammer(voter):
+                try:
+                    return submit(voter)
+                except Exception as e:
+                    return type(e).__name__
+                finally:
+                    connection.close()
+
+            targets = [voter for voter in voters[len(sample):] for _ in range(options['attempts'])]
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+                results = Counter(executor.map(hammer, targets))
+            elapsed = time.perf_counter() - start
+
+            if options['ingest']:
+                ingest.get_log().flush()
+
+            doubles = Vote.objects.filter(election=election).values('voter').annotate(
+                n=Count('id')
+            ).filter(n__gt=1).count()
+            accepted = Vote.objects.filter(election=election).count()
+
+            self.stdout.write(
+                f"🔨 {len(targets)} soumission(s) concurrentes en {elapsed:.1f} s : {dict(results)}"
+            )
+            self.stdout.write(f"   Votes enregistrés : {accepted} pour {len(voters)} électeur(s)")
+
+            if doubles:
+                raise CommandError(f"❌ {doubles} électeur(s) ont voté plusieurs fois")
+            self.stdout.write(self.style.SUCCESS("✅ Aucun double vote"))
+        finally:
+            election.delete()
+            User.objects.filter(username__startswith=f'bench-{label}-').delete()
+
+    def _setup(self, label, count):
+        now = timezone.now()
+        election = Election.objects.create(
+            title=f"Benchmark soumission {label}",
+            description="Élection temporaire créée par bench_submit",
+            start_date=now,
+            end_date=now + timezone.timedelta(days=1),
+            key_algorithm='curve25519',
+        )
+        election.ensure_encryption_keys()
+
+        User.objects.bulk_create([
+            User(
+                username=f'bench-{label}-{i}',
+                email=f'bench-{label}-{i}@evote.local',
+                role='voter',
+            )
+            for i in range(count)
+        ])
+        voters = list(User.objects.filter(username__startswith=f'bench-{label}-'))
+        ElectionVoterAssignment.objects.bulk_create([
+            ElectionVoterAssignment(election=election, voter=voter) for voter in voters
+        ])
+
+        # Ouverture après l'assignation, comme en production (index électeurs complet)
+        election.status = 'open'
+        election.save()
+        return election, voters
@@ -0,0 +1,148 @@
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from votes.crypto_utils import encrypt_message
+from votes.views import SubmitVoteView
+
+from .bench_submit import Command as BenchSubmitCommand
+
+User = get_user_model()
+
+
+class Command(BenchSubmitCommand):
+    help = (
+        "Test de charge du contrôle d'admission : soumissions à débit fixe, "
+        "N fois au-dessus de la capacité, avec puis sans seau à jetons"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rate', type=float, default=0,
+            help="Débit d'admission (jetons/s) ; défaut : 80 %% de la capacité mesurée"
+        )
+        parser.add_argument('--overload', type=float, default=5, help="Débit offert / débit d'admission")
+        parser.add_argument('--duration', type=float, default=3, help="Durée de chaque passe (s)")
+        parser.add_argument(
+            '--threads', type=int, default=1024,
+            help="Requêtes simultanées au plus (large : la file doit se former dans le serveur)"
+        )
+
+    def handle(self, *args, **options):
+        self.factory = APIRequestFactory()
+        self.view = SubmitVoteView.as_view()
+        rate = options['rate'] or 0.8 * self._capacity()
+        offered = rate * options['overload']
+        count = int(offered * options['duration'])
+
+        self.stdout.write(
+            f"🚦 Admission {rate:.0f}/s, débit offert {offered:.0f}/s ({options['overload']:g}x) "
+            f"pendant {options['duration']:g} s"
+        )
+
+        passes = (
+            ("sans contrôle d'admission", (0, 0)),
+            ("avec contrôle d'admission", (rate, max(1, rate / 10))),
+        )
+        for title, submit_rate in passes:
+            with override_settings(VOTE_ADMISSION_RATES={'submit': submit_rate}):
+                results = self._run_pass(count, offered, options['threads'])
+            self._report(title, results)
+
+    def _capacity(self, threads=8):
+        """Soumissions par seconde en boucle fermée (quelques threads), sans contrôle d'admission"""
+        label = uuid.uuid4().hex[:8]
+        election, voters = self._setup(label, 400)
+
+        def job(voter):
+            try:
+                return self._submit(payload, voter)
+            finally:
+                connection.close()
+
+        try:
+            payload = self._payload(election)
+            with override_settings(VOTE_ADMISSION_RATES={}):
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=threads) as executor:
+                    statuses = Counter(executor.map(job, voters))
+                elapsed = time.perf_counter() - start
+        finally:
+            self._cleanup(election, label)
+        return statuses[201] / elapsed
+
+    def _run_pass(self, count, offered, threads):
+        label = uuid.uuid4().hex[:8]
+        election, voters = self._setup(label, count)
+        payload = self._payload(election)
+        results = []
+        results_lock = threading.Lock()
+
+        def job(voter, scheduled):
+            try:
+                status_code = self._submit(payload, voter)
+            except Exception as e:
+                status_code = f"{type(e).__name__}: {e}"
+            finally:
+                connection.close()
+            # Latence mesurée depuis l'instant prévu : l'attente dans la file compte
+            with results_lock:
+                results.append((status_code, scheduled, time.perf_counter()))
+
+        try:
+            # Boucle ouverte : le débit offert ne ralentit pas quand le serveur sature
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                start = time.perf_counter()
+                for i, voter in enumerate(voters):
+                    scheduled = start + i / offered
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    executor.submit(job, voter, scheduled)
+        finally:
+            self._cleanup(election, label)
+        return results
+
+    def _payload(self, election):
+        return {
+            'election_id': election.id,
+            'm1_identity': encrypt_message('{"voter": "load"}', election.co_public_key),
+            'm2_ballot': encrypt_message('{"candidate_id": 1}', election.de_public_key),
+        }
+
+    def _submit(self, payload, voter):
+        request = self.factory.post(
+            '/api/votes/submit/', dict(payload, unique_id=str(uuid.uuid4())), format='json'
+        )
+        force_authenticate(request, user=voter)
+        return self.view(request).status_code
+
+    def _cleanup(self, election, label):
+        election.delete()
+        User.objects.filter(username__startswith=f'bench-{label}-').delete()
+
+    def _report(self, title, results):
+        statuses = Counter(status_code for status_code, _, _ in results)
+        accepted = sorted(done - scheduled for status_code, scheduled, done in results if status_code == 201)
+        if not accepted:
+            raise CommandError(f"Aucune soumission acceptée ({title}) : {dict(statuses)}")
+        elapsed = max(done for _, _, done in results) - min(scheduled for _, scheduled, _ in results)
+
+        def percentile(p):
+            return accepted[min(len(accepted) - 1, int(p * len(accepted)))] * 1000
+
+        self.stdout.write(f"  {title} : {dict(statuses)}")
+        self.stdout.write(
+            f"    acceptées : {len(accepted) / elapsed:.0f}/s, latence p50 {percentile(0.5):.0f} ms, "
+            f"p99 {percentile(0.99):.0f} ms, max {accepted[-1] * 1000:.0f} ms "
+            f"(moyenne {statistics.mean(accepted) * 1000:.0f} ms)"
+        )
@@ -0,0 +1,103 @@
+import json
+import uuid
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.test.client import BOUNDARY, encode_multipart
+
+from votes.crypto_backends.base import KEY_ALGORITHMS
+from votes.crypto_utils import generate_keypair, encrypt_message
+from votes.parsers import msgpack_available
+from votes.pgp_packets import dearmor
+
+MILLION = 1_000_000
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure la taille d'un vote (M1 + M2) en armure ASCII et en paquets binaires : "
+        "corps de la soumission et octets stockés par million de votes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--algorithm', action='append', choices=KEY_ALGORITHMS, default=None,
+            help="Algorithme de clé, répétable (défaut: tous)"
+        )
+        parser.add_argument(
+            '--messages', type=int, default=50,
+            help="Votes chiffrés par algorithme (tailles moyennées)"
+        )
+
+    def handle(self, *args, **options):
+        algorithms = options['algorithm'] or list(KEY_ALGORITHMS)
+        count = options['messages']
+
+        rows = []
+        for algorithm in algorithms:
+            co = generate_keypair('Bench CO', 'co@evote.local', algorithm=algorithm)
+            de = generate_keypair('Bench DE', 'de@evote.local', algorithm=algorithm)
+
+            totals = dict.fromkeys(('armored', 'binary', 'json', 'multipart', 'msgpack'), 0)
+            for _ in range(count):
+                for key, value in self._measure(co['public_key'], de['public_key']).items():
+                    totals[key] += value
+            rows.append((algorithm, {key: value / count for key, value in totals.items()}))
+
+        self.stdout.write(f"📏 Taille moyenne d'un vote (M1 + M2), {count} vote(s) par algorithme\n")
+        self.stdout.write(
+            f"{'Algorithme':<12} {'Armure':>8} {'Binaire':>8} {'Gain':>6}   "
+            f"{'JSON':>7} {'Multipart':>10} {'msgpack':>8}   {'Base / million':>16}"
+        )
+        for algorithm, sizes in rows:
+            saved = sizes['armored'] - sizes['binary']
+            msgpack_size = f"{sizes['msgpack']:>6.0f} o" if sizes['msgpack'] else f"{'-':>8}"
+            self.stdout.write(
+                f"{algorithm:<12} {sizes['armored']:>6.0f} o {sizes['binary']:>6.0f} o "
+                f"{saved / sizes['armored'] * 100:>5.1f}%   "
+                f"{sizes['json']:>5.0f} o {sizes['multipart']:>8.0f} o {msgpack_size}   "
+                f"{saved * MILLION / 1024 ** 2:>10.0f} Mio en moins"
+            )
+
+    def _measure(self, co_public_key, de_public_key):
+        """Tailles d'un vote chiffré comme par le frontend (voir VotePage.jsx)"""
+        linking_id = uuid.uuid4().hex * 2
+        m1 = encrypt_message(json.dumps({
+            'voter_id': 12345,
+            'voter_name': 'Prénom Nom',
+            'voter_email': 'electeur@example.org',
+            'election_id': 1,
+            'linking_id': linking_id,
+            'timestamp': '2026-10-18T12:00:00.000Z',
+        }), co_public_key)
+        m2 = encrypt_message(json.dumps({
+            'candidate_id': 42,
+            'candidate_name': 'Candidat',
+            'linking_id': linking_id,
+            'timestamp': '2026-10-18T12:00:00.000Z',
+        }), de_public_key)
+        m1_packets, m2_packets = dearmor(m1), dearmor(m2)
+        unique_id = str(uuid.uuid4())
+
+        sizes = {
+            'armored': len(m1) + len(m2),
+            'binary': len(m1_packets) + len(m2_packets),
+            'json': len(json.dumps({
+                'election_id': 1, 'm1_identity': m1, 'm2_ballot': m2, 'unique_id': unique_id
+            })),
+            'multipart': len(encode_multipart(BOUNDARY, {
+                'election_id': '1',
+                'm1_identity': SimpleUploadedFile('m1.pgp', m1_packets, 'application/octet-stream'),
+                'm2_ballot': SimpleUploadedFile('m2.pgp', m2_packets, 'application/octet-stream'),
+                'unique_id': unique_id,
+            })),
+            'msgpack': 0,
+        }
+
+        if msgpack_available():
+            import msgpack
+
+            sizes['msgpack'] = len(msgpack.packb({
+                'election_id': 1, 'm1_identity': m1_packets, 'm2_ballot': m2_packets, 'unique_id': unique_id
+            }))
+        return sizes
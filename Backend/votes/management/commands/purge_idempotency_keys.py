@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from votes.idempotency import purge
+
+
+class Command(BaseCommand):
+    help = "Supprime les clés d'idempotence de soumission plus anciennes que VOTE_IDEMPOTENCY_RETENTION"
+
+    def handle(self, *args, **options):
+        deleted = purge()
+        self.stdout.write(self.style.SUCCESS(f"🧹 {deleted} clé(s) d'idempotence supprimée(s)"))
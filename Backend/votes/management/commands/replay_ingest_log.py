@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from votes.ingest import orphan_segments, replay
+
+
+class Command(BaseCommand):
+    help = "Rejoue les segments du journal d'ingestion laissés par des processus terminés"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Rejoue tous les segments (à n'utiliser que service arrêté)"
+        )
+
+    def handle(self, *args, **options):
+        segments = orphan_segments(settings.VOTE_INGEST_DIR, everything=options['all'])
+        restored = replay(segments)
+        self.stdout.write(self.style.SUCCESS(
+            f"♻️ {restored} vote(s) rétabli(s) depuis {len(segments)} segment(s)"
+        ))
@@ -0,0 +1,53 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from votes.approval_jobs import claim_job, release_job, run_job
+from votes.leases import new_owner
+
+
+class Command(BaseCommand):
+    help = "Traite les jobs d'approbation CO en file (table COApprovalJob)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help="S'arrête quand la file est vide au lieu d'attendre de nouveaux jobs"
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=None,
+            help="Attente entre deux recherches de job (défaut: CO_APPROVAL_JOB_POLL_INTERVAL)"
+        )
+
+    def handle(self, *args, **options):
+        poll_interval = options['poll_interval'] or settings.CO_APPROVAL_JOB_POLL_INTERVAL
+        worker = new_owner()
+        job = None
+        self.stdout.write(f"🛠️ Worker d'approbation {worker} démarré")
+
+        try:
+            while True:
+                close_old_connections()
+                job = claim_job(worker)
+
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                self.stdout.write(f"▶️ Job {job.pk} : {job.total} vote(s)")
+                if run_job(job, worker):
+                    job.refresh_from_db()
+                    self.stdout.write(self.style.SUCCESS(
+                        f"✅ Job {job.pk} terminé : {job.approved_count} approuvé(s), "
+                        f"{job.failed_count} en erreur, {job.skipped_count} ignoré(s) "
+                        f"({job.throughput:.0f} votes/s)"
+                    ))
+                job = None
+        except KeyboardInterrupt:
+            if job is not None:
+                release_job(job, worker)
+            self.stdout.write(self.style.WARNING("Worker d'approbation arrêté"))
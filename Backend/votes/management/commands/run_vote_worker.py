@@ -0,0 +1,100 @@
+import signal
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from votes import co_approval, de_counting, leases
+
+STAGES = {
+    'co': (co_approval.approve_chunk, co_approval.summarize, co_approval.APPROVED),
+    'de': (de_counting.count_chunk, de_counting.summarize, de_counting.COUNTED),
+}
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker CO (approbation des M1) ou DE (dépouillement des M2) : réclame des lots "
+        "de votes en attente (SELECT ... FOR UPDATE SKIP LOCKED + bail), les traite et "
+        "les libère. Plusieurs workers, sur plusieurs machines, se partagent la file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stage', choices=STAGES, required=True, help="Étape traitée : co ou de")
+        parser.add_argument(
+            '--user', required=True,
+            help="Nom d'utilisateur du CO / DE enregistré comme vérificateur"
+        )
+        parser.add_argument('--election', type=int, default=None, help="Limiter à une élection")
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="Votes réclamés par lot (défaut: CO_APPROVE_CHUNK_SIZE)"
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="S'arrête quand la file est vide au lieu d'attendre de nouveaux votes"
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=None,
+            help="Attente quand la file est vide (défaut: CO_APPROVAL_JOB_POLL_INTERVAL)"
+        )
+
+    def handle(self, *args, **options):
+        stage = options['stage']
+        process, summarize, done_outcome = STAGES[stage]
+        batch_size = options['batch_size'] or settings.CO_APPROVE_CHUNK_SIZE
+        poll_interval = options['poll_interval'] or settings.CO_APPROVAL_JOB_POLL_INTERVAL
+
+        user = get_user_model().objects.filter(username=options['user']).first()
+        if user is None or user.role != stage:
+            raise CommandError(f"Utilisateur {options['user']} introuvable ou sans le rôle {stage}")
+
+        owner = leases.new_owner()
+        elections = {}
+        totals = dict.fromkeys(('votes', 'done', 'failed'), 0)
+        started = time.perf_counter()
+        vote_ids = []
+        self.stdout.write(f"🛠️ Worker {stage.upper()} {owner} démarré (lots de {batch_size})")
+
+        # Arrêt par le superviseur (systemd, docker stop) : votes du lot en cours libérés
+        signal.signal(signal.SIGTERM, _interrupt)
+
+        try:
+            while True:
+                close_old_connections()
+                vote_ids = leases.claim_batch(stage, owner, batch_size, election_id=options['election'])
+
+                if not vote_ids:
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                batch_started = time.perf_counter()
+                summary = summarize(process(user, vote_ids, elections, owner=owner, hold_failed=True))
+                elapsed = time.perf_counter() - batch_started
+
+                totals['votes'] += len(vote_ids)
+                totals['done'] += summary[done_outcome]
+                totals['failed'] += summary['error']
+                self.stdout.write(
+                    f"  ✅ {len(vote_ids)} vote(s) en {elapsed:.2f}s "
+                    f"({len(vote_ids) / elapsed:.0f} votes/s) : "
+                    + ', '.join(f'{outcome} {count}' for outcome, count in summary.items() if count)
+                )
+                vote_ids = []
+        except KeyboardInterrupt:
+            leases.release(owner, vote_ids)
+            self.stdout.write(self.style.WARNING(f"Worker {stage.upper()} arrêté"))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"🏁 {totals['votes']} vote(s) traité(s), {totals['done']} {done_outcome}, "
+            f"{totals['failed']} en erreur en {elapsed:.1f}s"
+        ))
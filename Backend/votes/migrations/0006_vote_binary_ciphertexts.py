@@ -0,0 +1,103 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def _packets(text):
+    from votes.pgp_packets import dearmor, PGPPacketError
+
+    try:
+        return dearmor(text)
+    except PGPPacketError:
+        # Vote antérieur à la validation structurelle : texte conservé tel quel
+        return text.encode('utf-8')
+
+
+def dearmor_ciphertexts(apps, schema_editor):
+    Vote = apps.get_model('votes', 'Vote')
+    batch = []
+    for vote in Vote.objects.only('m1_identity', 'm2_ballot').iterator(chunk_size=BATCH_SIZE):
+        vote.m1_packets = _packets(vote.m1_identity)
+        vote.m2_packets = _packets(vote.m2_ballot)
+        batch.append(vote)
+        if len(batch) >= BATCH_SIZE:
+            Vote.objects.bulk_update(batch, ['m1_packets', 'm2_packets'])
+            batch = []
+    Vote.objects.bulk_update(batch, ['m1_packets', 'm2_packets'])
+
+
+def armor_ciphertexts(apps, schema_editor):
+    from votes.pgp_packets import armor
+
+    Vote = apps.get_model('votes', 'Vote')
+    batch = []
+    for vote in Vote.objects.only('m1_packets', 'm2_packets').iterator(chunk_size=BATCH_SIZE):
+        vote.m1_identity = armor(vote.m1_packets)
+        vote.m2_ballot = armor(vote.m2_packets)
+        batch.append(vote)
+        if len(batch) >= BATCH_SIZE:
+            Vote.objects.bulk_update(batch, ['m1_identity', 'm2_ballot'])
+            batch = []
+    Vote.objects.bulk_update(batch, ['m1_identity', 'm2_ballot'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('votes', '0005_submitidempotencykey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='m1_packets',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='vote',
+            name='m2_packets',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.RunPython(dearmor_ciphertexts, armor_ciphertexts),
+        # Valeur par défaut : colonnes texte recréables en cas de retour arrière
+        migrations.AlterField(
+            model_name='vote',
+            name='m1_identity',
+            field=models.TextField(default=''),
+        ),
+        migrations.AlterField(
+            model_name='vote',
+            name='m2_ballot',
+            field=models.TextField(default=''),
+        ),
+        migrations.RemoveField(
+            model_name='vote',
+            name='m1_identity',
+        ),
+        migrations.RemoveField(
+            model_name='vote',
+            name='m2_ballot',
+        ),
+        migrations.RenameField(
+            model_name='vote',
+            old_name='m1_packets',
+            new_name='m1_identity',
+        ),
+        migrations.RenameField(
+            model_name='vote',
+            old_name='m2_packets',
+            new_name='m2_ballot',
+        ),
+        migrations.AlterField(
+            model_name='vote',
+            name='m1_identity',
+            field=models.BinaryField(help_text="Encrypted with CO's public key", verbose_name='Message 1 (Identité chiffrée)'),
+        ),
+        migrations.AlterField(
+            model_name='vote',
+            name='m2_ballot',
+            field=models.BinaryField(help_text="Encrypted with DE's public key", verbose_name='Message 2 (Bulletin chiffré)'),
+        ),
+    ]
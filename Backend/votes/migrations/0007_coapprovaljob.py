@@ -0,0 +1,46 @@
+# Generated by Django 6.0.2 on 2026-10-18 14:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0005_election_public_keys_bundle'),
+        ('votes', '0006_vote_binary_ciphertexts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='COApprovalJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('vote_ids', models.JSONField(blank=True, null=True, verbose_name='Votes')),
+                ('status', models.CharField(choices=[('queued', 'En file'), ('running', 'En cours'), ('done', 'Terminé'), ('failed', 'Échec')], default='queued', max_length=20, verbose_name='Statut')),
+                ('cursor', models.BigIntegerField(default=0, help_text='Position dans vote_ids, ou dernier vote traité (élection)', verbose_name='Curseur')),
+                ('last_vote_id', models.BigIntegerField(blank=True, help_text='Dernier vote en attente à la création (élection) : votes suivants exclus', null=True)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('approved_count', models.PositiveIntegerField(default=0)),
+                ('failed_count', models.PositiveIntegerField(default=0)),
+                ('skipped_count', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Premiers échecs')),
+                ('error', models.TextField(blank=True, verbose_name='Erreur')),
+                ('worker', models.CharField(blank=True, max_length=255)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='co_approval_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Créé par')),
+                ('election', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='elections.election', verbose_name='Élection')),
+            ],
+            options={
+                'verbose_name': "Job d'approbation CO",
+                'verbose_name_plural': "Jobs d'approbation CO",
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='votes_coapp_status_d06425_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0005_election_public_keys_bundle'),
+        ('votes', '0007_coapprovaljob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='vote',
+            name='lease_owner',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['status', 'lease_expires_at'], name='votes_vote_status_634e82_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0005_election_public_keys_bundle'),
+        ('votes', '0008_vote_leases'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['election', 'status', 'id'], name='votes_vote_electio_207f51_idx'),
+        ),
+    ]
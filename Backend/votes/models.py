@@ -2,6 +2,7 @@
 
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from elections.models import Election
 from candidates.models import Candidate
 
@@ -38,12 +39,12 @@ class Vote(models.Model):
         verbose_name="Électeur"
     )
     
-    # Encrypted messages
-    m1_identity = models.TextField(
+    # Encrypted messages (paquets OpenPGP binaires, sans armure ASCII)
+    m1_identity = models.BinaryField(
         verbose_name="Message 1 (Identité chiffrée)",
         help_text="Encrypted with CO's public key"
     )
-    m2_ballot = models.TextField(
+    m2_ballot = models.BinaryField(
         verbose_name="Message 2 (Bulletin chiffré)",
         help_text="Encrypted with DE's public key"
     )
@@ -96,7 +97,8 @@ class Vote(models.Model):
         related_name='de_verified_votes'
     )
     
-    # ✅ NOUVEAU: PDF M2 généré par CO
+    # PDF M2 des approbations antérieures au rendu à la demande (plus écrit :
+    # les PDF sont rendus au téléchargement, voir votes.pdf_cache)
     m2_pdf = models.FileField(
         upload_to='votes/m2_pdfs/',
         null=True,
@@ -104,8 +106,17 @@ class Vote(models.Model):
         verbose_name="PDF M2"
     )
     
+    # Bail de traitement CO / DE (votes.leases) : un seul worker ou opérateur à la fois
+    lease_owner = models.CharField(max_length=255, blank=True, default='')
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['status', 'lease_expires_at']),
+            # Listes paginées du CO par élection et statut (pagination par clé sur id)
+            models.Index(fields=['election', 'status', 'id']),
+        ]
         verbose_name = 'Vote'
         verbose_name_plural = 'Votes'
     
@@ -129,6 +140,18 @@ class Vote(models.Model):
     def is_approved_co(self):
         """Vote approuvé par CO"""
         return self.status in ['pending_de', 'counted']
+    
+    @property
+    def m1_armored(self):
+        """M1 en armure ASCII (exports PDF, API CO)"""
+        from .pgp_packets import armor
+        return armor(self.m1_identity)
+    
+    @property
+    def m2_armored(self):
+        """M2 en armure ASCII (exports PDF, API DE)"""
+        from .pgp_packets import armor
+        return armor(self.m2_ballot)
 
 
 class DecryptedBallot(models.Model):
@@ -209,4 +232,137 @@ class VoteReceipt(models.Model):
         verbose_name_plural = 'Reçus de Vote'
     
     def __str__(self):
-        return f"Receipt {self.receipt_code}"
\ No newline at end of file
+        return f"Receipt {self.receipt_code}"
+
+class SubmitIdempotencyKey(models.Model):
+    """
+    Réponse d'une soumission de vote réussie, rejouée si le client renvoie
+    la même requête (en-tête Idempotency-Key). Conservée
+    VOTE_IDEMPOTENCY_RETENTION secondes (purge_idempotency_keys).
+    """
+    voter = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name="Électeur"
+    )
+    key = models.CharField(
+        max_length=255,
+        verbose_name="Clé d'idempotence"
+    )
+    election = models.ForeignKey(
+        Election,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name="Élection"
+    )
+    response = models.JSONField(verbose_name="Réponse")
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name="Date de création"
+    )
+    
+    class Meta:
+        unique_together = ['voter', 'key']
+        verbose_name = "Clé d'idempotence"
+        verbose_name_plural = "Clés d'idempotence"
+    
+    def __str__(self):
+        return f"{self.voter_id} / {self.key}"
+
+
+class COApprovalJob(models.Model):
+    """
+    Approbation CO en arrière-plan (POST /api/votes/co/approve-jobs/)
+
+    La vue crée le job et répond aussitôt ; un worker
+    (python manage.py run_approval_worker) le réclame et approuve les votes
+    par morceaux (votes.co_approval), en enregistrant la progression après
+    chaque morceau. Un job dont le worker ne donne plus signe de vie depuis
+    CO_APPROVAL_JOB_LEASE secondes est repris par un autre worker à
+    partir du curseur.
+    """
+    STATUS_CHOICES = (
+        ('queued', 'En file'),
+        ('running', 'En cours'),
+        ('done', 'Terminé'),
+        ('failed', 'Échec'),
+    )
+    
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='co_approval_jobs',
+        verbose_name="Créé par"
+    )
+    
+    # Votes à approuver : liste d'identifiants, ou votes en attente de l'élection
+    election = models.ForeignKey(
+        Election,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Élection"
+    )
+    vote_ids = models.JSONField(null=True, blank=True, verbose_name="Votes")
+    
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='queued',
+        verbose_name="Statut"
+    )
+    cursor = models.BigIntegerField(
+        default=0,
+        verbose_name="Curseur",
+        help_text="Position dans vote_ids, ou dernier vote traité (élection)"
+    )
+    last_vote_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Dernier vote en attente à la création (élection) : votes suivants exclus"
+    )
+    
+    # Progression
+    total = models.PositiveIntegerField(default=0)
+    approved_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, verbose_name="Premiers échecs")
+    error = models.TextField(blank=True, verbose_name="Erreur")
+    
+    # Worker propriétaire et dernier signe de vie
+    worker = models.CharField(max_length=255, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+        verbose_name = "Job d'approbation CO"
+        verbose_name_plural = "Jobs d'approbation CO"
+    
+    def __str__(self):
+        return f"Job {self.pk} ({self.status})"
+    
+    @property
+    def processed(self):
+        return self.approved_count + self.failed_count + self.skipped_count
+    
+    @property
+    def remaining(self):
+        return max(self.total - self.processed, 0)
+    
+    @property
+    def throughput(self):
+        """Votes traités par seconde depuis le démarrage"""
+        if not self.started_at:
+            return 0.0
+        elapsed = ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+        return self.processed / elapsed if elapsed > 0 else 0.0
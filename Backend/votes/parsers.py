@@ -0,0 +1,55 @@
+"""
+Corps de requête binaires pour la soumission des bulletins
+
+    - multipart/form-data     : m1_identity / m2_ballot en fichiers (paquets
+                                OpenPGP binaires) ou en champs texte (armure)
+    - application/msgpack     : même structure que le JSON, M1 / M2 en octets
+
+msgpack est une dépendance optionnelle : sans le paquet `msgpack`, ce
+format n'est pas proposé (415) et seuls JSON et multipart sont acceptés.
+"""
+
+import importlib.util
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser, MultiPartParser
+
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+
+
+def msgpack_available():
+    return importlib.util.find_spec('msgpack') is not None
+
+
+def unpack(body):
+    """
+    Décode un corps msgpack (les chaînes binaires restent des bytes)
+
+    Raises:
+        ParseError: Corps illisible ou non structuré en objet
+    """
+    import msgpack
+
+    try:
+        data = msgpack.unpackb(body, raw=False, strict_map_key=True)
+    except (ValueError, msgpack.UnpackException) as e:
+        raise ParseError(f"msgpack parse error - {e or type(e).__name__}")
+
+    if not isinstance(data, dict):
+        raise ParseError("msgpack parse error - objet attendu")
+    return data
+
+
+class MsgPackParser(BaseParser):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return unpack(stream.read() if stream is not None else b'')
+
+
+def ballot_parsers():
+    """Parsers de la soumission : JSON, multipart et, si installé, msgpack"""
+    parsers = [JSONParser, MultiPartParser]
+    if msgpack_available():
+        parsers.append(MsgPackParser)
+    return parsers
@@ -0,0 +1,122 @@
+"""
+PDF M1 / M2 des votes, rendus à la demande et gardés sur disque
+
+Rien n'est rendu à l'approbation : la plupart des PDF ne sont jamais
+téléchargés. Au premier téléchargement, le PDF est rendu (pdf_utils) puis
+écrit dans VOTE_PDF_CACHE_DIR, à un chemin adressé par son contenu :
+
+    <VOTE_PDF_CACHE_DIR>/<m1|m2>/<clé[:2]>/<clé>.pdf
+
+La clé est l'empreinte SHA-256 de tout ce que le gabarit affiche (vote,
+message chiffré, dates) et de pdf_utils.TEMPLATE_VERSION : un vote approuvé
+ou un gabarit modifié donne une nouvelle clé, jamais un PDF périmé.
+
+Les demandes simultanées d'un même PDF n'en rendent qu'un : verrou par clé
+entre threads, et verrou de fichier (fcntl, si disponible) entre processus.
+L'écriture passe par un fichier temporaire renommé : un PDF présent est
+toujours complet.
+"""
+
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+from . import pdf_utils
+
+try:
+    import fcntl
+except ImportError:  # Windows : verrou entre threads seulement
+    fcntl = None
+
+RENDERERS = {
+    'm1': pdf_utils.generate_m1_pdf,
+    'm2': pdf_utils.generate_m2_pdf,
+}
+
+_rendering = {}
+_lock = threading.Lock()
+
+
+def _inputs(kind, vote):
+    """Données affichées par le gabarit `kind`"""
+    if kind == 'm1':
+        return [vote.election.title, vote.submitted_at.isoformat(), bytes(vote.m1_identity)]
+    return [
+        vote.submitted_at.isoformat(),
+        vote.co_verified_at.isoformat() if vote.co_verified_at else '',
+        bytes(vote.m2_ballot),
+    ]
+
+
+def pdf_key(kind, vote):
+    """Empreinte SHA-256 du PDF `kind` du vote (gabarit et contenu)"""
+    digest = hashlib.sha256()
+    for part in [kind, pdf_utils.TEMPLATE_VERSION, vote.pk, vote.unique_id, *_inputs(kind, vote)]:
+        part = part if isinstance(part, bytes) else str(part).encode('utf-8')
+        digest.update(len(part).to_bytes(8, 'big'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def pdf_path(kind, key):
+    return Path(settings.VOTE_PDF_CACHE_DIR) / kind / key[:2] / f'{key}.pdf'
+
+
+def get_pdf(kind, vote):
+    """
+    Chemin du PDF `kind` ('m1' ou 'm2') du vote, rendu s'il est absent
+
+    Returns:
+        Path: Fichier PDF complet
+    """
+    key = pdf_key(kind, vote)
+    path = pdf_path(kind, key)
+    if path.exists():
+        return path
+
+    with _render_lock(key):
+        try:
+            with _file_lock(path):
+                # Rendu pendant l'attente du verrou (autre thread ou processus)
+                if not path.exists():
+                    _render(kind, vote, path)
+        finally:
+            with _lock:
+                _rendering.pop(key, None)
+
+    return path
+
+
+def _render(kind, vote, path):
+    buffer = RENDERERS[kind](vote)
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        tmp_path.write_bytes(buffer.getvalue())
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _render_lock(key):
+    with _lock:
+        return _rendering.setdefault(key, threading.Lock())
+
+
+@contextmanager
+def _file_lock(path):
+    """Verrou exclusif <chemin>.lock entre processus (sans effet sans fcntl)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+
+    fd = os.open(path.with_name(f'{path.name}.lock'), os.O_CREAT | os.O_RDWR, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
@@ -11,6 +11,10 @@ from io import BytesIO
 from datetime import datetime
 import PyPDF2
 
+# Version des gabarits M1 / M2 : à incrémenter à chaque modification du rendu
+# (les PDF déjà en cache, indexés par version, ne sont alors plus servis)
+TEMPLATE_VERSION = 1
+
 
 def generate_m1_pdf(vote):
     """
@@ -75,7 +79,7 @@ def generate_m1_pdf(vote):
         spaceAfter=10
     )
     
-    story.append(Preformatted(vote.m1_identity, pgp_style))
+    story.append(Preformatted(vote.m1_armored, pgp_style))
     
     # Footer
     story.append(Spacer(1, 1*cm))
@@ -162,7 +166,7 @@ def generate_m2_pdf(vote):
         spaceAfter=10
     )
     
-    story.append(Preformatted(vote.m2_ballot, pgp_style))
+    story.append(Preformatted(vote.m2_armored, pgp_style))
     
     # Footer
     story.append(Spacer(1, 1*cm))
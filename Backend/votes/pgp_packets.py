@@ -0,0 +1,321 @@
+"""
+Validation structurelle des messages OpenPGP soumis (RFC 4880 / RFC 9580)
+
+Seuls l'armure ASCII, le CRC24 et les en-têtes de paquets sont analysés :
+aucune opération sur une clé privée. Un bulletin malformé, trop gros ou
+chiffré pour une autre clé que celle de l'élection est donc refusé dès
+la soumission, en quelques microsecondes, au lieu d'échouer au
+déchiffrement CO/DE.
+"""
+
+import base64
+import binascii
+import functools
+import hashlib
+
+# Types de paquets (RFC 9580 §5)
+TAG_PKESK = 1
+TAG_SKESK = 3
+TAG_PUBLIC_KEY = 6
+TAG_MARKER = 10
+TAG_PUBLIC_SUBKEY = 14
+TAG_SEIPD = 18
+TAG_AEAD = 20
+TAG_PADDING = 21
+
+ENCRYPTED_DATA_TAGS = (TAG_SEIPD, TAG_AEAD)
+IGNORED_TAGS = (TAG_MARKER, TAG_PADDING)
+
+# Un bulletin est chiffré pour une seule clé : quelques paquets au plus
+MAX_PACKETS = 8
+
+CRC24_INIT = 0xB704CE
+CRC24_POLY = 0x1864CFB
+
+
+class PGPPacketError(ValueError):
+    """Message OpenPGP malformé ou non conforme aux attentes"""
+
+
+def _crc24_table():
+    table = []
+    for byte in range(256):
+        crc = byte << 16
+        for _ in range(8):
+            crc <<= 1
+            if crc & 0x1000000:
+                crc ^= CRC24_POLY
+        table.append(crc & 0xFFFFFF)
+    return tuple(table)
+
+
+_CRC24_TABLE = _crc24_table()
+
+
+def crc24(data):
+    """CRC24 de l'armure OpenPGP (RFC 4880 §6.1), calculé par table"""
+    crc = CRC24_INIT
+    table = _CRC24_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFF) ^ table[((crc >> 16) ^ byte) & 0xFF]
+    return crc
+
+
+def dearmor(text, block='PGP MESSAGE'):
+    """
+    Décode un bloc ASCII-armored et vérifie son CRC24 s'il est présent
+    (facultatif depuis la RFC 9580, openpgp.js v6 ne l'émet plus)
+
+    Returns:
+        bytes: Contenu binaire
+    """
+    begin = f'-----BEGIN {block}-----'
+    end = f'-----END {block}-----'
+
+    lines = [line.strip() for line in text.strip().splitlines()]
+    if len(lines) < 3 or lines[0] != begin or lines[-1] != end:
+        raise PGPPacketError(f"Armure OpenPGP invalide (bloc {block} attendu)")
+
+    body = lines[1:-1]
+
+    # En-têtes d'armure ("Version: ...", "Comment: ...") jusqu'à la ligne vide
+    if '' in body:
+        separator = body.index('')
+        if not all(': ' in header for header in body[:separator]):
+            raise PGPPacketError("En-têtes d'armure invalides")
+        body = body[separator + 1:]
+    elif body and ': ' in body[0]:
+        raise PGPPacketError("Ligne vide manquante après les en-têtes d'armure")
+
+    checksum = None
+    if body and body[-1].startswith('='):
+        checksum = body.pop()[1:]
+
+    try:
+        data = base64.b64decode(''.join(body), validate=True)
+    except (binascii.Error, ValueError):
+        raise PGPPacketError("Contenu base64 de l'armure invalide")
+
+    if not data:
+        raise PGPPacketError("Message OpenPGP vide")
+
+    if checksum is not None:
+        try:
+            expected = int.from_bytes(base64.b64decode(checksum, validate=True), 'big')
+        except (binascii.Error, ValueError):
+            raise PGPPacketError("CRC24 de l'armure illisible")
+        if len(checksum) != 4 or crc24(data) != expected:
+            raise PGPPacketError("CRC24 de l'armure incorrect")
+
+    return data
+
+
+def armor(data, block='PGP MESSAGE'):
+    """
+    Armure ASCII (RFC 4880 §6.2) d'un contenu binaire, CRC24 compris
+
+    Returns:
+        str: Bloc ASCII-armored, lignes de 64 caractères
+    """
+    data = bytes(data)
+    encoded = base64.b64encode(data).decode('ascii')
+    checksum = base64.b64encode(crc24(data).to_bytes(3, 'big')).decode('ascii')
+
+    return '\n'.join([
+        f'-----BEGIN {block}-----',
+        '',
+        *(encoded[i:i + 64] for i in range(0, len(encoded), 64)),
+        f'={checksum}',
+        f'-----END {block}-----',
+        '',
+    ])
+
+
+def packets(message):
+    """
+    Paquets binaires d'un message : armure ASCII décodée (str) ou
+    octets tels quels (bytes, memoryview d'un BinaryField)
+    """
+    if isinstance(message, str):
+        return dearmor(message)
+    return bytes(message)
+
+
+def iter_packets(data):
+    """
+    Parcourt les paquets d'un flux OpenPGP binaire sans décoder leur contenu
+
+    Yields:
+        tuple: (tag, body) où body est un memoryview sur le corps du paquet
+    """
+    view = memoryview(data)
+    pos = 0
+    size = len(data)
+
+    while pos < size:
+        header = view[pos]
+        if not header & 0x80:
+            raise PGPPacketError(f"En-tête de paquet invalide (octet {pos})")
+        pos += 1
+
+        if header & 0x40:
+            # Nouveau format : longueurs éventuellement partielles
+            tag = header & 0x3F
+            chunks = []
+            while True:
+                length, partial, pos = _new_format_length(view, pos)
+                if pos + length > size:
+                    raise PGPPacketError("Paquet OpenPGP tronqué")
+                chunks.append(view[pos:pos + length])
+                pos += length
+                if not partial:
+                    break
+            body = chunks[0] if len(chunks) == 1 else memoryview(b''.join(chunks))
+        else:
+            # Ancien format : la longueur est codée sur 1, 2 ou 4 octets
+            tag = (header >> 2) & 0x0F
+            length_type = header & 0x03
+            if length_type == 3:
+                # Longueur indéterminée : jusqu'à la fin du flux
+                length = size - pos
+            else:
+                octets = (1, 2, 4)[length_type]
+                if pos + octets > size:
+                    raise PGPPacketError("En-tête de paquet tronqué")
+                length = int.from_bytes(view[pos:pos + octets], 'big')
+                pos += octets
+            if pos + length > size:
+                raise PGPPacketError("Paquet OpenPGP tronqué")
+            body = view[pos:pos + length]
+            pos += length
+
+        yield tag, body
+
+
+def _new_format_length(view, pos):
+    """Longueur de corps au nouveau format : (longueur, partielle, position)"""
+    if pos >= len(view):
+        raise PGPPacketError("Longueur de paquet manquante")
+
+    first = view[pos]
+    if first < 192:
+        return first, False, pos + 1
+    if first < 224:
+        if pos + 1 >= len(view):
+            raise PGPPacketError("Longueur de paquet tronquée")
+        return ((first - 192) << 8) + view[pos + 1] + 192, False, pos + 2
+    if first == 255:
+        if pos + 5 > len(view):
+            raise PGPPacketError("Longueur de paquet tronquée")
+        return int.from_bytes(view[pos + 1:pos + 5], 'big'), False, pos + 5
+    return 1 << (first & 0x1F), True, pos + 1
+
+
+def _pkesk_recipient(body):
+    """Identifiant du destinataire d'un paquet PKESK (key ID v3 ou fingerprint v6)"""
+    if len(body) < 2:
+        raise PGPPacketError("Paquet PKESK tronqué")
+
+    version = body[0]
+    if version == 3:
+        if len(body) < 10:
+            raise PGPPacketError("Paquet PKESK tronqué")
+        return bytes(body[1:9]).hex().upper()
+
+    if version == 6:
+        length = body[1]
+        if len(body) < 2 + length:
+            raise PGPPacketError("Paquet PKESK tronqué")
+        # Longueur nulle : destinataire anonyme ; sinon version de clé + fingerprint
+        return bytes(body[3:2 + length]).hex().upper() if length else ''
+
+    raise PGPPacketError(f"Version de PKESK non supportée: {version}")
+
+
+def inspect_message(message, max_bytes=None):
+    """
+    Vérifie la structure d'un message chiffré : armure et CRC24 (message
+    armored), séquence PKESK… + paquet de données chiffrées avec intégrité
+    (SEIPD/AEAD)
+
+    Args:
+        message (str | bytes): Message ASCII-armored ou paquets binaires
+        max_bytes (int): Taille maximale du message (armure comprise), en octets
+
+    Returns:
+        list[str]: Destinataires (key IDs ou fingerprints, en hexadécimal)
+    """
+    if max_bytes is not None and len(message) > max_bytes:
+        raise PGPPacketError(f"Message chiffré trop volumineux (max {max_bytes} octets)")
+
+    recipients = []
+    has_data = False
+
+    for count, (tag, body) in enumerate(iter_packets(packets(message)), start=1):
+        if count > MAX_PACKETS:
+            raise PGPPacketError("Trop de paquets dans le message chiffré")
+        if has_data and tag not in IGNORED_TAGS:
+            raise PGPPacketError("Paquet inattendu après les données chiffrées")
+
+        if tag == TAG_PKESK:
+            recipients.append(_pkesk_recipient(body))
+        elif tag in ENCRYPTED_DATA_TAGS:
+            has_data = True
+        elif tag == TAG_SKESK:
+            raise PGPPacketError("Chiffrement par mot de passe refusé")
+        elif tag not in IGNORED_TAGS:
+            raise PGPPacketError(f"Paquet OpenPGP inattendu (type {tag})")
+
+    if not recipients:
+        raise PGPPacketError("Aucun destinataire (PKESK) dans le message chiffré")
+    if not has_data:
+        raise PGPPacketError("Données chiffrées avec intégrité (SEIPD) manquantes")
+
+    return recipients
+
+
+@functools.lru_cache(maxsize=64)
+def key_identifiers(public_key):
+    """
+    Key IDs et fingerprints (hexadécimal) de la clé primaire et des sous-clés
+    d'une clé publique ASCII-armored
+    """
+    identifiers = set()
+
+    for tag, body in iter_packets(dearmor(public_key, block='PGP PUBLIC KEY BLOCK')):
+        if tag not in (TAG_PUBLIC_KEY, TAG_PUBLIC_SUBKEY) or not len(body):
+            continue
+
+        version = body[0]
+        if version == 4:
+            fingerprint = hashlib.sha1(b'\x99' + len(body).to_bytes(2, 'big') + body).digest()
+            key_id = fingerprint[-8:]
+        elif version == 6:
+            fingerprint = hashlib.sha256(b'\x9b' + len(body).to_bytes(4, 'big') + body).digest()
+            key_id = fingerprint[:8]
+        else:
+            continue
+
+        identifiers.add(fingerprint.hex().upper())
+        identifiers.add(key_id.hex().upper())
+
+    return frozenset(identifiers)
+
+
+def check_recipients(message, allowed, max_bytes=None):
+    """
+    Vérifie que `message` est chiffré uniquement pour les clés `allowed`
+
+    Args:
+        message (str | bytes): Message ASCII-armored ou paquets binaires
+        allowed (frozenset): Identifiants acceptés, voir key_identifiers()
+
+    Raises:
+        PGPPacketError: Structure invalide ou destinataire inconnu
+    """
+    if not allowed:
+        raise PGPPacketError("Clé publique de l'élection absente")
+
+    for recipient in inspect_message(message, max_bytes=max_bytes):
+        if recipient not in allowed:
+            raise PGPPacketError("Message chiffré pour une clé inconnue")
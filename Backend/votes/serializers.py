@@ -1,27 +1,68 @@
 
 
+from django.conf import settings
 from rest_framework import serializers
 from .models import Vote, DecryptedBallot, VoteReceipt
+from .pgp_packets import armor, inspect_message, packets, PGPPacketError
 from candidates.models import Candidate
 
 
+class CiphertextField(serializers.Field):
+    """
+    Message OpenPGP chiffré
+
+    Accepte l'armure ASCII (texte JSON ou multipart) comme les paquets
+    binaires (fichier multipart, octets msgpack) et retourne les paquets
+    binaires, stockés tels quels dans Vote. L'armure est régénérée à
+    l'affichage.
+    """
+    default_error_messages = {
+        'invalid': 'Message chiffré attendu (armure ASCII ou paquets OpenPGP binaires).',
+        'max_length': 'Message chiffré trop volumineux (max {max_length} octets).',
+    }
+
+    def __init__(self, **kwargs):
+        self.max_length = kwargs.pop('max_length', settings.BALLOT_MAX_CIPHERTEXT_SIZE)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if hasattr(data, 'read'):
+            # Fichier multipart : taille connue avant lecture
+            if data.size > self.max_length:
+                self.fail('max_length', max_length=self.max_length)
+            data = data.read()
+            if data.startswith(b'-----BEGIN'):
+                # Fichier .asc : armure ASCII (un flux binaire commence par un octet >= 0x80)
+                data = data.decode('ascii', errors='replace')
+
+        if not isinstance(data, (str, bytes, bytearray)) or not data:
+            self.fail('invalid')
+        if len(data) > self.max_length:
+            self.fail('max_length', max_length=self.max_length)
+
+        # Armure, CRC24 et en-têtes de paquets OpenPGP (sans déchiffrement)
+        try:
+            data = packets(data)
+            inspect_message(data)
+        except PGPPacketError as e:
+            raise serializers.ValidationError(str(e))
+        return data
+
+    def to_representation(self, value):
+        return armor(value)
+
+
 class VoteSubmitSerializer(serializers.Serializer):
     """
     Serializer for submitting a vote
     Receives the double-encrypted vote package from frontend
     """
     election_id = serializers.IntegerField()
-    m1_identity = serializers.CharField()  
-    m2_ballot = serializers.CharField()    
-    unique_id = serializers.CharField()
-    
-    def validate_unique_id(self, value):
-        """Ensure unique_id is not already used"""
-        if Vote.objects.filter(unique_id=value).exists():
-            raise serializers.ValidationError(
-                "Cet ID unique existe déjà. Veuillez réessayer."
-            )
-        return value
+    m1_identity = CiphertextField()
+    m2_ballot = CiphertextField()
+    # Unicité garantie par la contrainte en base (voir SubmitVoteView), sans pré-requête ;
+    # remplacé par un unique_id du serveur en mode ingestion (VOTE_INGEST_MODE)
+    unique_id = serializers.CharField(max_length=255)
 
 
 class VoteSerializer(serializers.ModelSerializer):
@@ -41,6 +82,10 @@ class VoteSerializer(serializers.ModelSerializer):
     # Informations de l'élection
     election_title = serializers.CharField(source='election.title', read_only=True)
     
+    # Messages chiffrés en armure ASCII
+    m1_identity = CiphertextField(read_only=True)
+    m2_ballot = CiphertextField(read_only=True)
+    
     # PDF M2
     m2_pdf_url = serializers.SerializerMethodField()
     
@@ -96,6 +141,55 @@ class VoteSerializer(serializers.ModelSerializer):
         return None
 
 
+class COVoteListSerializer(serializers.ModelSerializer):
+    """
+    Vote dans les listes paginées du CO (GET /api/votes/co/election/<id>/)
+    Sans messages chiffrés ni PDF : voir COVoteCiphertextSerializer
+    """
+    voter_username = serializers.CharField(source='voter.username', read_only=True)
+    voter_email = serializers.EmailField(source='voter.email', read_only=True)
+    voter_first_name = serializers.CharField(source='voter.first_name', read_only=True)
+    voter_last_name = serializers.CharField(source='voter.last_name', read_only=True)
+    voter_full_name = serializers.SerializerMethodField()
+    
+    # Colonnes lues (les autres, dont m1_identity / m2_ballot, restent différées)
+    LIST_FIELDS = (
+        'id', 'election_id', 'unique_id', 'status', 'submitted_at', 'co_verified_at',
+        'voter__username', 'voter__email', 'voter__first_name', 'voter__last_name',
+    )
+    
+    class Meta:
+        model = Vote
+        fields = [
+            'id',
+            'election',
+            'voter_username',
+            'voter_email',
+            'voter_full_name',
+            'voter_first_name',
+            'voter_last_name',
+            'unique_id',
+            'status',
+            'submitted_at',
+            'co_verified_at',
+        ]
+    
+    get_voter_full_name = VoteSerializer.get_voter_full_name
+
+
+class COVoteCiphertextSerializer(serializers.ModelSerializer):
+    """
+    Messages chiffrés d'un vote, chargés à la demande par le CO
+    (GET /api/votes/co/<vote_id>/ciphertext/)
+    """
+    m1_identity = CiphertextField(read_only=True)
+    m2_ballot = CiphertextField(read_only=True)
+    
+    class Meta:
+        model = Vote
+        fields = ['id', 'election', 'unique_id', 'm1_identity', 'm2_ballot']
+
+
 class COVoteVerificationSerializer(serializers.Serializer):
     """
     Serializer for CO to verify identity and approve/reject vote
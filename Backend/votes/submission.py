@@ -0,0 +1,317 @@
+"""
+Soumission d'un vote, partagée par SubmitVoteView (DRF, synchrone) et
+AsyncSubmitVoteView (vue Django asynchrone)
+
+Chaque étape lève Refused (statut HTTP + corps) pour une réponse
+anticipée ; les vues se contentent de la traduire en réponse HTTP.
+"""
+
+import hashlib
+import secrets
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import Http404
+from rest_framework import status
+
+from elections import election_state, voter_index
+from elections.models import Election, ElectionVoterAssignment
+
+from . import idempotency, ingest
+from .models import Vote, VoteReceipt
+from .pgp_packets import check_recipients, PGPPacketError
+from .serializers import VoteSubmitSerializer
+
+
+class Refused(Exception):
+    """Réponse anticipée de la soumission (refus ou rejeu)"""
+
+    def __init__(self, status_code, data, headers=None):
+        super().__init__(status_code)
+        self.status_code = status_code
+        self.data = data
+        self.headers = headers or {}
+
+
+def not_assigned():
+    return Refused(status.HTTP_403_FORBIDDEN, {'error': 'Vous n\'êtes pas assigné à cette élection.'})
+
+
+def already_voted():
+    return Refused(status.HTTP_400_BAD_REQUEST, {'error': 'Vous avez déjà voté pour cette élection.'})
+
+
+def not_open():
+    return Refused(status.HTTP_400_BAD_REQUEST, {'error': 'Cette élection n\'est pas ouverte au vote.'})
+
+
+# ============= ÉTAPES COMMUNES =============
+
+def check_idempotency_key(idempotency_key):
+    if idempotency_key and len(idempotency_key) > idempotency.MAX_KEY_LENGTH:
+        raise Refused(status.HTTP_400_BAD_REQUEST, {'error': 'Idempotency-Key trop longue.'})
+
+
+def replay(stored, election_id):
+    """Lève la réponse d'origine d'une soumission déjà acceptée avec la même clé"""
+    if stored is None:
+        return
+
+    if str(stored['election_id']) != str(election_id):
+        raise Refused(status.HTTP_422_UNPROCESSABLE_ENTITY, {
+            'error': 'Idempotency-Key déjà utilisée pour une autre élection.'
+        })
+
+    raise Refused(status.HTTP_201_CREATED, stored['response'], {'Idempotent-Replayed': 'true'})
+
+
+def validate(payload):
+    """Validation du corps (taille et structure OpenPGP des messages)"""
+    serializer = VoteSubmitSerializer(data=payload)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def check_election(election, data):
+    """Élection ouverte, M1 chiffré pour le CO et M2 pour le DE"""
+    if election is None:
+        raise Http404
+
+    if not election.is_open:
+        raise not_open()
+
+    try:
+        check_recipients(data['m1_identity'], election.co_key_ids)
+    except PGPPacketError:
+        raise Refused(status.HTTP_400_BAD_REQUEST, {
+            'error': 'M1 n\'est pas chiffré avec la clé CO de cette élection.'
+        })
+    try:
+        check_recipients(data['m2_ballot'], election.de_key_ids)
+    except PGPPacketError:
+        raise Refused(status.HTTP_400_BAD_REQUEST, {
+            'error': 'M2 n\'est pas chiffré avec la clé DE de cette élection.'
+        })
+
+
+def check_indexed(indexed):
+    """
+    Refus immédiat si l'index électeurs sait que l'électeur a déjà voté
+
+    Une réponse négative n'est pas retenue (assignation postérieure à
+    l'index) : la réclamation en base tranche, et refuse() signale un
+    électeur non assigné.
+
+    Returns:
+        bool: True si l'électeur a déjà voté (à confirmer par un éventuel rejeu)
+    """
+    if indexed is None:
+        return False
+    is_assigned, has_voted = indexed
+    return is_assigned and has_voted
+
+
+def new_receipt_code(*parts):
+    return hashlib.sha256('-'.join([*map(str, parts), secrets.token_hex(16)]).encode()).hexdigest()
+
+
+# ============= VERSION SYNCHRONE =============
+
+def submit(voter, payload, idempotency_key=None):
+    """
+    Soumet un vote
+
+    Returns:
+        dict: Corps de la réponse 201
+
+    Raises:
+        Refused: Refus (ou rejeu d'une réponse enregistrée)
+    """
+    check_idempotency_key(idempotency_key)
+    if idempotency_key:
+        # Rejeu : ni validation OpenPGP ni réclamation du droit de vote
+        replay(idempotency.lookup(voter.id, idempotency_key), payload.get('election_id'))
+
+    data = validate(payload)
+    # État en mémoire (statut, empreintes des clés) : aucune requête Election
+    election = election_state.get_state(data['election_id'])
+    check_election(election, data)
+
+    if check_indexed(voter_index.lookup(election.id, voter.id)):
+        if idempotency_key:
+            replay(idempotency.lookup(voter.id, idempotency_key), election.id)
+        raise already_voted()
+
+    if settings.VOTE_INGEST_MODE:
+        log = ingest.get_log()
+        record = new_ingest_record(election, voter, data, idempotency_key)
+        segment = log.append(record)
+        try:
+            claimed = claim_ingested(record)
+        except Exception:
+            log.abort(record, segment)
+            raise
+        if not claimed:
+            log.abort(record, segment)
+            refuse(election.id, voter.id, idempotency_key)
+        return accept_ingested(log, record, segment)
+
+    return store(election.id, voter.id, data, idempotency_key)
+
+
+def claimable(election_id, voter_id):
+    """
+    Droit de vote encore réclamable : électeur assigné, pas encore voté,
+    élection ouverte selon la base. L'état en mémoire (election_state)
+    peut être en retard sur une fermeture faite par un autre worker :
+    c'est cette condition qui fait autorité.
+    """
+    return ElectionVoterAssignment.objects.filter(
+        election_id=election_id,
+        election__status='open',
+        voter_id=voter_id,
+        has_voted=False
+    )
+
+
+def claim(election_id, voter_id):
+    """
+    UPDATE conditionnel : deux soumissions simultanées ne peuvent pas
+    toutes deux passer has_voted de False à True
+    """
+    return claimable(election_id, voter_id).update(has_voted=True)
+
+
+def store(election_id, voter_id, data, idempotency_key=None):
+    """Une seule transaction : réclamation du droit de vote, vote et reçu"""
+    try:
+        with transaction.atomic():
+            if not claim(election_id, voter_id):
+                refuse(election_id, voter_id, idempotency_key)
+
+            # unique_id : unicité garantie par la contrainte (IntegrityError)
+            vote = Vote.objects.create(
+                election_id=election_id,
+                voter_id=voter_id,
+                m1_identity=data['m1_identity'],
+                m2_ballot=data['m2_ballot'],
+                unique_id=data['unique_id'],
+                status='pending_co'
+            )
+
+            receipt = VoteReceipt.objects.create(
+                vote=vote,
+                receipt_code=new_receipt_code(vote.id, vote.unique_id)
+            )
+
+            response_data = idempotency.response_data(vote.id, receipt.receipt_code, vote.unique_id)
+            if idempotency_key:
+                idempotency.remember(voter_id, idempotency_key, election_id, response_data)
+    except IntegrityError:
+        # Transaction annulée : has_voted est revenu à False
+        raise Refused(status.HTTP_400_BAD_REQUEST, {
+            'unique_id': ['Cet ID unique existe déjà. Veuillez réessayer.']
+        })
+
+    voter_index.mark_voted(election_id, voter_id)
+    return response_data
+
+
+def refuse(election_id, voter_id, idempotency_key=None):
+    """Réclamation refusée : élection fermée, électeur non assigné ou a déjà voté"""
+    # Même clé soumise deux fois en parallèle : la première a pu aboutir entre-temps
+    if idempotency_key:
+        replay(idempotency.lookup(voter_id, idempotency_key), election_id)
+
+    if not Election.objects.filter(pk=election_id, status='open').exists():
+        # État en mémoire périmé (fermeture par un autre worker) : relu en base
+        election_state.invalidate(election_id)
+        raise not_open()
+
+    if not ElectionVoterAssignment.objects.filter(election_id=election_id, voter_id=voter_id).exists():
+        raise not_assigned()
+    raise already_voted()
+
+
+def new_ingest_record(election, voter, data, idempotency_key):
+    # unique_id généré par le serveur : le reçu est rendu avant l'insertion,
+    # un unique_id client déjà pris ne serait découvert qu'au vidage
+    data = {**data, 'unique_id': str(uuid.uuid4())}
+    receipt_code = new_receipt_code(data['unique_id'])
+    return ingest.new_record(election.id, voter.id, data, receipt_code, idempotency_key)
+
+
+def ingested_response(record):
+    # vote_id inconnu tant que le vote n'est pas inséré (vidage suivant)
+    return idempotency.response_data(None, record['receipt_code'], record['unique_id'])
+
+
+def claim_ingested(record):
+    """
+    Mode ingestion différée : réclamation du droit de vote. Avec une
+    Idempotency-Key, la ligne SubmitIdempotencyKey est écrite dans la même
+    transaction : un renvoi traité par un autre worker la retrouve sans
+    attendre le vidage.
+    """
+    idempotency_key = record['idempotency_key']
+    if not idempotency_key:
+        return claim(record['election_id'], record['voter_id'])
+
+    with transaction.atomic():
+        if not claim(record['election_id'], record['voter_id']):
+            return 0
+        idempotency.remember(
+            record['voter_id'], idempotency_key, record['election_id'], ingested_response(record)
+        )
+    return 1
+
+
+def accept_ingested(log, record, segment):
+    """
+    Mode ingestion différée : vote journalisé et droit de vote réclamé ;
+    Vote et VoteReceipt seront insérés par lots
+    """
+    log.enqueue(record, segment)
+    voter_index.mark_voted(record['election_id'], record['voter_id'])
+    return ingested_response(record)
+
+
+# ============= VERSION ASYNCHRONE =============
+
+async def asubmit(voter, payload, idempotency_key=None):
+    """
+    submit() pour les vues asynchrones : validation et index dans la boucle
+    d'événements, base de données par l'ORM asynchrone de Django
+    """
+    check_idempotency_key(idempotency_key)
+    if idempotency_key:
+        replay(await idempotency.alookup(voter.id, idempotency_key), payload.get('election_id'))
+
+    data = validate(payload)
+    election = await election_state.aget_state(data['election_id'])
+    check_election(election, data)
+
+    if check_indexed(await voter_index.alookup(election.id, voter.id)):
+        if idempotency_key:
+            replay(await idempotency.alookup(voter.id, idempotency_key), election.id)
+        raise already_voted()
+
+    if settings.VOTE_INGEST_MODE:
+        log = ingest.get_log()
+        record = new_ingest_record(election, voter, data, idempotency_key)
+        # fsync groupé hors de la boucle, dans le pool de threads
+        segment = await sync_to_async(log.append, thread_sensitive=False)(record)
+        try:
+            claimed = await sync_to_async(claim_ingested)(record)
+        except Exception:
+            await sync_to_async(log.abort, thread_sensitive=False)(record, segment)
+            raise
+        if not claimed:
+            await sync_to_async(log.abort, thread_sensitive=False)(record, segment)
+            await sync_to_async(refuse)(election.id, voter.id, idempotency_key)
+        return await sync_to_async(accept_ingested)(log, record, segment)
+
+    # transaction.atomic n'a pas d'équivalent asynchrone
+    return await sync_to_async(store)(election.id, voter.id, data, idempotency_key)
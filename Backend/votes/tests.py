@@ -1,3 +1,570 @@
-from django.test import TestCase
+import io
+import json
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import resolve
+from django.utils import timezone
+import pgpy
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.models import User
+from elections import election_state, voter_index
+from elections.models import Election, ElectionVoterAssignment
+
+from . import admission, crypto_backends, crypto_utils, ingest, pdf_cache, pdf_utils, submission
+from .async_views import AsyncSubmitVoteView
+from .crypto_backends.gnupg_backend import GnuPGBackend, find_gpg_binary
+from .crypto_backends.pgpy_backend import PGPyBackend
+from .crypto_utils import encrypt_message
+from .models import SubmitIdempotencyKey, Vote, VoteReceipt
+from .pgp_packets import PGPPacketError, armor, check_recipients, inspect_message, key_identifiers, packets
+from .serializers import CiphertextField
+from .views import SubmitVoteView
+
+
+def create_election(**kwargs):
+    """Élection ouverte avec clés Curve25519 (génération rapide)"""
+    election = Election.objects.create(
+        title=kwargs.pop('title', 'Élection de test'),
+        description='Test',
+        start_date=timezone.now() - timedelta(hours=1),
+        end_date=timezone.now() + timedelta(days=1),
+        key_algorithm='curve25519',
+        status=kwargs.pop('status', 'open'),
+        **kwargs
+    )
+    election.ensure_encryption_keys()
+    # on_commit ne s'exécute pas dans un TestCase, et les ids sont réutilisés
+    # d'un test à l'autre : état et index en mémoire remis à zéro
+    election_state.invalidate(election.id)
+    voter_index.drop_index(election.id)
+    return election
+
+
+def create_voter(election=None, username=None):
+    voter = User.objects.create_user(
+        username=username or f'voter-{uuid.uuid4().hex[:8]}',
+        email=f'{uuid.uuid4().hex[:8]}@evote.test',
+        password='x',
+        role='voter',
+    )
+    if election is not None:
+        ElectionVoterAssignment.objects.create(election=election, voter=voter)
+    return voter
+
+
+def ballot(election, candidate_id=1):
+    """Corps de POST /api/votes/submit/ : M1 chiffré pour le CO, M2 pour le DE"""
+    linking_id = uuid.uuid4().hex
+    return {
+        'election_id': election.id,
+        'm1_identity': encrypt_message(json.dumps({'linking_id': linking_id}), election.co_public_key),
+        'm2_ballot': encrypt_message(
+            json.dumps({'linking_id': linking_id, 'candidate_id': candidate_id}), election.de_public_key
+        ),
+        'unique_id': str(uuid.uuid4()),
+    }
+
+
+def gpg_available():
+    try:
+        find_gpg_binary()
+    except RuntimeError:
+        return False
+    return True
+
+
+def auth_header(user):
+    return {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+
+class SubmitVoteCsrfTests(TestCase):
+    """Soumission authentifiée par JWT avec la protection CSRF active"""
+
+    def test_submit_with_csrf_checks(self):
+        election = create_election()
+        voter = create_voter(election)
+        client = Client(enforce_csrf_checks=True)
+
+        response = client.post(
+            '/api/votes/submit/',
+            json.dumps(ballot(election)),
+            content_type='application/json',
+            **auth_header(voter)
+        )
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertIn('receipt_code', response.json())
+        self.assertEqual(Vote.objects.filter(election=election, voter=voter).count(), 1)
+
+    def test_async_view_routed_by_default(self):
+        self.assertIs(resolve('/api/votes/submit/').func.view_class, AsyncSubmitVoteView)
+
+
+class ClosedElectionTests(TestCase):
+    """Fermeture faite par un autre worker : l'état en mémoire est encore 'open'"""
+
+    def setUp(self):
+        self.election = create_election()
+        self.voter = create_voter(self.election)
+        # État mis en mémoire, puis fermeture sans invalidation (autre processus)
+        self.assertTrue(election_state.get_state(self.election.id).is_open)
+        Election.objects.filter(pk=self.election.pk).update(status='closed')
+
+    def assert_refused(self, response):
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertIn('ouverte', response.json()['error'])
+        self.assertFalse(Vote.objects.filter(election=self.election).exists())
+        self.assertFalse(ElectionVoterAssignment.objects.get(voter=self.voter).has_voted)
+
+    def test_async_submit_refused(self):
+        response = self.client.post(
+            '/api/votes/submit/',
+            json.dumps(ballot(self.election)),
+            content_type='application/json',
+            **auth_header(self.voter)
+        )
+        self.assert_refused(response)
+
+    def test_sync_submit_refused(self):
+        with self.assertRaises(submission.Refused) as refused:
+            submission.submit(self.voter, ballot(self.election))
+        self.assertEqual(refused.exception.status_code, 400)
+        self.assertFalse(ElectionVoterAssignment.objects.get(voter=self.voter).has_voted)
+        # État relu en base après le refus
+        self.assertFalse(election_state.get_state(self.election.id).is_open)
+
+
+@override_settings(VOTER_INDEX_BACKEND='local')
+class LocalVoterIndexTests(TestCase):
+    """Index local construit avant une assignation faite par un autre worker"""
+
+    def setUp(self):
+        self.election = create_election()
+        create_voter(self.election)
+        voter_index.build_index(self.election.id)
+        # bulk_create : pas de signal, comme une assignation faite ailleurs
+        self.voter = create_voter()
+        ElectionVoterAssignment.objects.bulk_create([
+            ElectionVoterAssignment(election=self.election, voter=self.voter)
+        ])
+
+    def tearDown(self):
+        voter_index.drop_index(self.election.id)
+
+    def my_vote(self):
+        response = self.client.get(
+            f'/api/votes/my-vote/?election_id={self.election.id}', **auth_header(self.voter)
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_negative_confirmed_in_database(self):
+        self.assertEqual(self.my_vote(), {'has_voted': False, 'is_assigned': True})
+
+        response = self.client.post(
+            '/api/votes/submit/',
+            json.dumps(ballot(self.election)),
+            content_type='application/json',
+            **auth_header(self.voter)
+        )
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(self.my_vote(), {'has_voted': True, 'is_assigned': True})
+
+    def test_vote_from_other_worker(self):
+        ElectionVoterAssignment.objects.filter(voter=self.voter).update(has_voted=True)
+        self.assertEqual(self.my_vote(), {'has_voted': True, 'is_assigned': True})
+
+
+class IngestFlushTests(TestCase):
+    """Mode ingestion : votes acceptés puis insérés par le vidage"""
+
+    def setUp(self):
+        self.election = create_election()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # Vidage déclenché par le test uniquement
+        self.log = ingest.IngestLog(directory.name, batch_size=100, flush_interval=3600)
+        self.addCleanup(self.log.close)
+
+    def accept(self, voter, data, idempotency_key=None):
+        record = submission.new_ingest_record(
+            self.election, voter, submission.validate(data), idempotency_key
+        )
+        segment = self.log.append(record)
+        self.assertEqual(submission.claim_ingested(record), 1)
+        return submission.accept_ingested(self.log, record, segment)
+
+    def test_client_unique_id_conflict(self):
+        data = ballot(self.election)
+        voters = [create_voter(self.election), create_voter(self.election)]
+        receipts = [self.accept(voter, data) for voter in voters]
+
+        self.assertEqual(self.log.flush(), 2)
+
+        for voter, receipt in zip(voters, receipts):
+            vote = Vote.objects.get(voter=voter)
+            self.assertEqual(vote.unique_id, receipt['unique_id'])
+            self.assertEqual(VoteReceipt.objects.get(vote=vote).receipt_code, receipt['receipt_code'])
+            self.assertTrue(ElectionVoterAssignment.objects.get(voter=voter).has_voted)
+        self.assertNotEqual(receipts[0]['unique_id'], data['unique_id'])
+
+    def test_submitted_at_kept(self):
+        voter = create_voter(self.election)
+        self.accept(voter, ballot(self.election))
+        submitted_at = self.log._queue[0][0]['submitted_at']
+
+        self.log.flush()
+
+        self.assertEqual(Vote.objects.get(voter=voter).submitted_at.isoformat(), submitted_at)
+
+    def test_replay_from_other_worker(self):
+        voter = create_voter(self.election)
+        data = ballot(self.election)
+        receipt = self.accept(voter, data, idempotency_key='retry-1')
+        # Autre worker : cache local vide, vote pas encore inséré
+        cache.clear()
+
+        with self.assertRaises(submission.Refused) as replayed:
+            submission.submit(voter, data, idempotency_key='retry-1')
+
+        self.assertEqual(replayed.exception.status_code, 201)
+        self.assertEqual(replayed.exception.data, receipt)
+        self.assertEqual(replayed.exception.headers, {'Idempotent-Replayed': 'true'})
+
+        self.log.flush()
+        self.assertEqual(SubmitIdempotencyKey.objects.get(voter=voter).response, receipt)
+
+
+class IngestReplayTests(TestCase):
+    """Rejeu des segments laissés par un processus arrêté"""
+
+    def setUp(self):
+        self.election = create_election()
+        self.voter = create_voter(self.election)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        # Droit de vote réclamé avant l'arrêt du processus
+        ElectionVoterAssignment.objects.filter(voter=self.voter).update(has_voted=True)
+
+    def record(self, voter=None, unique_id=None):
+        data = submission.validate(ballot(self.election))
+        if unique_id:
+            data['unique_id'] = unique_id
+        return ingest.new_record(
+            self.election.id, (voter or self.voter).id, data, submission.new_receipt_code('test'), None
+        )
+
+    def write_segment(self, records, name='ingest-999999-dead-000001.log'):
+        path = f'{self.directory}/{name}'
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+        return path
+
+    def assert_single_vote(self):
+        self.assertEqual(Vote.objects.filter(voter=self.voter).count(), 1)
+        self.assertTrue(ElectionVoterAssignment.objects.get(voter=self.voter).has_voted)
+
+    def test_replay_twice(self):
+        path = self.write_segment([self.record()])
+
+        self.assertEqual(ingest.replay([path]), 1)
+        # Segment déjà pris (et supprimé) par le premier rejeu
+        self.assertEqual(ingest.replay([path]), 0)
+
+        self.assert_single_vote()
+        self.assertEqual(ingest.orphan_segments(self.directory, everything=True), [])
+
+    def test_store_existing_vote(self):
+        # Deux rejeux qui ont lu le même segment avant l'insertion
+        record = self.record()
+        ingest.store_votes([record])
+        self.assertEqual(ingest.store_votes([record]), [])
+        self.assert_single_vote()
+
+    def test_conflict_when_voter_has_vote(self):
+        ingest.store_votes([self.record()])
+        other = create_voter(self.election)
+        ingest.store_votes([self.record(voter=other, unique_id='pris')])
+
+        # unique_id d'un autre électeur, mais celui-ci a déjà un vote en base
+        self.assertEqual(ingest.store_votes([self.record(unique_id='pris')]), [])
+        self.assert_single_vote()
+
+    def test_conflict_with_other_voter(self):
+        other = create_voter(self.election)
+        ingest.store_votes([self.record(voter=other, unique_id='pris')])
+
+        self.assertEqual(ingest.store_votes([self.record(unique_id='pris')]), [])
+
+        self.assertFalse(Vote.objects.filter(voter=self.voter).exists())
+        self.assertFalse(ElectionVoterAssignment.objects.get(voter=self.voter).has_voted)
+
+
+class PGPPacketTests(SimpleTestCase):
+    """Validation des messages chiffrés soumis, sans clé privée"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.keys = crypto_utils.generate_keypair('Élection', 'election@evote.local', algorithm='curve25519')
+        cls.foreign_keys = crypto_utils.generate_keypair('Autre', 'autre@evote.local', algorithm='curve25519')
+        cls.allowed = key_identifiers(cls.keys['public_key'])
+        cls.armored = encrypt_message('{"candidate_id": 1}', cls.keys['public_key'])
+
+    def test_armored_and_binary_accepted(self):
+        binary = packets(self.armored)
+        self.assertIsInstance(binary, bytes)
+
+        for message in (self.armored, binary):
+            check_recipients(message, self.allowed)
+            self.assertEqual(CiphertextField().to_internal_value(message), binary)
+
+    def test_bad_crc24(self):
+        data = packets(self.armored)
+        lines = armor(data).splitlines()
+        checksum = next(index for index, line in enumerate(lines) if line.startswith('='))
+        lines[checksum] = '=AAAA' if lines[checksum] != '=AAAA' else '=AAAB'
+        corrupted = '\n'.join(lines)
+
+        with self.assertRaisesRegex(PGPPacketError, 'CRC24'):
+            inspect_message(corrupted)
+        with self.assertRaises(serializers.ValidationError):
+            CiphertextField().to_internal_value(corrupted)
+
+    def test_truncated_packet(self):
+        with self.assertRaisesRegex(PGPPacketError, 'tronqu'):
+            inspect_message(packets(self.armored)[:-10])
+
+    def test_password_encrypted(self):
+        message = pgpy.PGPMessage.new('{"candidate_id": 1}').encrypt('mot de passe')
+
+        with self.assertRaisesRegex(PGPPacketError, 'mot de passe'):
+            inspect_message(str(message))
+
+    def test_foreign_key(self):
+        message = encrypt_message('{"candidate_id": 1}', self.foreign_keys['public_key'])
+
+        inspect_message(message)
+        with self.assertRaisesRegex(PGPPacketError, 'clé inconnue'):
+            check_recipients(message, self.allowed)
+
+
+class ConcurrentDecryptTests(SimpleTestCase):
+    """decrypt_many appelé depuis plusieurs threads du même processus"""
+
+    threads = 8
+    per_thread = 20
+
+    def check_backend(self, backend):
+        with mock.patch.object(crypto_backends, '_backend', backend):
+            keys = crypto_utils.generate_keypair('Test', 'test@evote.local', algorithm='curve25519')
+            batches = [
+                [json.dumps({'thread': thread, 'index': index}) for index in range(self.per_thread)]
+                for thread in range(self.threads)
+            ]
+            encrypted = [
+                [encrypt_message(plaintext, keys['public_key']) for plaintext in batch]
+                for batch in batches
+            ]
+            # Un message invalide par lot : l'erreur reste à sa place
+            for batch in encrypted:
+                batch.insert(len(batch) // 2, 'pas un message OpenPGP')
+
+            with ThreadPoolExecutor(max_workers=self.threads) as executor:
+                results = list(executor.map(
+                    lambda batch: crypto_utils.decrypt_many(batch, keys['private_key'], workers=1),
+                    encrypted
+                ))
+
+        for batch, batch_results in zip(batches, results):
+            self.assertEqual(len(batch_results), self.per_thread + 1)
+            failed = batch_results.pop(self.per_thread // 2)
+            self.assertFalse(failed['ok'])
+            self.assertEqual([result['plaintext'] for result in batch_results], batch)
+
+    def test_pgpy(self):
+        self.check_backend(PGPyBackend())
+
+    @override_settings(CRYPTO_DECRYPT_WORKERS=2)
+    def test_process_pool(self):
+        # Processus démarrés par forkserver / spawn : backend par défaut (PGPy)
+        keys = crypto_utils.generate_keypair('Test', 'test@evote.local', algorithm='curve25519')
+        plaintexts = [str(index) for index in range(crypto_utils.DECRYPT_MANY_MIN_PARALLEL * 2)]
+        encrypted = [encrypt_message(plaintext, keys['public_key']) for plaintext in plaintexts]
+
+        for _ in range(2):
+            results = crypto_utils.decrypt_many(encrypted, keys['private_key'], workers=2)
+            self.assertEqual([result['plaintext'] for result in results], plaintexts)
+
+        pool = crypto_utils.get_decrypt_pool()
+        # Un seul pool par processus, réutilisé d'un appel à l'autre
+        self.assertIs(crypto_utils.get_decrypt_pool(), pool)
+        self.assertNotEqual(pool._mp_context.get_start_method(), 'fork')
+
+    @skipUnless(gpg_available(), "binaire gpg introuvable")
+    def test_gnupg(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(GPG_KEYRING_DIR=root):
+            backend = GnuPGBackend()
+            try:
+                self.check_backend(backend)
+            finally:
+                backend._shutdown()
+
+
+class ConcurrentSubmitTests(TransactionTestCase):
+    """Soumissions simultanées d'un même électeur : un seul vote enregistré"""
+
+    attempts = 8
+
+    def setUp(self):
+        self.election = create_election()
+        self.voter = create_voter(self.election)
+
+    def submit_all(self, payloads):
+        barrier = threading.Barrier(len(payloads))
+        outcomes = []
+
+        def run(payload):
+            try:
+                barrier.wait()
+                submission.submit(self.voter, payload)
+                outcomes.append(201)
+            except submission.Refused as refused:
+                outcomes.append(refused.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run, args=(payload,)) for payload in payloads]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_single_vote(self):
+        outcomes = self.submit_all([ballot(self.election) for _ in range(self.attempts)])
+
+        self.assertEqual(sorted(outcomes), [201] + [400] * (self.attempts - 1))
+        self.assertEqual(Vote.objects.filter(election=self.election, voter=self.voter).count(), 1)
+        self.assertEqual(VoteReceipt.objects.filter(vote__voter=self.voter).count(), 1)
+        self.assertTrue(ElectionVoterAssignment.objects.get(voter=self.voter).has_voted)
+
+
+@override_settings(
+    VOTE_ADMISSION_RATES={'submit': (1, 1), 'public_keys': (1, 1)},
+    VOTE_ADMISSION_MAX_WAIT=0,
+)
+class AdmissionThrottleTests(TestCase):
+    """Seau d'une élection vide : 429 avec Retry-After, sans attente"""
+
+    def setUp(self):
+        self.election = create_election()
+        self.voter = create_voter(self.election)
+        # Seaux propres au processus, ids d'élection réutilisés d'un test à l'autre
+        admission.forget_election(self.election.id)
+        self.addCleanup(admission.forget_election, self.election.id)
+
+    def assert_throttled(self, response):
+        self.assertEqual(response.status_code, 429, response.content)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_drf_submit(self):
+        view = SubmitVoteView.as_view()
+
+        def post():
+            request = APIRequestFactory().post('/api/votes/submit/', ballot(self.election), format='json')
+            force_authenticate(request, user=self.voter)
+            return view(request).render()
+
+        self.assertEqual(post().status_code, 201)
+        # Refusé par le throttle, avant la vérification du double vote (400)
+        self.assert_throttled(post())
+        self.assertEqual(admission.get_bucket('submit', self.election.id).stats()['rejected'], 1)
+
+    def test_async_public_keys(self):
+        url = f'/api/elections/{self.election.id}/public_keys/'
+
+        self.assertEqual(self.client.get(url, **auth_header(self.voter)).status_code, 200)
+        self.assert_throttled(self.client.get(url, **auth_header(self.voter)))
+
+
+class PDFCacheTests(TestCase):
+    """PDF M1 / M2 rendus au premier téléchargement puis relus sur disque"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(VOTE_PDF_CACHE_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        election = create_election()
+        voter = create_voter(election)
+        vote_id = submission.submit(voter, ballot(election))['vote_id']
+        self.vote = Vote.objects.select_related('election').get(pk=vote_id)
+        self.co = User.objects.create_user(
+            username=f'co-{uuid.uuid4().hex[:8]}', email=f'{uuid.uuid4().hex[:8]}@evote.test',
+            password='x', role='co',
+        )
+
+    def download(self, kind):
+        response = self.client.get(f'/api/votes/{self.vote.id}/download-{kind}/', **auth_header(self.co))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content)[:4], b'%PDF')
+
+    def test_second_download_reuses_pdf(self):
+        renderer = mock.Mock(wraps=pdf_utils.generate_m2_pdf)
+        with mock.patch.dict(pdf_cache.RENDERERS, {'m2': renderer}):
+            self.download('m2')
+            path = pdf_cache.get_pdf('m2', self.vote)
+            self.download('m2')
+
+        self.assertEqual(renderer.call_count, 1)
+        self.assertTrue(path.exists())
+        self.assertEqual(pdf_cache.get_pdf('m2', self.vote), path)
+
+    def test_approval_changes_key(self):
+        before = pdf_cache.get_pdf('m2', self.vote)
+
+        self.vote.status = 'pending_de'
+        self.vote.co_verified_at = timezone.now()
+        self.vote.save()
+
+        after = pdf_cache.get_pdf('m2', self.vote)
+        self.assertNotEqual(after, before)
+        self.assertTrue(after.exists())
+
+    def test_concurrent_render_once(self):
+        def render(vote):
+            time.sleep(0.2)
+            return io.BytesIO(b'%PDF-test')
+
+        renderer = mock.Mock(side_effect=render)
+        barrier = threading.Barrier(5)
+
+        def get_pdf():
+            barrier.wait()
+            return pdf_cache.get_pdf('m1', self.vote)
+
+        with mock.patch.dict(pdf_cache.RENDERERS, {'m1': renderer}):
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                paths = list(executor.map(lambda _: get_pdf(), range(5)))
+
+        self.assertEqual(renderer.call_count, 1)
+        self.assertEqual(len(set(paths)), 1)
+        self.assertEqual(paths[0].read_bytes(), b'%PDF-test')
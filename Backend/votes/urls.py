@@ -1,6 +1,8 @@
 
 
+from django.conf import settings
 from django.urls import path
+from .async_views import AsyncSubmitVoteView, AsyncMyVoteStatusView, AsyncVoteReceiptView
 from .views import (
     # Voter endpoints
     SubmitVoteView,
@@ -9,7 +11,11 @@ from .views import (
     
     # CO endpoints - NOUVEAUX
     COElectionVotesView,
+    COVoteCiphertextView,
     COApproveVoteView,
+    COApproveBatchView,
+    COApprovalJobView,
+    COApprovalJobStatusView,
     CORejectVoteView,
     CODownloadM2PDFView,
     
@@ -25,22 +31,36 @@ from .views import (
     # PDF Downloads
     DownloadM1PDFView,
     DownloadM2PDFView,
+    
+    # Supervision
+    CryptoKeyCacheStatsView,
+    AdmissionStatsView,
 )
 
 app_name = 'votes'
 
+# Vues électeurs asynchrones (ASGI) ou DRF synchrones
+if settings.VOTER_ASYNC_VIEWS:
+    SubmitView, MyVoteView, ReceiptView = AsyncSubmitVoteView, AsyncMyVoteStatusView, AsyncVoteReceiptView
+else:
+    SubmitView, MyVoteView, ReceiptView = SubmitVoteView, MyVoteStatusView, VoteReceiptView
+
 urlpatterns = [
     # ==================== VOTER ENDPOINTS ====================
-    path('submit/', SubmitVoteView.as_view(), name='submit-vote'),
-    path('my-vote/', MyVoteStatusView.as_view(), name='my-vote-status'),
-    path('receipt/', VoteReceiptView.as_view(), name='vote-receipt'),
+    path('submit/', SubmitView.as_view(), name='submit-vote'),
+    path('my-vote/', MyVoteView.as_view(), name='my-vote-status'),
+    path('receipt/', ReceiptView.as_view(), name='vote-receipt'),
     
     # ==================== CO ENDPOINTS (NOUVEAUX) ====================
     # ✅ Route principale pour le nouveau workflow CO
     path('co/election/<int:election_id>/', COElectionVotesView.as_view(), name='co-election-votes'),
     path('co/approve/', COApproveVoteView.as_view(), name='co-approve-vote'),
+    path('co/approve-batch/', COApproveBatchView.as_view(), name='co-approve-batch'),
+    path('co/approve-jobs/', COApprovalJobView.as_view(), name='co-approval-jobs'),
+    path('co/approve-jobs/<int:job_id>/', COApprovalJobStatusView.as_view(), name='co-approval-job-status'),
     path('co/reject/', CORejectVoteView.as_view(), name='co-reject-vote'),
     path('co/<int:vote_id>/download-m2/', CODownloadM2PDFView.as_view(), name='co-download-m2-pdf'),
+    path('co/<int:vote_id>/ciphertext/', COVoteCiphertextView.as_view(), name='co-vote-ciphertext'),
     
     # ==================== CO ENDPOINTS (ANCIENS - Compatibilité) ====================
     # ⚠️ DÉPRÉCIÉ mais gardé pour compatibilité
@@ -55,4 +75,8 @@ urlpatterns = [
     # ==================== PDF DOWNLOADS ====================
     path('<int:vote_id>/download-m1/', DownloadM1PDFView.as_view(), name='download-m1-pdf'),
     path('<int:vote_id>/download-m2/', DownloadM2PDFView.as_view(), name='download-m2-pdf'),
+    
+    # ==================== SUPERVISION ====================
+    path('crypto/key-cache/', CryptoKeyCacheStatsView.as_view(), name='crypto-key-cache-stats'),
+    path('admission/', AdmissionStatsView.as_view(), name='admission-stats'),
 ]
\ No newline at end of file
@@ -3,26 +3,22 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.conf import settings
 from django.http import FileResponse
 from django.db.models import Count
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import cm
-import hashlib
-import secrets
 import json
-import io
 import os
 
-from .models import Vote, DecryptedBallot, VoteReceipt
+from . import approval_jobs, co_approval, leases, pdf_cache, submission
+from .admission import ElectionAdmissionThrottle, admission_stats
+from .models import Vote, DecryptedBallot, VoteReceipt, COApprovalJob
+from .parsers import ballot_parsers
 from .serializers import (
-    VoteSubmitSerializer,
     VoteSerializer,
-    COVoteVerificationSerializer,
-    DecryptedBallotSerializer,
-    DEBallotDecryptSerializer,
-    VoteReceiptSerializer
+    COVoteListSerializer,
+    COVoteCiphertextSerializer
 )
+from elections import voter_index
 from elections.models import Election, ElectionVoterAssignment
 from candidates.models import Candidate
 
@@ -32,8 +28,17 @@ from candidates.models import Candidate
 class SubmitVoteView(APIView):
     """
     POST /api/votes/submit/ - Submit an encrypted vote
+    
+    En-tête facultatif Idempotency-Key : une requête renvoyée avec la même
+    clé reçoit la réponse d'origine (vote_id, receipt_code).
+    
+    Corps JSON (M1 / M2 en armure ASCII), multipart/form-data ou
+    application/msgpack (M1 / M2 en paquets OpenPGP binaires).
     """
     permission_classes = [permissions.IsAuthenticated]
+    parser_classes = ballot_parsers()
+    throttle_classes = [ElectionAdmissionThrottle]
+    admission_scope = 'submit'
     
     def post(self, request):
         if request.user.role != 'voter':
@@ -41,62 +46,16 @@ class SubmitVoteView(APIView):
                 'error': 'Seuls les électeurs peuvent voter.'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        serializer = VoteSubmitSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        
-        election_id = serializer.validated_data['election_id']
-        election = get_object_or_404(Election, pk=election_id)
-        
-        if election.status != 'open':
-            return Response({
-                'error': 'Cette élection n\'est pas ouverte au vote.'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        assignment = ElectionVoterAssignment.objects.filter(
-            election=election,
-            voter=request.user
-        ).first()
-        
-        if not assignment:
-            return Response({
-                'error': 'Vous n\'êtes pas assigné à cette élection.'
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        if assignment.has_voted:
-            return Response({
-                'error': 'Vous avez déjà voté pour cette élection.'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Create vote
-        vote = Vote.objects.create(
-            election=election,
-            voter=request.user,
-            m1_identity=serializer.validated_data['m1_identity'],
-            m2_ballot=serializer.validated_data['m2_ballot'],
-            unique_id=serializer.validated_data['unique_id'],
-            status='pending_co'
-        )
-        
-        # Mark voter as having voted
-        assignment.has_voted = True
-        assignment.save()
-        
-        # Generate receipt
-        receipt_code = hashlib.sha256(
-            f"{vote.id}-{vote.unique_id}-{secrets.token_hex(16)}".encode()
-        ).hexdigest()
-        
-        receipt = VoteReceipt.objects.create(
-            vote=vote,
-            receipt_code=receipt_code
-        )
+        try:
+            response_data = submission.submit(
+                request.user,
+                request.data,
+                idempotency_key=request.headers.get('Idempotency-Key') or None
+            )
+        except submission.Refused as refusal:
+            return Response(refusal.data, status=refusal.status_code, headers=refusal.headers)
         
-        return Response({
-            'message': 'Vote soumis avec succès.',
-            'vote_id': vote.id,
-            'receipt_code': receipt.receipt_code,
-            'unique_id': vote.unique_id
-        }, status=status.HTTP_201_CREATED)
+        return Response(response_data, status=status.HTTP_201_CREATED)
 
 
 class MyVoteStatusView(APIView):
@@ -117,6 +76,15 @@ class MyVoteStatusView(APIView):
                 'error': 'election_id est requis.'
             }, status=status.HTTP_400_BAD_REQUEST)
         
+        if election_id.isdigit():
+            indexed = voter_index.lookup(int(election_id), request.user.id)
+            if indexed is not None:
+                is_assigned, has_voted = indexed
+                return Response({
+                    'has_voted': has_voted and is_assigned,
+                    'is_assigned': is_assigned
+                })
+        
         assignment = ElectionVoterAssignment.objects.filter(
             election_id=election_id,
             voter=request.user
@@ -171,10 +139,32 @@ class VoteReceiptView(APIView):
 
 # ==================== CO ENDPOINTS (NOUVEAUX) ====================
 
+def vote_in_progress():
+    """Vote réclamé par un worker ou un autre opérateur (voir votes.leases)"""
+    return Response({
+        'error': 'Ce vote est en cours de traitement'
+    }, status=status.HTTP_409_CONFLICT)
+
+
+# Onglets du tableau de bord CO : statuts regroupés
+CO_VOTE_BUCKETS = {
+    'pending': ['pending_co'],
+    'approved': ['pending_de', 'counted'],
+    'rejected': ['rejected_co'],
+}
+
+
 class COElectionVotesView(APIView):
     """
     GET /api/votes/co/election/<election_id>/
-    Liste tous les votes d'une élection pour le CO
+    Votes d'une élection pour le CO, par page et par onglet
+    
+    Paramètres :
+        status : pending, approved ou rejected (défaut : première page des trois)
+        before : curseur 'next' de la page précédente (votes plus anciens)
+        limit  : votes par page (défaut CO_VOTES_PAGE_SIZE, max CO_VOTES_PAGE_MAX)
+    
+    Sans messages chiffrés : voir COVoteCiphertextView
     """
     permission_classes = [permissions.IsAuthenticated]
     
@@ -184,36 +174,92 @@ class COElectionVotesView(APIView):
                 'error': 'Accès réservé au CO'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        election = get_object_or_404(Election, pk=election_id)
-        votes = Vote.objects.filter(election=election).select_related('voter', 'election')
+        bucket = request.query_params.get('status')
+        if bucket is not None and bucket not in CO_VOTE_BUCKETS:
+            return Response({
+                'error': f"status doit valoir {', '.join(CO_VOTE_BUCKETS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            before = request.query_params.get('before')
+            before = int(before) if before else None
+            limit = int(request.query_params.get('limit') or settings.CO_VOTES_PAGE_SIZE)
+        except ValueError:
+            return Response({
+                'error': 'before et limit doivent être des entiers'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, settings.CO_VOTES_PAGE_MAX))
         
-        # Séparer par statut
-        pending_votes = votes.filter(status='pending_co')
-        approved_votes = votes.filter(status__in=['pending_de', 'counted'])
-        rejected_votes = votes.filter(status='rejected_co')
+        election = get_object_or_404(Election.objects.only('id', 'title', 'status'), pk=election_id)
         
-        return Response({
+        data = {
             'election': {
                 'id': election.id,
                 'title': election.title,
                 'status': election.status,
             },
-            'pending': VoteSerializer(pending_votes, many=True).data,
-            'approved': VoteSerializer(approved_votes, many=True).data,
-            'rejected': VoteSerializer(rejected_votes, many=True).data,
-            'stats': {
-                'total': votes.count(),
-                'pending': pending_votes.count(),
-                'approved': approved_votes.count(),
-                'rejected': rejected_votes.count(),
-            }
-        })
+            'next': {},
+            'stats': self.stats(election.id),
+        }
+        
+        for name in [bucket] if bucket else CO_VOTE_BUCKETS:
+            votes = (
+                Vote.objects.filter(election_id=election.id, status__in=CO_VOTE_BUCKETS[name])
+                .select_related('voter')
+                .only(*COVoteListSerializer.LIST_FIELDS)
+                .order_by('-pk')
+            )
+            if before is not None:
+                votes = votes.filter(pk__lt=before)
+            
+            # Un vote de plus : existence d'une page suivante
+            page = list(votes[:limit + 1])
+            data['next'][name] = page[limit - 1].pk if len(page) > limit else None
+            data[name] = COVoteListSerializer(page[:limit], many=True).data
+        
+        return Response(data)
+    
+    @staticmethod
+    def stats(election_id):
+        # Un seul GROUP BY status (order_by() : sans le tri par défaut du modèle)
+        counts = dict(
+            Vote.objects.filter(election_id=election_id)
+            .order_by()
+            .values_list('status')
+            .annotate(count=Count('pk'))
+        )
+        stats = {
+            name: sum(counts.get(vote_status, 0) for vote_status in statuses)
+            for name, statuses in CO_VOTE_BUCKETS.items()
+        }
+        stats['total'] = sum(counts.values())
+        return stats
+
+
+class COVoteCiphertextView(APIView):
+    """
+    GET /api/votes/co/<vote_id>/ciphertext/
+    Messages chiffrés M1 / M2 d'un vote (armure ASCII), chargés à l'ouverture du vote
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, vote_id):
+        if request.user.role != 'co':
+            return Response({
+                'error': 'Accès réservé au CO'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        vote = get_object_or_404(
+            Vote.objects.only('id', 'election_id', 'unique_id', 'm1_identity', 'm2_ballot'),
+            pk=vote_id
+        )
+        return Response(COVoteCiphertextSerializer(vote).data)
 
 
 class COApproveVoteView(APIView):
     """
     POST /api/votes/co/approve/
-     Approuver un vote et générer le PDF M2
+     Approuver un vote (PDF M2 rendu au premier téléchargement)
     """
     permission_classes = [permissions.IsAuthenticated]
     
@@ -231,121 +277,162 @@ class COApproveVoteView(APIView):
                 'error': 'Ce vote a déjà été traité'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Déchiffrer M1 pour extraire le linking_id
-        from votes.crypto_utils import decrypt_message
-        
-        try:
-            election = vote.election
-            decrypted_m1 = decrypt_message(vote.m1_identity, election.co_private_key)
-            identity_data = json.loads(decrypted_m1)
+        with leases.hold('co', vote.pk) as held:
+            if not held:
+                return vote_in_progress()
             
-            linking_id = identity_data.get('linking_id')
+            # Déchiffrer M1 pour extraire le linking_id
+            from votes.crypto_utils import decrypt_election_message
             
-            if not linking_id:
+            try:
+                election = vote.election
+                decrypted_m1 = decrypt_election_message(election, 'co', vote.m1_identity)
+                identity_data = json.loads(decrypted_m1)
+                
+                linking_id = identity_data.get('linking_id')
+                
+                if not linking_id:
+                    return Response({
+                        'error': 'linking_id manquant dans M1'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                
+                # Stocker le linking_id
+                vote.linking_id = linking_id
+                vote.status = 'pending_de'
+                vote.co_verified_at = timezone.now()
+                vote.co_verified_by = request.user
+                vote.save()
+                
                 return Response({
-                    'error': 'linking_id manquant dans M1'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Stocker le linking_id
-            vote.linking_id = linking_id
-            vote.status = 'pending_de'
-            vote.co_verified_at = timezone.now()
-            vote.co_verified_by = request.user
-            
-            # Générer le PDF M2
-            pdf_file = self.generate_m2_pdf(vote)
-            vote.m2_pdf = pdf_file
-            vote.save()
-            
+                    'message': 'Vote approuvé avec succès',
+                    'vote': VoteSerializer(vote).data
+                })
+                
+            except Exception as e:
+                return Response({
+                    'error': f'Erreur lors du traitement: {str(e)}'
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def approval_selection(request):
+    """
+    Votes à approuver d'un corps {"vote_ids": [...]} ou {"election_id": X}
+
+    Returns:
+        tuple: (vote_ids sans doublon ou None, election_id ou None, Response d'erreur ou None)
+    """
+    vote_ids = request.data.get('vote_ids')
+    election_id = request.data.get('election_id')
+    max_votes = settings.CO_APPROVE_BATCH_MAX_VOTES
+
+    if (vote_ids is None) == (election_id is None):
+        return None, None, Response({
+            'error': 'vote_ids ou election_id est requis (l\'un ou l\'autre)'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if election_id is not None:
+        election = get_object_or_404(Election.objects.only('id'), pk=election_id)
+        return None, election.id, None
+
+    if not isinstance(vote_ids, list) or not all(
+        isinstance(vote_id, int) and not isinstance(vote_id, bool) for vote_id in vote_ids
+    ):
+        return None, None, Response({
+            'error': 'vote_ids doit être une liste d\'identifiants'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    # Sans doublon, ordre conservé
+    vote_ids = list(dict.fromkeys(vote_ids))
+    if len(vote_ids) > max_votes:
+        return None, None, Response({
+            'error': f'Au plus {max_votes} votes par appel'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    return vote_ids, None, None
+
+
+class COApproveBatchView(APIView):
+    """
+    POST /api/votes/co/approve-batch/
+    Approuver plusieurs votes en un appel (voir votes.co_approval)
+
+    Corps : {"vote_ids": [1, 2, ...]} ou {"election_id": X} (votes en attente
+    de l'élection, au plus CO_APPROVE_BATCH_MAX_VOTES par appel ; 'remaining'
+    indique s'il faut rappeler l'endpoint).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role != 'co':
             return Response({
-                'message': 'Vote approuvé avec succès',
-                'vote': VoteSerializer(vote).data
-            })
-            
-        except Exception as e:
+                'error': 'Accès réservé au CO'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        vote_ids, election_id, error = approval_selection(request)
+        if error:
+            return error
+
+        if election_id is not None:
+            vote_ids = co_approval.pending_vote_ids(election_id, settings.CO_APPROVE_BATCH_MAX_VOTES)
+
+        results = co_approval.approve_votes(request.user, vote_ids)
+
+        remaining = None
+        if election_id is not None:
+            remaining = Vote.objects.filter(election_id=election_id, status='pending_co').count()
+
+        return Response({
+            'results': results,
+            'summary': co_approval.summarize(results),
+            'remaining': remaining,
+        })
+
+
+class COApprovalJobView(APIView):
+    """
+    POST /api/votes/co/approve-jobs/
+    Approuver en arrière-plan (voir votes.approval_jobs) : réponse immédiate,
+    votes traités par `python manage.py run_approval_worker`
+
+    Corps : {"vote_ids": [1, 2, ...]} ou {"election_id": X} (tous les votes
+    en attente de l'élection, sans limite)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role != 'co':
             return Response({
-                'error': f'Erreur lors du traitement: {str(e)}'
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
-    def generate_m2_pdf(self, vote):
-        """ Génère le PDF M2 avec le bulletin chiffré"""
-        buffer = io.BytesIO()
-        p = canvas.Canvas(buffer, pagesize=A4)
-        width, height = A4
-        
-        # En-tête
-        p.setFont("Helvetica-Bold", 20)
-        p.drawCentredString(width/2, height - 3*cm, "🗳️ BULLETIN DE VOTE CHIFFRÉ (M2)")
-        
-        # Ligne de séparation
-        p.setStrokeColorRGB(0.2, 0.4, 0.8)
-        p.setLineWidth(2)
-        p.line(3*cm, height - 4*cm, width - 3*cm, height - 4*cm)
-        
-        # Informations
-        p.setFont("Helvetica-Bold", 12)
-        y = height - 6*cm
-        
-        p.drawString(3*cm, y, "ID du Vote:")
-        p.setFont("Helvetica", 12)
-        p.drawString(8*cm, y, str(vote.unique_id))
-        
-        y -= 1*cm
-        p.setFont("Helvetica-Bold", 12)
-        p.drawString(3*cm, y, "Date de soumission:")
-        p.setFont("Helvetica", 12)
-        p.drawString(8*cm, y, vote.submitted_at.strftime('%d/%m/%Y %H:%M:%S'))
-        
-        y -= 1*cm
-        p.setFont("Helvetica-Bold", 12)
-        p.drawString(3*cm, y, "Votant:")
-        p.setFont("Helvetica", 12)
-        p.drawString(8*cm, y, vote.voter_full_name)
-        
-        y -= 1*cm
-        p.setFont("Helvetica-Bold", 12)
-        p.drawString(3*cm, y, "Élection:")
-        p.setFont("Helvetica", 12)
-        p.drawString(8*cm, y, vote.election.title)
-        
-        # Séparation
-        y -= 1.5*cm
-        p.setStrokeColorRGB(0.8, 0.8, 0.8)
-        p.line(3*cm, y, width - 3*cm, y)
-        
-        # Message chiffré M2
-        y -= 1*cm
-        p.setFont("Helvetica-Bold", 14)
-        p.drawString(3*cm, y, "BULLETIN CHIFFRÉ (M2):")
-        
-        y -= 1*cm
-        p.setFont("Courier", 8)
-        
-        # Afficher le message chiffré
-        m2_lines = vote.m2_ballot.split('\n')
-        for line in m2_lines[:35]:
-            if y < 4*cm:
-                break
-            p.drawString(3*cm, y, line[:85])
-            y -= 0.45*cm
-        
-        # Note en bas de page
-        y = 3*cm
-        p.setFont("Helvetica-Oblique", 10)
-        p.setFillColorRGB(0.5, 0.5, 0.5)
-        p.drawCentredString(width/2, y, "⚠️ Ce bulletin est anonyme et chiffré avec OpenPGP")
-        y -= 0.6*cm
-        p.drawCentredString(width/2, y, "Déchiffrable uniquement par le DE (Centre de Dépouillement)")
-        
-        p.showPage()
-        p.save()
-        
-        # Sauvegarder le fichier
-        buffer.seek(0)
-        filename = f'M2_Vote_{vote.unique_id}.pdf'
-        
-        from django.core.files.base import ContentFile
-        return ContentFile(buffer.read(), name=filename)
+                'error': 'Accès réservé au CO'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        vote_ids, election_id, error = approval_selection(request)
+        if error:
+            return error
+
+        job = approval_jobs.create_job(request.user, vote_ids=vote_ids, election_id=election_id)
+
+        return Response(
+            approval_jobs.job_status(job),
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': f'{request.path.rstrip("/")}/{job.id}/'}
+        )
+
+
+class COApprovalJobStatusView(APIView):
+    """
+    GET /api/votes/co/approve-jobs/<job_id>/
+    Progression d'un job d'approbation : traités / en erreur / restants, débit
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, job_id):
+        if request.user.role != 'co':
+            return Response({
+                'error': 'Accès réservé au CO'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        job = get_object_or_404(COApprovalJob, pk=job_id)
+        return Response(approval_jobs.job_status(job))
 
 
 class CORejectVoteView(APIView):
@@ -362,7 +449,6 @@ class CORejectVoteView(APIView):
             }, status=status.HTTP_403_FORBIDDEN)
         
         vote_id = request.data.get('vote_id')
-        reason = request.data.get('reason', '')
         
         vote = get_object_or_404(Vote, pk=vote_id)
         
@@ -371,11 +457,15 @@ class CORejectVoteView(APIView):
                 'error': 'Ce vote a déjà été traité'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        vote.status = 'rejected_co'
-        vote.co_verified_at = timezone.now()
-        vote.co_verified_by = request.user
-        vote.save()
-        
+        with leases.hold('co', vote.pk) as held:
+            if not held:
+                return vote_in_progress()
+
+            vote.status = 'rejected_co'
+            vote.co_verified_at = timezone.now()
+            vote.co_verified_by = request.user
+            vote.save()
+
         return Response({
             'message': 'Vote rejeté',
             'vote': VoteSerializer(vote).data
@@ -396,14 +486,15 @@ class CODownloadM2PDFView(APIView):
             }, status=status.HTTP_403_FORBIDDEN)
         
         vote = get_object_or_404(Vote, pk=vote_id)
-        
-        if not vote.m2_pdf:
+
+        if not vote.is_approved_co:
             return Response({
                 'error': 'PDF non disponible'
             }, status=status.HTTP_404_NOT_FOUND)
-        
+
+        # Rendu au premier téléchargement, puis servi depuis le cache disque
         return FileResponse(
-            vote.m2_pdf.open('rb'),
+            pdf_cache.get_pdf('m2', vote).open('rb'),
             as_attachment=True,
             filename=f'M2_Vote_{vote.unique_id}.pdf'
         )
@@ -438,7 +529,7 @@ class COPendingVotesView(APIView):
                 'voter_username': vote.voter.username,
                 'voter_full_name': vote.voter_full_name,
                 'voter_email': vote.voter.email,
-                'm1_identity': vote.m1_identity,
+                'm1_identity': vote.m1_armored,
                 'unique_id': vote.unique_id,
                 'submitted_at': vote.submitted_at,
             })
@@ -479,40 +570,44 @@ class COVerifyVoteView(APIView):
                 'error': 'Ce vote n\'est pas en attente de validation CO'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        if action == 'approve':
-            from votes.crypto_utils import decrypt_message
+        with leases.hold('co', vote.pk) as held:
+            if not held:
+                return vote_in_progress()
             
-            try:
-                election = vote.election
-                decrypted_m1 = decrypt_message(vote.m1_identity, election.co_private_key)
-                identity_data = json.loads(decrypted_m1)
+            if action == 'approve':
+                from votes.crypto_utils import decrypt_election_message
                 
-                linking_id = identity_data.get('linking_id')
-                
-                if not linking_id:
+                try:
+                    election = vote.election
+                    decrypted_m1 = decrypt_election_message(election, 'co', vote.m1_identity)
+                    identity_data = json.loads(decrypted_m1)
+                    
+                    linking_id = identity_data.get('linking_id')
+                    
+                    if not linking_id:
+                        return Response({
+                            'error': 'linking_id manquant dans M1'
+                        }, status=status.HTTP_400_BAD_REQUEST)
+                    
+                    vote.linking_id = linking_id
+                    vote.status = 'pending_de'
+                    vote.co_verified_at = timezone.now()
+                    vote.co_verified_by = request.user
+                    vote.save()
+                    
+                    message = 'Vote approuvé et transféré au DE'
+                    
+                except Exception as e:
                     return Response({
-                        'error': 'linking_id manquant dans M1'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                vote.linking_id = linking_id
-                vote.status = 'pending_de'
+                        'error': f'Erreur lors du déchiffrement: {str(e)}'
+                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            else:
+                vote.status = 'rejected_co'
                 vote.co_verified_at = timezone.now()
                 vote.co_verified_by = request.user
                 vote.save()
                 
-                message = 'Vote approuvé et transféré au DE'
-                
-            except Exception as e:
-                return Response({
-                    'error': f'Erreur lors du déchiffrement: {str(e)}'
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        else:
-            vote.status = 'rejected_co'
-            vote.co_verified_at = timezone.now()
-            vote.co_verified_by = request.user
-            vote.save()
-            
-            message = 'Vote rejeté'
+                message = 'Vote rejeté'
         
         return Response({
             'message': message,
@@ -535,13 +630,10 @@ class DownloadM1PDFView(APIView):
                 'error': 'Accès réservé au CO'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        vote = get_object_or_404(Vote, pk=vote_id)
-        
-        from .pdf_utils import generate_m1_pdf
-        pdf_buffer = generate_m1_pdf(vote)
+        vote = get_object_or_404(Vote.objects.select_related('election'), pk=vote_id)
         
         response = FileResponse(
-            pdf_buffer,
+            pdf_cache.get_pdf('m1', vote).open('rb'),
             as_attachment=True,
             filename=f'M1_identite_vote_{vote.id}.pdf'
         )
@@ -564,11 +656,8 @@ class DownloadM2PDFView(APIView):
         
         vote = get_object_or_404(Vote, pk=vote_id)
         
-        from .pdf_utils import generate_m2_pdf
-        pdf_buffer = generate_m2_pdf(vote)
-        
         response = FileResponse(
-            pdf_buffer,
+            pdf_cache.get_pdf('m2', vote).open('rb'),
             as_attachment=True,
             filename=f'M2_bulletin_vote_{vote.id}.pdf'
         )
@@ -606,7 +695,7 @@ class DEPendingBallotsView(APIView):
                 'id': vote.id,
                 'election_id': vote.election.id,
                 'election_title': vote.election.title,
-                'm2_ballot': vote.m2_ballot,
+                'm2_ballot': vote.m2_armored,
                 'unique_id': vote.unique_id,
                 'submitted_at': vote.submitted_at,
                 'co_verified_at': vote.co_verified_at,
@@ -641,63 +730,67 @@ class DEDecryptBallotView(APIView):
                 'error': 'Ce vote n\'est pas en attente de déchiffrement DE'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        from votes.crypto_utils import decrypt_message
-        
-        try:
-            election = vote.election
-            decrypted_m2 = decrypt_message(vote.m2_ballot, election.de_private_key)
-            ballot_data = json.loads(decrypted_m2)
+        with leases.hold('de', vote.pk) as held:
+            if not held:
+                return vote_in_progress()
             
-            linking_id_from_m2 = ballot_data.get('linking_id')
-            linking_id_from_co = vote.linking_id
+            from votes.crypto_utils import decrypt_election_message
             
-            if not linking_id_from_m2:
-                return Response({
-                    'error': 'linking_id manquant dans M2'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            if linking_id_from_m2 != linking_id_from_co:
-                vote.status = 'rejected_de'
+            try:
+                election = vote.election
+                decrypted_m2 = decrypt_election_message(election, 'de', vote.m2_ballot)
+                ballot_data = json.loads(decrypted_m2)
+                
+                linking_id_from_m2 = ballot_data.get('linking_id')
+                linking_id_from_co = vote.linking_id
+                
+                if not linking_id_from_m2:
+                    return Response({
+                        'error': 'linking_id manquant dans M2'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                
+                if linking_id_from_m2 != linking_id_from_co:
+                    vote.status = 'rejected_de'
+                    vote.de_verified_at = timezone.now()
+                    vote.de_verified_by = request.user
+                    vote.save()
+                    
+                    return Response({
+                        'error': 'Incohérence détectée: linking_id ne correspond pas'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                
+                candidate_id = ballot_data.get('candidate_id')
+                
+                if not candidate_id:
+                    return Response({
+                        'error': 'candidate_id manquant dans M2'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                
+                candidate = get_object_or_404(Candidate, pk=candidate_id)
+                
+                DecryptedBallot.objects.create(
+                    election=election,
+                    candidate=candidate,
+                    unique_id=vote.unique_id,
+                    decrypted_by=request.user
+                )
+                
+                vote.status = 'counted'
                 vote.de_verified_at = timezone.now()
                 vote.de_verified_by = request.user
                 vote.save()
                 
                 return Response({
-                    'error': 'Incohérence détectée: linking_id ne correspond pas'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            candidate_id = ballot_data.get('candidate_id')
-            
-            if not candidate_id:
+                    'message': 'Bulletin déchiffré et comptabilisé avec succès',
+                    'vote_id': vote.id,
+                    'candidate_id': candidate_id,
+                    'new_status': vote.status
+                }, status=status.HTTP_200_OK)
+                
+            except Exception as e:
                 return Response({
-                    'error': 'candidate_id manquant dans M2'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            candidate = get_object_or_404(Candidate, pk=candidate_id)
-            
-            DecryptedBallot.objects.create(
-                election=election,
-                candidate=candidate,
-                unique_id=vote.unique_id,
-                decrypted_by=request.user
-            )
-            
-            vote.status = 'counted'
-            vote.de_verified_at = timezone.now()
-            vote.de_verified_by = request.user
-            vote.save()
-            
-            return Response({
-                'message': 'Bulletin déchiffré et comptabilisé avec succès',
-                'vote_id': vote.id,
-                'candidate_id': candidate_id,
-                'new_status': vote.status
-            }, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            return Response({
-                'error': f'Erreur lors du déchiffrement: {str(e)}'
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                    'error': f'Erreur lors du déchiffrement: {str(e)}'
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
 class DEElectionResultsView(APIView):
@@ -747,4 +840,45 @@ class DEElectionResultsView(APIView):
             'total_voters': election.total_voters,
             'participation_rate': election.participation_rate,
             'results': results
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+        }, status=status.HTTP_200_OK)
+
+# ==================== SUPERVISION CRYPTO ====================
+
+class CryptoKeyCacheStatsView(APIView):
+    """
+    GET /api/votes/crypto/key-cache/ - Compteurs du cache de clés privées
+    (propres au processus qui sert la requête)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        if request.user.role != 'admin':
+            return Response({
+                'error': 'Accès réservé à l\'administrateur'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        from votes.crypto_utils import key_cache_stats
+        
+        stats = key_cache_stats()
+        stats['pid'] = os.getpid()
+        
+        return Response(stats, status=status.HTTP_200_OK)
+
+
+class AdmissionStatsView(APIView):
+    """
+    GET /api/votes/admission/ - État des seaux d'admission (jetons, file
+    d'attente, requêtes admises / refusées) du processus qui sert la requête
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        if request.user.role != 'admin':
+            return Response({
+                'error': 'Accès réservé à l\'administrateur'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        return Response({
+            'pid': os.getpid(),
+            'buckets': admission_stats(),
+        }, status=status.HTTP_200_OK)
@@ -34,6 +34,8 @@ const CODashboardPage = () => {
   const [approvedVotes, setApprovedVotes] = useState([]);
   const [rejectedVotes, setRejectedVotes] = useState([]);
   const [stats, setStats] = useState({ total: 0, pending: 0, approved: 0, rejected: 0 });
+  const [nextCursors, setNextCursors] = useState({});
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const [activeTab, setActiveTab] = useState('pending');
 
@@ -44,6 +46,8 @@ const CODashboardPage = () => {
 
   const [loading, setLoading] = useState(true);
   const [loadingVotes, setLoadingVotes] = useState(false);
+  const [approvingAll, setApprovingAll] = useState(false);
+  const [approvalJob, setApprovalJob] = useState(null);
 
   useEffect(() => {
     loadElections();
@@ -84,6 +88,7 @@ const CODashboardPage = () => {
       setApprovedVotes(data.approved || []);
       setRejectedVotes(data.rejected || []);
       setStats(data.stats || { total: 0, pending: 0, approved: 0, rejected: 0 });
+      setNextCursors(data.next || {});
     } catch (err) {
       console.error(' Erreur:', err);
       showError('Erreur de chargement', 'Impossible de charger les votes');
@@ -92,6 +97,42 @@ const CODashboardPage = () => {
     }
   };
 
+  // Page suivante d'un onglet (votes plus anciens)
+  const loadMoreVotes = async (bucket) => {
+    const setters = { pending: setPendingVotes, approved: setApprovedVotes, rejected: setRejectedVotes };
+
+    try {
+      setLoadingMore(true);
+      const response = await coAPI.getElectionVotes(selectedElection.id, {
+        status: bucket,
+        before: nextCursors[bucket],
+      });
+      const data = response.data;
+
+      setters[bucket]((votes) => [...votes, ...(data[bucket] || [])]);
+      setNextCursors((cursors) => ({ ...cursors, [bucket]: data.next?.[bucket] ?? null }));
+      setStats(data.stats || stats);
+    } catch (err) {
+      console.error(' Erreur:', err);
+      showError('Erreur de chargement', 'Impossible de charger les votes suivants');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const renderLoadMore = (bucket) => nextCursors[bucket] && (
+    <div className="flex justify-center">
+      <Button
+        variant="secondary"
+        size="sm"
+        onClick={() => loadMoreVotes(bucket)}
+        disabled={loadingMore}
+      >
+        {loadingMore ? 'Chargement...' : 'Charger plus'}
+      </Button>
+    </div>
+  );
+
   const handleElectionChange = (election) => {
     setSelectedElection(election);
     setActiveTab('pending'); 
@@ -104,9 +145,15 @@ const CODashboardPage = () => {
     setDecrypting(true);
     setDecryptedIdentity(null);
 
+    let m1Identity = '';
+
     try {
       console.log('🔓 Déchiffrement PGP de M1...');
 
+      // M1 chargé à la demande : les listes ne contiennent pas les messages chiffrés
+      const ciphertextResponse = await coAPI.getVoteCiphertext(vote.id);
+      m1Identity = ciphertextResponse.data.m1_identity;
+
       const keysResponse = await electionsAPI.getPrivateKeys(vote.election);
       const { co_private_key } = keysResponse.data;
 
@@ -116,7 +163,7 @@ const CODashboardPage = () => {
 
       console.log(' Clé privée PGP CO récupérée');
 
-      const decryptedText = await decryptMessage(vote.m1_identity, co_private_key);
+      const decryptedText = await decryptMessage(m1Identity, co_private_key);
 
       if (!decryptedText) {
         throw new Error('Échec du déchiffrement PGP');
@@ -145,7 +192,7 @@ const CODashboardPage = () => {
         voter_name: 'Erreur de déchiffrement PGP',
         voter_email: '***@***.***',
         encrypted: true,
-        m1_preview: vote.m1_identity.substring(0, 100) + '...',
+        m1_preview: m1Identity.substring(0, 100) + '...',
         error: error.message
       });
     } finally {
@@ -176,6 +223,40 @@ const CODashboardPage = () => {
     }
   };
 
+  const handleApproveAll = async () => {
+    if (!selectedElection) return;
+
+    setApprovingAll(true);
+    try {
+      const { data: created } = await coAPI.createApprovalJob({ electionId: selectedElection.id });
+      setApprovalJob(created);
+
+      // Votes traités par le worker d'approbation : suivi de la progression
+      let job = created;
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        const response = await coAPI.getApprovalJob(created.id);
+        job = response.data;
+        setApprovalJob(job);
+      }
+
+      if (job.status === 'failed') {
+        showError('Erreur d\'approbation', job.error || 'Le job d\'approbation a échoué');
+      } else if (job.failed > 0) {
+        showError('Approbation partielle', `${job.approved} vote(s) approuvé(s), ${job.failed} en erreur (restés en attente).`);
+      } else {
+        success('Votes approuvés!', `${job.approved} vote(s) approuvé(s) et transféré(s) au DE.`);
+      }
+    } catch (err) {
+      console.error(' Erreur:', err);
+      showError('Erreur d\'approbation', err.response?.data?.error || 'Impossible d\'approuver les votes');
+    } finally {
+      setApprovingAll(false);
+      setApprovalJob(null);
+      loadElectionVotes(selectedElection.id);
+    }
+  };
+
   const handleReject = async () => {
     if (!rejectDialog.voteId) return;
 
@@ -392,6 +473,19 @@ const CODashboardPage = () => {
                     </Card>
                   ) : (
                     <div className="space-y-4">
+                      <div className="flex justify-end">
+                        <Button
+                          variant="primary"
+                          size="sm"
+                          onClick={handleApproveAll}
+                          disabled={approvingAll}
+                        >
+                          <CheckCircle className="w-4 h-4 mr-2" />
+                          {approvingAll
+                            ? `Approbation en cours... ${approvalJob ? `${approvalJob.done}/${approvalJob.total}` : ''}`
+                            : `Tout approuver (${stats.pending})`}
+                        </Button>
+                      </div>
                       {pendingVotes.map((vote) => (
                         <Card key={vote.id}>
                           <div className="flex items-start justify-between">
@@ -429,6 +523,7 @@ const CODashboardPage = () => {
                           </div>
                         </Card>
                       ))}
+                      {renderLoadMore('pending')}
                     </div>
                   )
                 )}
@@ -473,6 +568,7 @@ const CODashboardPage = () => {
                           </div>
                         </Card>
                       ))}
+                      {renderLoadMore('approved')}
                     </div>
                   )
                 )}
@@ -509,6 +605,7 @@ const CODashboardPage = () => {
                           </div>
                         </Card>
                       ))}
+                      {renderLoadMore('rejected')}
                     </div>
                   )
                 )}
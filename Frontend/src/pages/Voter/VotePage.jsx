@@ -7,7 +7,7 @@ import Card from '../../components/ui/Card';
 import Button from '../../components/ui/Button';
 import Badge from '../../components/ui/Badge';
 
-import { electionsAPI, candidatesAPI, votesAPI } from '../../services/api';
+import { electionsAPI, votesAPI } from '../../services/api';
 import { useNotification } from '../../contexts/NotificationContext';
 import { encryptMessage } from '../../utils/crypto';
 
@@ -19,6 +19,7 @@ const VotePage = () => {
 
   const [election, setElection] = useState(null);
   const [candidates, setCandidates] = useState([]);
+  const [publicKeys, setPublicKeys] = useState(null);
   const [selectedCandidate, setSelectedCandidate] = useState(null);
   const [loading, setLoading] = useState(true);
   const [submitting, setSubmitting] = useState(false);
@@ -32,27 +33,24 @@ const VotePage = () => {
     try {
       setLoading(true);
       
-      const electionResponse = await electionsAPI.getById(id);
-      setElection(electionResponse.data);
+      // Une seule requête : élection, candidats, clés publiques et statut de vote
+      const { data: bundle } = await electionsAPI.getBallotBundle(id);
+      setElection(bundle.election);
 
-      if (electionResponse.data.status !== 'open') {
+      if (bundle.election.status !== 'open') {
         showError('Élection fermée', 'Cette élection n\'est pas ouverte au vote.');
         navigate('/voter/dashboard');
         return;
       }
 
-      if (electionResponse.data.has_voted) {
+      if (bundle.vote_status.has_voted) {
         showError('Déjà voté', 'Vous avez déjà voté pour cette élection.');
         navigate('/voter/dashboard');
         return;
       }
 
-      const candidatesResponse = await candidatesAPI.getByElection(id);
-      const candidatesData = Array.isArray(candidatesResponse.data)
-        ? candidatesResponse.data
-        : candidatesResponse.data.results || [];
-      
-      setCandidates(candidatesData);
+      setCandidates(bundle.candidates);
+      setPublicKeys(bundle.public_keys);
     } catch (err) {
       console.error(' Erreur:', err);
       const errorMsg = err.response?.data?.detail || err.response?.data?.error || 'Une erreur est survenue';
@@ -83,12 +81,8 @@ const VotePage = () => {
 
       console.log(' === DÉBUT DU CHIFFREMENT PGP ===');
 
-      // Récupérer les clés publiques
-      console.log(' Récupération des clés publiques PGP...');
-      const keysResponse = await electionsAPI.getPublicKeys(id);
-      const { co_public_key, de_public_key } = keysResponse.data;
-
-      console.log('Clés publiques PGP récupérées');
+      // Clés publiques reçues avec le bulletin
+      const { co_public_key, de_public_key } = publicKeys || {};
 
       if (!co_public_key || !de_public_key) {
         throw new Error('Les clés publiques de chiffrement sont manquantes');
@@ -126,7 +120,7 @@ const VotePage = () => {
 
       //  Chiffrer M1 avec clé publique CO
       console.log(' Chiffrement PGP de M1 (Identité)...');
-      const m1_identity = await encryptMessage(JSON.stringify(m1_data), co_public_key);
+      const m1_identity = await encryptMessage(JSON.stringify(m1_data), co_public_key, 'binary');
       
       if (!m1_identity) {
         throw new Error('Échec du chiffrement de l\'identité (M1)');
@@ -135,7 +129,7 @@ const VotePage = () => {
 
       // 6. Chiffrer M2 avec clé publique DE
       console.log(' Chiffrement PGP de M2 (Bulletin)...');
-      const m2_ballot = await encryptMessage(JSON.stringify(m2_data), de_public_key);
+      const m2_ballot = await encryptMessage(JSON.stringify(m2_data), de_public_key, 'binary');
 
       if (!m2_ballot) {
         throw new Error('Échec du chiffrement du bulletin (M2)');
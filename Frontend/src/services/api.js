@@ -67,6 +67,8 @@ export const electionsAPI = {
   close: (id) => api.post(`/elections/${id}/close/`),
   getStats: (id) => api.get(`/elections/${id}/stats/`),
   getPublicKeys: (id) => api.get(`/elections/${id}/public_keys/`),
+  // Élection, candidats, clés publiques et statut de vote (ETag : 304 au rechargement)
+  getBallotBundle: (id) => api.get(`/elections/${id}/ballot-bundle/`),
   getPrivateKeys: (id) => api.get(`/elections/${id}/private_keys/`),
   assignVoters: (electionId, voterIds) => {
     return api.post('/elections/assign-voters/', {
@@ -100,12 +102,26 @@ export const candidatesAPI = {
 
 // CO API 
 export const coAPI = {
-  // Récupérer tous les votes d'une élection
-  getElectionVotes: (electionId) => api.get(`/votes/co/election/${electionId}/`),
+  // Votes d'une élection, par page : { status, before, limit } (défaut : première page de chaque onglet)
+  getElectionVotes: (electionId, params = {}) => api.get(`/votes/co/election/${electionId}/`, { params }),
+  
+  // Messages chiffrés M1 / M2 d'un vote (absents des listes)
+  getVoteCiphertext: (voteId) => api.get(`/votes/co/${voteId}/ciphertext/`),
   
   // Approuver un vote (génère le PDF M2 automatiquement)
   approveVote: (voteId) => api.post('/votes/co/approve/', { vote_id: voteId }),
   
+  // Approuver par lot : liste d'identifiants ou tous les votes en attente d'une élection
+  approveBatch: ({ voteIds, electionId }) => api.post('/votes/co/approve-batch/',
+    voteIds ? { vote_ids: voteIds } : { election_id: electionId }
+  ),
+  
+  // Approbation en arrière-plan : création du job puis suivi de sa progression
+  createApprovalJob: ({ voteIds, electionId }) => api.post('/votes/co/approve-jobs/',
+    voteIds ? { vote_ids: voteIds } : { election_id: electionId }
+  ),
+  getApprovalJob: (jobId) => api.get(`/votes/co/approve-jobs/${jobId}/`),
+  
   // Rejeter un vote
   rejectVote: (voteId, reason = '') => api.post('/votes/co/reject/', { 
     vote_id: voteId, 
@@ -132,7 +148,21 @@ export const coAPI = {
 // Votes API
 export const votesAPI = {
   // Votant
-  submit: (voteData) => api.post('/votes/submit/', voteData),
+  // unique_id sert de clé d'idempotence : un renvoi récupère le reçu d'origine
+  // M1 / M2 binaires (Uint8Array) envoyés en multipart, sans armure base64
+  submit: (voteData) => {
+    const form = new FormData();
+    form.append('election_id', voteData.election_id);
+    form.append('m1_identity', new Blob([voteData.m1_identity], { type: 'application/octet-stream' }), 'm1.pgp');
+    form.append('m2_ballot', new Blob([voteData.m2_ballot], { type: 'application/octet-stream' }), 'm2.pgp');
+    form.append('unique_id', voteData.unique_id);
+    return api.post('/votes/submit/', form, {
+      headers: {
+        'Content-Type': 'multipart/form-data',
+        'Idempotency-Key': voteData.unique_id,
+      },
+    });
+  },
   create: (voteData) => api.post('/votes/submit/', voteData), 
   getMyVoteStatus: (electionId) => api.get('/votes/my-vote/', { params: { election_id: electionId } }),
   verifyReceipt: (receiptCode) => api.get('/votes/receipt/', { params: { code: receiptCode } }),
@@ -4,9 +4,10 @@ import * as openpgp from 'openpgp';
  * Chiffre un message avec une clé publique PGP
  * @param {string} message - Le message à chiffrer (JSON stringifié)
  * @param {string} publicKeyArmored - La clé publique PGP au format ASCII
- * @returns {Promise<string|false>} - Le message chiffré ou false si erreur
+ * @param {'armored'|'binary'} format - Armure ASCII (texte) ou paquets binaires (Uint8Array)
+ * @returns {Promise<string|Uint8Array|false>} - Le message chiffré ou false si erreur
  */
-export const encryptMessage = async (message, publicKeyArmored) => {
+export const encryptMessage = async (message, publicKeyArmored, format = 'armored') => {
   try {
     if (!message || !publicKeyArmored) {
       console.error('❌ Message ou clé publique manquant');
@@ -23,6 +24,7 @@ export const encryptMessage = async (message, publicKeyArmored) => {
     const encrypted = await openpgp.encrypt({
       message: messageObj,
       encryptionKeys: publicKey,
+      format,
     });
 
     return encrypted;